@@ -0,0 +1,94 @@
+"""
+Throughput benchmark for session message encryption.
+
+Compares the original per-message scheme (SHA-256 key derivation and a new
+Fernet object for every message) with SessionCipher, which derives its key
+once per session, for single messages and for encrypt_many/decrypt_many
+batches. Also reports the one-off key derivation cost of each KDF.
+
+    python benchmarks/crypto_benchmark.py [--messages N] [--size BYTES]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cryptography.fernet import Fernet
+
+from session_crypto import PBKDF2_ITERATIONS, SCRYPT_PARAMS, SessionCipher, derive_key, get_session_cipher, new_salt
+
+
+def reference_encrypt(message, session_code):
+    # The original encrypt_message: derive the key and build a Fernet per message
+    key = base64.urlsafe_b64encode(hashlib.sha256(session_code.encode('utf-8')).digest())
+    return Fernet(key).encrypt(message.encode('utf-8'))
+
+
+def reference_decrypt(token, session_code):
+    key = base64.urlsafe_b64encode(hashlib.sha256(session_code.encode('utf-8')).digest())
+    return Fernet(key).decrypt(token).decode('utf-8')
+
+
+def sample_messages(count, size):
+    # Game-sized JSON messages, padded to roughly size bytes
+    base = {'type': 'question', 'text': 'Is it a fire type?', 'seq': 0}
+    pad = max(0, size - len(json.dumps(base)))
+    return [json.dumps(dict(base, seq=i, pad='x' * pad)) for i in range(count)]
+
+
+def rate(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>34}: {count / elapsed:10.0f} msgs/s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--size', type=int, default=128, help="approximate message size in bytes")
+    args = parser.parse_args(argv)
+    code = 'ABC123'
+    salt = new_salt()
+    messages = sample_messages(args.messages, args.size)
+    n = len(messages)
+
+    for kdf, params in (('scrypt', SCRYPT_PARAMS), ('pbkdf2', {'iterations': PBKDF2_ITERATIONS})):
+        start = time.perf_counter()
+        derive_key(code, salt, kdf)
+        print(f"{kdf} key derivation {params}: {(time.perf_counter() - start) * 1000:.1f} ms (once per session)")
+    start = time.perf_counter()
+    get_session_cipher(code, salt)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    cipher = get_session_cipher(code, salt)
+    print(f"get_session_cipher: {first * 1000:.1f} ms first call, {(time.perf_counter() - start) * 1e6:.1f} us cached")
+    print(f"{n} messages of ~{len(messages[0])} bytes")
+
+    ref_tokens = rate("per-message key (original) encrypt", n, lambda: [reference_encrypt(m, code) for m in messages])
+    rate("per-message key (original) decrypt", n, lambda: [reference_decrypt(t, code) for t in ref_tokens])
+    tokens = rate("SessionCipher.encrypt", n, lambda: [cipher.encrypt(m) for m in messages])
+    rate("SessionCipher.decrypt", n, lambda: [cipher.decrypt(t) for t in tokens])
+    tokens = rate("SessionCipher.encrypt_many", n, lambda: cipher.encrypt_many(messages))
+    decrypted = rate("SessionCipher.decrypt_many", n, lambda: cipher.decrypt_many(tokens))
+    if decrypted != messages:
+        print("Round trip mismatch")
+        return 1
+    other = SessionCipher(code, new_salt())
+    try:
+        other.decrypt(tokens[0])
+        print("A cipher with a different salt decrypted the message")
+        return 1
+    except Exception:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Benchmark for the card detail page parser.
+
+Parses a corpus of saved detail pages with the original per-field search
+parser (kept here as the reference) and with parse_card_detail under each
+available tree builder, checks the card data against the reference, and
+reports pages per second. The corpus is the fixtures in
+benchmarks/fixtures/card_pages plus any --pages directory, and, with
+--http-cache, the detail pages saved in the scraper's HTTP cache.
+
+    python benchmarks/parse_benchmark.py [--pages DIR] [--http-cache] [--repeat N]
+
+Exits non-zero if the default tree builder (DEFAULT_PARSER) disagrees with
+the reference. Other builders are only reported: lxml repairs malformed
+markup differently (see fixtures/card_pages/malformed_markup.html), which is
+why it is opt-in.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup
+
+from scraper.http_cache import DEFAULT_CACHE_DIR
+from scraper.serebii_card_scraper import DEFAULT_PARSER, parse_card_detail
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'card_pages')
+DETAIL_URL_RE = re.compile(r'/card/[^/]+/H?\d+\.shtml$')
+
+
+def reference_parse(html):
+    # The original scrape_card_detail parsing, one whole-document search per field
+    soup = BeautifulSoup(html, 'html.parser')
+    card_data = {}
+    meta_img = soup.find('meta', property='og:image')
+    if meta_img and meta_img.get('content'):
+        card_data['image_url'] = meta_img['content']
+    if 'image_url' not in card_data:
+        card_image = soup.find('img', src=re.compile(r'/card/journeytogether/\d+\.(jpg|png)$'))
+        if card_image and 'src' in card_image.attrs:
+            img_src = card_image['src']
+            if not img_src.startswith('http'):
+                img_src = f"https://www.serebii.net{img_src}"
+            card_data['image_url'] = img_src
+    card_name_elem = soup.find('font', size='2') or soup.find('font', size='5')
+    if card_name_elem:
+        card_data['name'] = card_name_elem.get_text(strip=True)
+    card_number_elem = soup.find(string=re.compile(r'\d+\s*/\s*\d+'))
+    if card_number_elem:
+        card_num_match = re.search(r'(\d+\s*/\s*\d+)', card_number_elem)
+        if card_num_match:
+            card_data['number'] = card_num_match.group(1).replace(' ', '')
+    # --- Improved HP extraction ---
+    # Look for HP in the right-aligned font in the main card info table
+    hp_val = None
+    for font_tag in soup.find_all('font'):
+        if font_tag.string and 'HP' in font_tag.string:
+            hp_match = re.search(r'(\d+)\s*HP', font_tag.string)
+            if hp_match:
+                hp_val = hp_match.group(1)
+                break
+    if not hp_val:
+        # Fallback: look for bold red font (as in <font color="#FF0000"><b>50 HP</b></font>)
+        b_tags = soup.find_all('b')
+        for b in b_tags:
+            if b.string and 'HP' in b.string:
+                hp_match = re.search(r'(\d+)\s*HP', b.string)
+                if hp_match:
+                    hp_val = hp_match.group(1)
+                    break
+    if hp_val:
+        card_data['hp'] = hp_val
+        card_data['card_type'] = card_data.get('card_type', 'Pokémon')
+    type_img = soup.find('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
+    if type_img and 'src' in type_img.attrs:
+        src = type_img['src']
+        type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
+        if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
+            card_data['types'] = [type_match.group(1)]
+            card_data['card_type'] = f"{type_match.group(1).capitalize()} Pokémon"
+    if 'card_type' not in card_data:
+        card_data['card_type'] = 'Trainer'
+        card_data['types'] = ['trainer']
+    weakness_section = soup.find(string=re.compile(r'Weakness', re.IGNORECASE))
+    if weakness_section:
+        parent = weakness_section.parent
+        if parent:
+            weakness_img = parent.find_next('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
+            if weakness_img and 'src' in weakness_img.attrs:
+                src = weakness_img['src']
+                type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
+                if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
+                    card_data['weakness'] = [type_match.group(1)]
+    resistance_section = soup.find(string=re.compile(r'Resistance', re.IGNORECASE))
+    if resistance_section:
+        parent = resistance_section.parent
+        if parent:
+            resistance_img = parent.find_next('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
+            if resistance_img and 'src' in resistance_img.attrs:
+                src = resistance_img['src']
+                type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
+                if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
+                    card_data['resistance'] = [type_match.group(1)]
+    retreat_section = soup.find(string=re.compile(r'Retreat', re.IGNORECASE))
+    if retreat_section:
+        parent = retreat_section.parent
+        if parent:
+            retreat_imgs = parent.find_next_siblings('img', src=re.compile(r'/card/image/colorless\.(png|jpg)$'))
+            card_data['retreat_cost'] = len(retreat_imgs) if retreat_imgs else 0
+    # Capture holographic trait if present
+    rarity_img = soup.find('img', src=re.compile(r'/card/image/(holographic|common|uncommon|rare|ultra|secret)\.(png|jpg)$'))
+    if rarity_img and 'src' in rarity_img.attrs:
+        src = rarity_img['src']
+        rarity_match = re.search(r'/card/image/([a-z]+)\.(png|jpg)', src)
+        if rarity_match:
+            rarity_val = rarity_match.group(1).capitalize()
+            card_data['rarity'] = rarity_val
+            # Add a boolean trait for holographic
+            if rarity_match.group(1).lower() == 'holographic':
+                card_data['holographic'] = True
+                card_data['rarity'] = 'Rare'  # Holographic is also considered Rare
+            else:
+                card_data['holographic'] = False
+    if 'card_type' not in card_data:
+        card_data['card_type'] = 'Trainer'
+        card_data['types'] = ['trainer']
+    if 'name' not in card_data:
+        title = soup.title.string if soup.title else ''
+        match = re.search(r'#\d+\s+(.+)', title)
+        if match:
+            card_data['name'] = match.group(1).strip()
+    return card_data
+
+
+def load_corpus(page_dirs, http_cache_dir=None):
+    pages = {}
+    for page_dir in page_dirs:
+        for path in sorted(glob.glob(os.path.join(page_dir, '*.html'))):
+            with open(path, encoding='utf-8') as f:
+                pages[os.path.relpath(path)] = f.read()
+    if http_cache_dir:
+        for meta_path in sorted(glob.glob(os.path.join(http_cache_dir, '*.json'))):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if not DETAIL_URL_RE.search(meta.get('url', '')):
+                continue
+            with open(meta_path[:-len('.json')] + '.body', 'rb') as f:
+                pages[meta['url']] = f.read().decode(meta.get('encoding') or 'utf-8', errors='replace')
+    return pages
+
+
+def run_parser(parse, html):
+    # Compare failures too: a page that raises must raise under every backend
+    try:
+        return parse(html)
+    except Exception as e:
+        return f"<{type(e).__name__}>"
+
+
+def available_backends():
+    backends = {'reference': reference_parse, 'html.parser': lambda html: parse_card_detail(html, 'html.parser')}
+    try:
+        import lxml  # noqa: F401
+        backends['lxml'] = lambda html: parse_card_detail(html, 'lxml')
+    except ImportError:
+        print("[INFO] lxml is not installed, skipping the lxml backend")
+    return backends
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', action='append', default=[], help="extra directory of saved detail pages (*.html)")
+    parser.add_argument('--http-cache', nargs='?', const=DEFAULT_CACHE_DIR, help="also use detail pages from the HTTP cache")
+    parser.add_argument('--repeat', type=int, default=20, help="passes over the corpus per backend")
+    args = parser.parse_args(argv)
+    pages = load_corpus([FIXTURE_DIR] + args.pages, args.http_cache)
+    backends = available_backends()
+    print(f"Corpus: {len(pages)} pages")
+
+    expected = {name: run_parser(reference_parse, html) for name, html in pages.items()}
+    mismatches = 0
+    for backend, parse in backends.items():
+        for name, html in pages.items():
+            result = run_parser(parse, html)
+            if result != expected[name]:
+                label = 'MISMATCH' if backend == DEFAULT_PARSER else 'DIFFERS'
+                mismatches += backend == DEFAULT_PARSER
+                print(f"[{label}] {backend} on {name}:\n  expected {expected[name]}\n  got      {result}")
+
+    baseline = None
+    for backend, parse in backends.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages.values():
+                run_parser(parse, html)
+        elapsed = time.perf_counter() - start
+        rate = args.repeat * len(pages) / elapsed
+        baseline = baseline or rate
+        print(f"{backend:>12}: {rate:8.1f} pages/s ({rate / baseline:.2f}x reference)")
+
+    if mismatches:
+        print(f"{mismatches} mismatches for the default parser ({DEFAULT_PARSER})")
+        return 1
+    print(f"The default parser ({DEFAULT_PARSER}) matches the reference")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
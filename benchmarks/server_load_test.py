@@ -0,0 +1,170 @@
+"""
+Load test for game_server.py.
+
+Starts a server in a separate process on loopback (or uses --connect) and
+plays --rooms two-player games through it, --concurrency rooms at a time.
+In each room both players ask --questions questions, then the first player
+guesses the second player's card to finish the game. Reports:
+  - rooms/sec (complete games, from create to game over),
+  - answer latency (question sent to answer received): p50, p99 and max,
+  - the most rooms the server held at once and its peak RSS.
+
+    python benchmarks/server_load_test.py [--rooms N] [--concurrency N] [--questions N] [--set SET_ID]
+
+Exits non-zero if any room failed.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from game_server import GameClient, raise_open_file_limit
+
+DEFAULT_SET = 'obsidianflames'
+QUESTIONS = [
+    "is it a fire type?",
+    "is it a water type?",
+    "is it a grass type?",
+    "is it a psychic type?",
+    "is it a colorless type?",
+    "is it holo?",
+    "is its rarity rare?",
+    "does it have 60 hp?",
+    "does it have 120 hp?",
+    "is it a supporter?",
+    "is it a trainer?",
+    "does it mention charizard?",
+]
+
+
+def start_server(set_id, database):
+    """(process, port) for a game server on a free loopback port."""
+    cmd = [sys.executable, os.path.join(ROOT, 'game_server.py'), '--host', '127.0.0.1', '--port', '0',
+           '--preload', set_id]
+    if database:
+        cmd += ['--database', database]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    for line in proc.stdout:
+        if line.startswith('[INFO] Listening on'):
+            return proc, int(line.rsplit(':', 1)[1])
+    proc.wait()
+    raise RuntimeError(f"the server exited with code {proc.returncode} before listening")
+
+
+async def play_room(host, port, set_id, questions, latencies):
+    host_player = await GameClient.connect(host, port)
+    guest = await GameClient.connect(host, port)
+    try:
+        await host_player.send({'type': 'create', 'set_id': set_id, 'players': 2})
+        room = await host_player.expect('room')
+        await guest.send({'type': 'join', 'code': room['code']})
+        host_start, guest_start = await asyncio.gather(host_player.expect('start'), guest.expect('start'))
+
+        async def ask(client, offset):
+            for i in range(questions):
+                started = time.perf_counter()
+                await client.send({'type': 'question', 'text': QUESTIONS[(offset + i) % len(QUESTIONS)]})
+                await client.expect('answer')
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(ask(host_player, 0), ask(guest, len(QUESTIONS) // 2))
+        # The host is looking for the guest's card
+        await host_player.send({'type': 'guess', 'name': guest_start['your_card']['name']})
+        result = await host_player.expect('guess_result')
+        if not result['correct']:
+            raise RuntimeError(f"guess of {result['name']} in room {room['code']} was wrong")
+        await asyncio.gather(host_player.expect('over'), guest.expect('over'))
+    finally:
+        await asyncio.gather(host_player.close(), guest.close())
+
+
+async def watch_server(host, port, peak, stop):
+    # Poll the server's stats to record the most rooms open at once
+    client = await GameClient.connect(host, port)
+    try:
+        while True:
+            await client.send({'type': 'stats'})
+            stats = await client.expect('stats')
+            peak['rooms'] = max(peak.get('rooms', 0), stats['rooms'])
+            peak['stats'] = stats
+            if stop.is_set():
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), 0.1)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await client.close()
+
+
+async def run(args, host, port):
+    latencies = []
+    failures = []
+    limit = asyncio.Semaphore(args.concurrency)
+    peak = {}
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_server(host, port, peak, stop))
+
+    async def one_room():
+        async with limit:
+            try:
+                await play_room(host, port, args.set, args.questions, latencies)
+            except Exception as e:
+                failures.append(f"{type(e).__name__}: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_room() for _ in range(args.rooms)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await watcher
+    return elapsed, latencies, failures, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=2000, help="games to play")
+    parser.add_argument('--concurrency', type=int, default=1000, help="games in progress at once")
+    parser.add_argument('--questions', type=int, default=10, help="questions per player per game")
+    parser.add_argument('--set', default=DEFAULT_SET, help="set every room plays")
+    parser.add_argument('--database', help="card Parquet file for the spawned server")
+    parser.add_argument('--connect', metavar='HOST:PORT', help="use a running server instead of starting one")
+    args = parser.parse_args(argv)
+    raise_open_file_limit()
+
+    proc = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        port = int(port)
+    else:
+        proc, port = start_server(args.set, args.database)
+        host = '127.0.0.1'
+    try:
+        elapsed, latencies, failures, peak = asyncio.run(run(args, host, port))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    played = args.rooms - len(failures)
+    print(f"{played} of {args.rooms} rooms played in {elapsed:.2f} s "
+          f"({args.concurrency} at a time, {args.questions} questions per player)")
+    print(f"Rooms/sec: {played / elapsed:10.1f}")
+    if latencies:
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"Answer latency over {len(latencies)} questions: p50 {cuts[49] * 1000:.2f} ms, "
+              f"p99 {cuts[98] * 1000:.2f} ms, max {max(latencies) * 1000:.2f} ms")
+    stats = peak.get('stats', {})
+    print(f"Server: at most {peak.get('rooms', 0)} rooms open at once, peak RSS {stats.get('max_rss_kb')} kB")
+    for failure in sorted(set(failures))[:10]:
+        print(f"[FAILED] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
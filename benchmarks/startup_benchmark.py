@@ -0,0 +1,143 @@
+"""
+Startup benchmark for card_guesser.py.
+
+Measures, in fresh interpreters:
+  - the -X importtime report for `import card_guesser` (total and the
+    slowest modules),
+  - wall time from launching the process to `import card_guesser` done,
+  - wall time from launching the process to the splash screen's first paint
+    (time to first frame),
+and checks them against benchmarks/startup_budget.json. The budget also
+lists modules that must not be imported before the first frame (pandas,
+requests, ...): they belong to loading a set or networking, not the splash.
+
+    python benchmarks/startup_benchmark.py [--repeat N] [--top N] [--budget PATH]
+
+Exits non-zero if the budget is exceeded. Uses Qt's offscreen platform
+unless --onscreen is given, so it also runs without a display.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+# Runs in the child: reports when the import is done and when the splash first
+# paints, along with the budgeted modules that were loaded by then
+CHILD = r'''
+import json, os, sys
+sys.path.insert(0, os.getcwd())
+import card_guesser
+print('imported', flush=True)
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+splash = card_guesser.SplashScreen(lambda url: None)
+watched = json.loads(sys.argv[1])
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if obj is splash and event.type() == QEvent.Type.Paint:
+            loaded = sorted(m for m in watched if m in sys.modules)
+            print('frame ' + json.dumps(loaded), flush=True)
+            os._exit(0)
+        return False
+
+first_paint = FirstPaint()
+splash.installEventFilter(first_paint)
+splash.show()
+app.exec()
+'''
+
+
+def child_env(onscreen):
+    env = dict(os.environ)
+    if not onscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    return env
+
+
+def importtime_report(env):
+    """[(cumulative_us, self_us, module)] from -X importtime for import card_guesser."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import card_guesser'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return rows
+
+
+def time_to_first_frame(env, watched_modules, timeout=60):
+    """(ms to import done, ms to first paint, watched modules loaded) for one launch."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-c', CHILD, json.dumps(watched_modules)], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    imported = frame = None
+    loaded = []
+    try:
+        for line in proc.stdout:
+            now = (time.perf_counter() - start) * 1000
+            if line.startswith('imported'):
+                imported = now
+            elif line.startswith('frame'):
+                frame = now
+                loaded = json.loads(line[len('frame'):])
+                break
+    finally:
+        proc.stdout.close()
+        proc.wait(timeout=timeout)
+    if frame is None:
+        raise RuntimeError("the splash screen never painted")
+    return imported, frame, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="launches to time (the median is reported)")
+    parser.add_argument('--top', type=int, default=15, help="slowest imports to list")
+    parser.add_argument('--budget', default=DEFAULT_BUDGET_PATH)
+    parser.add_argument('--onscreen', action='store_true', help="use the real display instead of offscreen")
+    args = parser.parse_args(argv)
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+    env = child_env(args.onscreen)
+    watched = budget.get('not_before_first_frame', [])
+
+    rows = importtime_report(env)
+    total_us = next((cum for cum, _, name in rows if name == 'card_guesser'), 0)
+    print(f"-X importtime: import card_guesser took {total_us / 1000:.1f} ms; slowest modules (cumulative):")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    runs = [time_to_first_frame(env, watched) for _ in range(args.repeat)]
+    import_ms = statistics.median(r[0] for r in runs)
+    frame_ms = statistics.median(r[1] for r in runs)
+    loaded = sorted({m for r in runs for m in r[2]})
+    print(f"Process start to import done: {import_ms:7.1f} ms (median of {len(runs)})")
+    print(f"Process start to first frame: {frame_ms:7.1f} ms (median of {len(runs)})")
+
+    failures = []
+    if total_us / 1000 > budget['importtime_ms']:
+        failures.append(f"import card_guesser {total_us / 1000:.1f} ms > {budget['importtime_ms']} ms")
+    if frame_ms > budget['first_frame_ms']:
+        failures.append(f"time to first frame {frame_ms:.1f} ms > {budget['first_frame_ms']} ms")
+    if loaded:
+        failures.append(f"imported before the first frame: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"[OVER BUDGET] {failure}")
+    if failures:
+        return 1
+    print(f"Within budget ({os.path.relpath(args.budget)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
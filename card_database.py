@@ -0,0 +1,218 @@
+"""
+Card database service for the Parquet card file.
+
+The Parquet file is opened once per process as a pyarrow dataset. Set loads
+read only the columns the game uses and push the set_id filter down to the
+row groups, and every loaded set is kept in a per-set cache so re-selecting a
+set or resetting a game never touches the disk again.
+
+build_partitioned_database rewrites the file with one row group per set_id
+(sorted by card number) plus a small JSON manifest next to it. When the
+manifest is present a set load reads exactly one row group, so load time
+stays flat however many sets the database holds. Run this module as a
+script to rebuild:
+
+    python card_database.py [data/pokemon_cards_all_latest.parquet]
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+
+DEFAULT_PARQUET_PATH = os.path.join('data', 'pokemon_cards_all_latest.parquet')
+
+# Columns read by the game: image download/paths, question answering and display
+GAME_COLUMNS = ['image_url', 'number', 'set_id', 'name', 'hp', 'types', 'card_type', 'rarity', 'holographic']
+
+
+def card_schema():
+    """Arrow schema of the card Parquet file (every column, not just GAME_COLUMNS)."""
+    import pyarrow as pa
+    text = pa.string()
+    tags = pa.list_(pa.string())
+    return pa.schema([
+        ('image_url', text), ('number', text), ('detail_url', text), ('set_id', text),
+        ('language', text), ('promo', pa.bool_()), ('name', text), ('hp', text),
+        ('types', tags), ('card_type', text), ('rarity', text), ('holographic', pa.bool_()),
+        ('weakness', tags), ('resistance', tags), ('retreat_cost', pa.float64()),
+    ])
+
+
+def manifest_path_for(parquet_path):
+    return os.path.splitext(parquet_path)[0] + '.manifest.json'
+
+
+def card_sort_key(number):
+    # Sort '12/182' by 12; numbers without a leading integer go last
+    num = str(number).split('/')[0].strip()
+    return (0, int(num), '') if num.isdigit() else (1, 0, num)
+
+
+def set_checksum(table):
+    """Content checksum of one set's rows, stable across pyarrow versions."""
+    rows = json.dumps(table.to_pylist(), sort_keys=True, default=str)
+    return hashlib.sha256(rows.encode('utf-8')).hexdigest()
+
+
+def record_checksum(record):
+    """Content checksum of one card row (a dict of column values)."""
+    row = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha256(row.encode('utf-8')).hexdigest()
+
+
+def load_manifest(parquet_path):
+    path = manifest_path_for(parquet_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def sort_set_table(table):
+    """Rows of one set's table sorted by card number."""
+    numbers = table.column('number').to_pylist()
+    return table.take(sorted(range(table.num_rows), key=lambda i: card_sort_key(numbers[i])))
+
+
+def write_set_tables(parquet_path, schema, set_tables):
+    """
+    Write (set_id, table, checksum) items as one row group per set, plus
+    the manifest. Tables must already be sorted; a checksum of None is
+    computed. Both files are replaced atomically. Returns the manifest dict.
+    """
+    import pyarrow.parquet as pq
+    tmp_path = parquet_path + '.tmp'
+    manifest = {'num_rows': 0, 'sets': {}}
+    with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+        for row_group, (set_id, part, checksum) in enumerate(set_tables):
+            writer.write_table(part, row_group_size=max(1, part.num_rows))
+            manifest['num_rows'] += part.num_rows
+            manifest['sets'][set_id] = {
+                'row_group': row_group,
+                'num_rows': part.num_rows,
+                'checksum': checksum or set_checksum(part),
+            }
+    os.replace(tmp_path, parquet_path)
+    manifest_path = manifest_path_for(parquet_path)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    _forget_database(parquet_path)
+    return manifest
+
+
+def write_partitioned_table(table, parquet_path):
+    """
+    Write a card table with one row group per set_id, each sorted by card
+    number, and its manifest. Returns the manifest dict.
+    """
+    set_rows = {}
+    for i, set_id in enumerate(table.column('set_id').to_pylist()):
+        set_rows.setdefault(set_id, []).append(i)
+    parts = ((set_id, sort_set_table(table.take(rows)), None) for set_id, rows in set_rows.items())
+    return write_set_tables(parquet_path, table.schema, parts)
+
+
+def build_partitioned_database(src_path=DEFAULT_PARQUET_PATH, dest_path=None):
+    """Rewrite src_path (in place unless dest_path is given) partitioned by set_id."""
+    import pyarrow.parquet as pq
+    table = pq.read_table(src_path)
+    return write_partitioned_table(table, dest_path or src_path)
+
+
+def replace_sets(parquet_path, set_records):
+    """
+    Replace (or add) whole sets in a partitioned card file. set_records
+    maps set_id to its complete list of row dicts. Untouched sets are
+    copied row group by row group and keep their manifest checksums, so
+    only the replaced sets are re-checksummed.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    manifest = load_manifest(parquet_path)
+    with open(parquet_path, 'rb') as f:
+        source = pq.ParquetFile(f)
+        if not manifest or manifest.get('num_rows') != source.metadata.num_rows:
+            raise ValueError(f"{parquet_path} has no up-to-date manifest; run build_partitioned_database first")
+        schema = source.schema_arrow
+        parts = [(set_id, source.read_row_group(entry['row_group']), entry['checksum'])
+                 for set_id, entry in manifest['sets'].items() if set_id not in set_records]
+    for set_id, records in set_records.items():
+        parts.append((set_id, sort_set_table(pa.Table.from_pylist(records, schema=schema)), None))
+    return write_set_tables(parquet_path, schema, parts)
+
+
+class CardDatabase:
+    def __init__(self, parquet_path=DEFAULT_PARQUET_PATH, columns=GAME_COLUMNS):
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        self.parquet_path = parquet_path
+        self.dataset = ds.dataset(parquet_path, format='parquet')
+        names = set(self.dataset.schema.names)
+        self.columns = [c for c in columns if c in names]
+        self.file = pq.ParquetFile(parquet_path)
+        self.manifest = load_manifest(parquet_path)
+        if self.manifest and self.manifest.get('num_rows') != self.file.metadata.num_rows:
+            print(f"[WARN] Manifest for {parquet_path} is stale, falling back to filtered reads")
+            self.manifest = None
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def set_ids(self):
+        if self.manifest:
+            return list(self.manifest['sets'])
+        return sorted(set(self.dataset.to_table(columns=['set_id']).column('set_id').to_pylist()))
+
+    def load_set(self, set_id):
+        """Read one set from disk (projected columns, filter pushed down)."""
+        import pyarrow.dataset as ds
+        if self.manifest:
+            entry = self.manifest['sets'].get(set_id)
+            if entry is None:
+                table = self.dataset.schema.empty_table().select(self.columns)
+            else:
+                table = self.file.read_row_group(entry['row_group'], columns=self.columns)
+        else:
+            table = self.dataset.to_table(columns=self.columns, filter=ds.field('set_id') == set_id)
+        print(f"[INFO] Loaded {table.num_rows} cards for set {set_id} from {self.parquet_path}")
+        return table.to_pandas()
+
+    def get_set_df(self, set_id):
+        """
+        Return the card DataFrame for a set. The cached frame is shared, so
+        callers that modify it should take a copy.
+        """
+        with self._lock:
+            df = self._sets.get(set_id)
+            if df is None:
+                df = self._sets[set_id] = self.load_set(set_id)
+            return df
+
+    def clear_cache(self):
+        with self._lock:
+            self._sets.clear()
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def _forget_database(parquet_path):
+    # Drop the cached CardDatabase for a file that was just rewritten
+    with _databases_lock:
+        _databases.pop(os.path.abspath(parquet_path), None)
+
+
+def get_card_database(parquet_path=DEFAULT_PARQUET_PATH):
+    """Return the process-wide CardDatabase for a Parquet file."""
+    key = os.path.abspath(parquet_path)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = _databases[key] = CardDatabase(parquet_path)
+        return db
+
+
+if __name__ == "__main__":
+    build_partitioned_database(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PARQUET_PATH)
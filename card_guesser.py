@@ -2,39 +2,25 @@ import sys
 import os
 import csv
 import random
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QGridLayout, QScrollArea, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QMessageBox, QInputDialog, QListWidget, QListWidgetItem, QFrame, QDialog, QProgressBar, QSizePolicy, QComboBox
 )
 from PyQt6.QtGui import QPixmap, QFont, QIcon
 from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer
-from scraper.serebii_card_scraper import SerebiiCardScraper
+# Only what the splash screen needs is imported up front. pandas, numpy,
+# requests, BeautifulSoup, cryptography and the scraper are imported where they
+# are first used (loading a set, networking, encryption), so they stay off the
+# startup path; benchmarks/startup_benchmark.py checks this against a budget.
+from card_database import get_card_database
+from set_catalog import diff_catalog, load_catalog, refresh_catalog
+from logo_atlas import ensure_logo_atlas, get_logo_atlas
+from thumbnail_cache import thumbnail
+from card_view import CardListModel, CardListView
 import secrets
 import string
 import socket
 import threading
 import json
-import base64
-import hashlib
-from cryptography.fernet import Fernet
-
-def generate_shared_key(session_code):
-    # Derive a 32-byte key from the session code using SHA-256
-    digest = hashlib.sha256(session_code.encode('utf-8')).digest()
-    return base64.urlsafe_b64encode(digest)
-
-def encrypt_message(message, session_code):
-    key = generate_shared_key(session_code)
-    f = Fernet(key)
-    token = f.encrypt(message.encode('utf-8'))
-    return token
-
-def decrypt_message(token, session_code):
-    key = generate_shared_key(session_code)
-    f = Fernet(key)
-    return f.decrypt(token).decode('utf-8')
 
 class ImageDownloadDialog(QDialog):
     def __init__(self, card_df, set_id, parent=None):
@@ -58,8 +44,348 @@ class ImageDownloadDialog(QDialog):
 
     def update_progress(self, idx, total, card_name):
         self.progress.setValue(idx)
-        self.card_label.setText(f"Downloading: {card_name}")
-        QApplication.processEvents()
+        if card_name:
+            self.card_label.setText(f"Downloading: {card_name}")
+
+class ImageDownloadThread(QThread):
+    progress = pyqtSignal(int, int, str)
+    finished = pyqtSignal(bool)
+    def __init__(self, jobs):
+        super().__init__()
+        from scraper.image_downloader import ImageDownloader
+        self.downloader = ImageDownloader()
+        self.jobs = jobs
+    def cancel(self):
+        self.downloader.cancel()
+    def run(self):
+        try:
+            self.downloader.download_all(self.jobs, progress=self.progress.emit)
+            self.finished.emit(True)
+        except Exception as e:
+            print(f"[WARN] Image download failed: {e}")
+            self.finished.emit(False)
+
+def card_image_filename(row):
+    # Images are saved as <number>_<name><ext>, e.g. 12_Pikachu.jpg
+    num = str(row['number']).split('/')[0].replace(' ', '')
+    name = str(row['name']).replace(' ', '').replace('/', '').replace('?', '')
+    img_url = row['image_url']
+    ext = os.path.splitext(img_url)[-1] if '.' in img_url else '.jpg'
+    return f"{num}_{name}{ext}"
+
+def set_image_jobs(card_df, set_dir):
+    # (url, path, label) download jobs for every card of a set
+    return [(row['image_url'], os.path.join(set_dir, card_image_filename(row)), row['name'])
+            for _, row in card_df.iterrows()]
+
+# Background prefetch of card images while the splash screen is idle.
+# PREFETCH_ORDER is 'recent' (recently played sets first, then newest) or
+# 'release_date' (newest sets first).
+PREFETCH_ORDER = 'recent'
+PREFETCH_DELAY_MS = 3000
+PREFETCH_WORKERS = 2
+PREFETCH_MAX_BYTES_PER_SEC = 512 * 1024
+# Only the few sets the player is likely to open next; the rest download on demand
+PREFETCH_MAX_SETS = 3
+RECENT_SETS_PATH = os.path.join('data', 'recent_sets.json')
+RECENT_SETS_LIMIT = 10
+
+def load_recent_sets():
+    try:
+        with open(RECENT_SETS_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def record_recent_set(set_id):
+    recent = [s for s in load_recent_sets() if s != set_id]
+    recent.insert(0, set_id)
+    try:
+        with open(RECENT_SETS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(recent[:RECENT_SETS_LIMIT], f)
+    except OSError as e:
+        print(f"[WARN] Could not save recent sets: {e}")
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+
+def parse_release_date(text):
+    # Lenient parse of Serebii dates like "March 28th 2025"; (0, 0, 0) if unknown
+    import re
+    text = (text or '').lower()
+    year = re.search(r'(19|20)\d\d', text)
+    month = next((i + 1 for i, m in enumerate(MONTHS) if m in text or m[:3] in text.split()), 0)
+    day = re.search(r'\b(\d{1,2})(st|nd|rd|th)?\b', text)
+    return (int(year.group(0)) if year else 0, month, int(day.group(1)) if day else 0)
+
+def set_id_from_url(set_url):
+    return set_url.rstrip('/').split('/')[-1]
+
+def prefetch_order(sets, order=PREFETCH_ORDER, limit=PREFETCH_MAX_SETS):
+    """The (at most limit) set ids to prefetch, most likely to be played first."""
+    by_date = sorted(sets, key=lambda s: parse_release_date(s.get('release_date')), reverse=True)
+    set_ids = [set_id_from_url(s['url']) for s in by_date]
+    if order == 'recent':
+        recent = [s for s in load_recent_sets() if s in set_ids]
+        set_ids = recent + [s for s in set_ids if s not in recent]
+    return set_ids[:limit]
+
+class PrefetchThread(QThread):
+    def __init__(self, set_ids, parquet_path='data/pokemon_cards_all_latest.parquet', image_dir='images'):
+        super().__init__()
+        self.set_ids = set_ids
+        self.parquet_path = parquet_path
+        self.image_dir = image_dir
+        from scraper.image_downloader import ImageDownloader
+        self.downloader = ImageDownloader(max_workers=PREFETCH_WORKERS, max_bytes_per_sec=PREFETCH_MAX_BYTES_PER_SEC)
+    def cancel(self):
+        self.downloader.cancel()
+    def run(self):
+        db = get_card_database(self.parquet_path)
+        for set_id in self.set_ids:
+            if self.downloader.cancelled.is_set():
+                break
+            try:
+                card_df = db.get_set_df(set_id)
+                if card_df.empty:
+                    continue
+                set_dir = os.path.join(self.image_dir, set_id)
+                os.makedirs(set_dir, exist_ok=True)
+                n = self.downloader.download_all(set_image_jobs(card_df, set_dir))
+                if n:
+                    print(f"[INFO] Prefetched {n} images for set {set_id}")
+            except Exception as e:
+                print(f"[WARN] Prefetch failed for set {set_id}: {e}")
+        print("[INFO] Image prefetch stopped." if self.downloader.cancelled.is_set() else "[INFO] Image prefetch complete.")
+
+class CatalogRefreshThread(QThread):
+    # Refreshes the set catalog and logo atlas off the GUI thread; emits the new entries, or an error message
+    refreshed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    def __init__(self):
+        super().__init__()
+        from scraper.image_downloader import ImageDownloader
+        self.downloader = ImageDownloader(max_workers=4)
+    def cancel(self):
+        self.downloader.cancel()
+    def run(self):
+        try:
+            sets = refresh_catalog(downloader=self.downloader)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if sets:
+            try:
+                ensure_logo_atlas([s['logo_file'] for s in sets])
+            except Exception as e:
+                print(f"[WARN] Could not build the logo atlas: {e}")
+            self.refreshed.emit(sets)
+        else:
+            self.failed.emit("the set list was empty")
+
+class NetworkThread(QThread):
+    """
+    Runs a network play session (net_play) on an asyncio loop in this
+    thread. role is 'host' or 'join'. Messages from the other player arrive
+    as received(dict) on the GUI thread, but only after attach(); anything
+    that arrives before that is held and delivered by attach(). send() may
+    be called from the GUI thread once connected has been emitted.
+    """
+    listening = pyqtSignal(int)
+    connected = pyqtSignal(object)
+    received = pyqtSignal(object)
+    disconnected = pyqtSignal(str)
+    # Emitted from the session thread, handled on the GUI thread
+    _incoming = pyqtSignal(object)
+    _ended = pyqtSignal(str)
+    def __init__(self, role, session_code, info, host, port):
+        super().__init__()
+        self.role = role
+        self.session_code = session_code
+        self.info = info
+        self.host = host
+        self.port = port
+        self._loop = None
+        self._task = None
+        self._outbox = None
+        self._attached = False
+        self._held = []
+        self._end_reason = None
+        self._incoming.connect(self._on_incoming)
+        self._ended.connect(self._on_ended)
+    def attach(self, on_message, on_disconnected):
+        # Start delivering the game's messages, first the ones held since connected
+        self.received.connect(on_message)
+        self.disconnected.connect(on_disconnected)
+        self._attached = True
+        held, self._held = self._held, []
+        for message in held:
+            self.received.emit(message)
+        if self._end_reason is not None:
+            self.disconnected.emit(self._end_reason)
+    def _on_incoming(self, message):
+        if self._attached:
+            self.received.emit(message)
+        else:
+            self._held.append(message)
+    def _on_ended(self, reason):
+        if self._attached:
+            self.disconnected.emit(reason)
+        else:
+            self._end_reason = reason
+    def run(self):
+        import asyncio
+        try:
+            asyncio.run(self._main())
+        finally:
+            # The loop is closed now; send() and stop() must not touch it
+            self._loop = None
+    async def _main(self):
+        import asyncio
+        import net_play
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._outbox = asyncio.Queue()
+        try:
+            if self.role == 'host':
+                conn, peer_info = await net_play.host_session(self.session_code, self.info, self.host, self.port,
+                                                              on_listening=self.listening.emit)
+            else:
+                conn, peer_info = await net_play.join_session(self.session_code, self.info, self.host, self.port)
+        except asyncio.CancelledError:
+            self.disconnected.emit("Cancelled")
+            return
+        except Exception as e:
+            self.disconnected.emit(str(e) or type(e).__name__)
+            return
+        self.connected.emit(peer_info)
+        sender = asyncio.create_task(self._send_loop(conn))
+        reason = "The other player left the game"
+        try:
+            async for message in conn:
+                self._incoming.emit(message)
+        except asyncio.CancelledError:
+            reason = "Disconnected"
+        except Exception as e:
+            reason = f"Connection lost: {e}"
+        finally:
+            sender.cancel()
+            await conn.close()
+        self._ended.emit(reason)
+    async def _send_loop(self, conn):
+        while True:
+            message = await self._outbox.get()
+            # Send whatever else queued up in the same batch
+            batch = [message]
+            while not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            await conn.send_many(batch)
+    def send(self, message):
+        # Returns False once the session is over and the message was dropped
+        loop = self._loop
+        if loop is None:
+            return False
+        try:
+            loop.call_soon_threadsafe(self._outbox.put_nowait, message)
+        except RuntimeError:
+            return False  # the loop closed in the meantime
+        return True
+    def stop(self):
+        # Cancel the session and wait for the thread to finish
+        loop = self._loop
+        if loop is not None and self._task is not None:
+            try:
+                loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # the loop has already finished
+        self.wait()
+
+class NetworkSetupDialog(QDialog):
+    # Host a session (shows the session code) or join one; accepted once the other player is connected
+    def __init__(self, set_id, num_cards, parent=None):
+        super().__init__(parent)
+        import net_play
+        self.setWindowTitle("Play over the Network")
+        self.setModal(True)
+        self.setMinimumWidth(420)
+        self.info = {'set_id': set_id, 'cards': num_cards}
+        self.thread = None
+        self.peer_info = None
+        vbox = QVBoxLayout()
+        vbox.addWidget(QLabel("<b>Host</b> a game and tell your friend the code, or <b>join</b> theirs.<br>Both players need the same set."))
+        self.host_btn = QPushButton("Host a Game")
+        self.host_btn.clicked.connect(self.host_game)
+        vbox.addWidget(self.host_btn)
+        join_row = QHBoxLayout()
+        self.address_entry = QLineEdit()
+        self.address_entry.setPlaceholderText(f"Host address, e.g. 192.168.1.20:{net_play.DEFAULT_PORT}")
+        self.code_entry = QLineEdit()
+        self.code_entry.setPlaceholderText("Session code")
+        self.join_btn = QPushButton("Join")
+        self.join_btn.clicked.connect(self.join_game)
+        join_row.addWidget(self.address_entry, 2)
+        join_row.addWidget(self.code_entry, 1)
+        join_row.addWidget(self.join_btn)
+        vbox.addLayout(join_row)
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        vbox.addWidget(self.status_label)
+        self.setLayout(vbox)
+    def host_game(self):
+        import net_play
+        self.session_code = net_play.new_session_code()
+        self.start(NetworkThread('host', self.session_code, self.info, '0.0.0.0', net_play.DEFAULT_PORT))
+        self.status_label.setText("Starting...")
+    def join_game(self):
+        import net_play
+        address = self.address_entry.text().strip()
+        code = self.code_entry.text().strip().upper()
+        if not address or not code:
+            self.status_label.setText("Enter the host's address and the session code.")
+            return
+        host, _, port = address.rpartition(':') if ':' in address else (address, '', '')
+        try:
+            port = int(port) if port else net_play.DEFAULT_PORT
+        except ValueError:
+            self.status_label.setText(f"Bad port in {address}")
+            return
+        self.start(NetworkThread('join', code, self.info, host, port))
+        self.status_label.setText(f"Connecting to {host}:{port}...")
+    def start(self, thread):
+        self.host_btn.setEnabled(False)
+        self.join_btn.setEnabled(False)
+        self.thread = thread
+        thread.listening.connect(self.on_listening)
+        thread.connected.connect(self.on_connected)
+        thread.disconnected.connect(self.on_failed)
+        thread.start()
+    def on_listening(self, port):
+        try:
+            address = socket.gethostbyname(socket.gethostname())
+        except OSError:
+            address = "this computer's address"
+        self.status_label.setText(f"Session code: <b>{self.session_code}</b><br>Waiting for a player to join at {address}:{port}...")
+    def on_connected(self, peer_info):
+        self.peer_info = peer_info
+        # The game window takes over the thread's signals from here
+        self.thread.listening.disconnect(self.on_listening)
+        self.thread.connected.disconnect(self.on_connected)
+        self.thread.disconnected.disconnect(self.on_failed)
+        self.accept()
+    def on_failed(self, reason):
+        if self.thread is not None:
+            self.thread.wait()
+        self.thread = None
+        self.host_btn.setEnabled(True)
+        self.join_btn.setEnabled(True)
+        self.status_label.setText(f"Could not start the game: {reason}")
+    def reject(self):
+        if self.thread is not None:
+            self.thread.disconnected.disconnect(self.on_failed)
+            self.thread.stop()
+            self.thread = None
+        super().reject()
 
 def download_set_images(card_df, set_id, image_dir='images', parent=None):
     """
@@ -69,37 +395,29 @@ def download_set_images(card_df, set_id, image_dir='images', parent=None):
     """
     set_dir = os.path.join(image_dir, set_id)
     os.makedirs(set_dir, exist_ok=True)
+    jobs = set_image_jobs(card_df, set_dir)
+    if all(os.path.exists(path) for _, path, _ in jobs):
+        print(f"[INFO] All images for set {set_id} already downloaded.")
+        return
+    # Download on a worker thread; the dialog's event loop keeps the GUI responsive
     dialog = ImageDownloadDialog(card_df, set_id, parent)
-    dialog.show()
-    total = len(card_df)
-    for idx, (_, row) in enumerate(card_df.iterrows(), 1):
-        num = str(row['number']).split('/')[0].replace(' ', '')
-        name = str(row['name']).replace(' ', '').replace('/', '').replace('?', '')
-        img_url = row['image_url']
-        ext = os.path.splitext(img_url)[-1] if '.' in img_url else '.jpg'
-        fname = f"{num}_{name}{ext}"
-        fpath = os.path.join(set_dir, fname)
-        dialog.update_progress(idx, total, row['name'])
-        if not os.path.exists(fpath):
-            try:
-                resp = requests.get(img_url, timeout=10)
-                resp.raise_for_status()
-                with open(fpath, 'wb') as f:
-                    f.write(resp.content)
-                print(f"[INFO] Downloaded {fname}")
-            except Exception as e:
-                print(f"[WARN] Could not download {img_url}: {e}")
-        else:
-            print(f"[INFO] Already have {fname}")
-    dialog.close()
+    worker = ImageDownloadThread(jobs)
+    worker.progress.connect(dialog.update_progress)
+    worker.finished.connect(lambda ok: dialog.accept())
+    worker.start()
+    dialog.exec()
+    # Closing the dialog early cancels the remaining downloads
+    worker.cancel()
+    worker.wait()
     print(f"[INFO] All images for set {set_id} processed.")
 
 def get_set_df_from_parquet(set_id, parquet_path='data/pokemon_cards_all_latest.parquet'):
     """
     Load the card data for a set from the big Parquet file.
+    The file is opened once per process and each set is cached after its
+    first load, so this returns a copy the caller is free to modify.
     """
-    df = pd.read_parquet(parquet_path)
-    return df[df['set_id'] == set_id].copy()
+    return get_card_database(parquet_path).get_set_df(set_id).copy()
 
 class FlowLayout(QHBoxLayout):
     # Simple flow layout for mini cards
@@ -116,9 +434,10 @@ class MiniCardWidget(QWidget):
         img_path = card.get('local_image')
         # Use the full local_image path as is
         name = card.get('name', 'Unknown')
+        self.img_path = img_path
         self.img_label = QLabel()
-        if img_path and os.path.exists(img_path):
-            pixmap = QPixmap(img_path).scaled(*thumb_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = thumbnail(img_path, thumb_size)
+        if pixmap is not None:
             self.img_label.setPixmap(pixmap)
         else:
             self.img_label.setText("[No Image]")
@@ -132,160 +451,68 @@ class MiniCardWidget(QWidget):
         self.setMaximumWidth(80)
         self.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
     def set_thumb_size(self, size):
-        img_path = self.img_label.pixmap()
-        if img_path:
-            self.img_label.setPixmap(img_path.scaled(*size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-
-class CardWidget(QWidget):
-    def __init__(self, card, thumb_size=(100, 140)):
-        super().__init__()
-        self.card = card
-        self.eliminated = False
-        self.thumb_size = thumb_size
-        # print(f"[DEBUG] CardWidget created for: {self.card.get('name', 'Unknown')}, image: {self.card.get('local_image')}")
-        self.init_ui()
-
-    def init_ui(self):
-        vbox = QVBoxLayout()
-        img_path = self.card.get('local_image')
-        # Use the full local_image path as is
-        name = self.card.get('name', 'Unknown')
-        if img_path and os.path.exists(img_path):
-            pixmap = QPixmap(img_path).scaled(*self.thumb_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.img_label = QLabel()
+        pixmap = thumbnail(self.img_path, size)
+        if pixmap is not None:
             self.img_label.setPixmap(pixmap)
-            self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        else:
-            self.img_label = QLabel("[No Image]")
-            self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.name_label = QLabel(name)
-        self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.name_label.setFont(QFont('Segoe UI', 9))
-        vbox.addWidget(self.img_label)
-        vbox.addWidget(self.name_label)
-        self.setLayout(vbox)
-        self.setAutoFillBackground(True)
-        self.update_style()
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            from PyQt6.QtWidgets import QMessageBox
-            reply = QMessageBox.question(self, "Are you sure?", "Are you sure you are ready to guess? (This will eliminate the card)",
-                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-            if reply == QMessageBox.StandardButton.Yes:
-                print(f"[DEBUG] Card clicked: {self.card.get('name', 'Unknown')}, eliminated: {self.eliminated}")
-                self.toggle_eliminated()
-                # Move to history as a guess
-                parent = self.parent()
-                while parent and not hasattr(parent, 'move_card_to_history'):
-                    parent = parent.parent()
-                if parent and hasattr(parent, 'move_card_to_history'):
-                    parent.move_card_to_history(self.card)
-            else:
-                print(f"[DEBUG] Card elimination cancelled for: {self.card.get('name', 'Unknown')}")
-
-    def toggle_eliminated(self):
-        self.eliminated = not self.eliminated
-        print(f"[DEBUG] Card elimination toggled: {self.card.get('name', 'Unknown')} -> {self.eliminated}")
-        self.update_style()
-
-    def update_style(self):
-        pal = self.palette()
-        if self.eliminated:
-            pal.setColor(self.backgroundRole(), Qt.GlobalColor.lightGray)
-            self.setStyleSheet("opacity: 0.4;")
-        else:
-            pal.setColor(self.backgroundRole(), Qt.GlobalColor.white)
-            self.setStyleSheet("")
-        self.setPalette(pal)
 
-class CardGrid(QWidget):
+class CardGrid(CardListView):
     def __init__(self, cards, on_card_guess=None):
-        super().__init__()
         self.cards = cards
-        self.card_widgets = []
+        self.card_model = CardListModel(cards)
+        super().__init__(self.card_model)
         self.on_card_guess = on_card_guess
-        self.init_ui()
+        # Bitset of the card positions still in play (bit i is self.cards[i])
+        self.remaining_bits = (1 << len(cards)) - 1
+        self.remaining_count = len(cards)
+        self.clicked.connect(self.card_clicked)
+        self.doubleClicked.connect(self.card_double_clicked)
 
-    def init_ui(self):
-        layout = QGridLayout()
-        row, col = 0, 0
-        cards_per_row = 6
-        for i, card in enumerate(self.cards):
-            # print(f"[DEBUG] Adding card to grid: {card.get('name', 'Unknown')} at row {row}, col {col}")
-            card_widget = CardWidget(card)
-            card_widget.mouseDoubleClickEvent = lambda e, c=card: self.card_double_clicked(c)
-            self.card_widgets.append(card_widget)
-            layout.addWidget(card_widget, row, col)
-            col += 1
-            if col >= cards_per_row:
-                col = 0
-                row += 1
-        self.setLayout(layout)
+    def card_clicked(self, index):
+        card = self.card_at(index)
+        if card is None:
+            return
+        reply = QMessageBox.question(self, "Are you sure?", "Are you sure you are ready to guess? (This will eliminate the card)",
+                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            print(f"[DEBUG] Card clicked: {card.get('name', 'Unknown')}")
+            self.move_card_to_history(card)
+        else:
+            print(f"[DEBUG] Card elimination cancelled for: {card.get('name', 'Unknown')}")
 
-    def card_double_clicked(self, card):
-        if self.on_card_guess:
+    def card_double_clicked(self, index):
+        card = self.card_at(index)
+        if card is not None and self.on_card_guess:
             self.on_card_guess(card)
 
     def reset_eliminations(self):
-        for w in self.card_widgets:
-            w.eliminated = False
-            w.update_style()
+        self.remaining_bits = (1 << len(self.cards)) - 1
+        self.remaining_count = len(self.cards)
+        self.card_model.reset_positions()
+
+    def eliminate_bits(self, bits):
+        # Eliminate every card whose position is set in the bitset
+        bits &= self.remaining_bits
+        if not bits:
+            return
+        self.remaining_bits &= ~bits
+        from question_engine import count_bits
+        self.remaining_count -= count_bits(bits)
+        self.card_model.mark_eliminated(bits)
 
     def eliminate_cards(self, filter_func):
-        for w in self.card_widgets:
-            if filter_func(w.card):
-                w.eliminated = True
-                w.update_style()
-
-    def sort_cards_by_elimination(self):
-        # Helper to extract card number for sorting
-        def card_number(card):
-            num = card.get('number', '')
-            try:
-                return int(num.split('/')[0])
-            except Exception:
-                return 9999
-        # Separate non-eliminated and eliminated
-        non_elim = [(w, card_number(w.card)) for w in self.card_widgets if not w.eliminated]
-        elim = [(w, card_number(w.card)) for w in self.card_widgets if w.eliminated]
-        non_elim.sort(key=lambda x: x[1])
-        elim.sort(key=lambda x: x[1])
-        # Remove all widgets from layout
-        layout = self.layout()
-        for i in reversed(range(layout.count())):
-            layout.itemAt(i).widget().setParent(None)
-        # Add back in sorted order, and ensure eliminated cards are greyed out
-        row, col = 0, 0
-        cards_per_row = 6
-        for w, _ in non_elim:
-            w.setEnabled(True)
-            w.update_style()
-            layout.addWidget(w, row, col)
-            col += 1
-            if col >= cards_per_row:
-                col = 0
-                row += 1
-        for w, _ in elim:
-            w.setEnabled(False)
-            w.eliminated = True
-            w.update_style()
-            layout.addWidget(w, row, col)
-            col += 1
-            if col >= cards_per_row:
-                col = 0
-                row += 1
+        bits = 0
+        for i, card in enumerate(self.cards):
+            if filter_func(card):
+                bits |= 1 << i
+        self.eliminate_bits(bits)
 
     def remove_eliminated_cards(self):
-        # Remove eliminated card widgets from the grid and from card_widgets list
-        to_remove = [w for w in self.card_widgets if w.eliminated]
-        layout = self.layout()
-        for w in to_remove:
-            for i in range(layout.count()):
-                if layout.itemAt(i).widget() == w:
-                    layout.itemAt(i).widget().setParent(None)
-                    break
-            self.card_widgets.remove(w)
+        # Drop eliminated cards in batches; the rest keep their sorted order
+        self.setUpdatesEnabled(False)
+        try:
+            self.card_model.remove_positions(self.card_model.eliminated_bits)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def move_card_to_history(self, card):
         # Find the GameWindow parent
@@ -294,22 +521,25 @@ class CardGrid(QWidget):
             parent = parent.parent()
         if parent and hasattr(parent, 'add_history_entry'):
             # Remove the card from the grid
-            for w in self.card_widgets:
-                if w.card == card:
-                    w.eliminated = True
-                    self.remove_eliminated_cards()
-                    break
+            pos = next((i for i, c in enumerate(self.cards) if c is card), None)
+            if pos is not None:
+                self.eliminate_bits(1 << pos)
+                self.remove_eliminated_cards()
             # Add to history as a guess
             question = f"Manual guess: {card.get('name', '')}"
             answer = "Eliminated by guess"
             parent.add_history_entry(question, [card], answer_override=answer)
 
 class GameWindow(QWidget):
-    def __init__(self, cards, manual_answer=False, selected_card=None):
+    def __init__(self, cards, manual_answer=False, selected_card=None, table=None, peer=None):
         super().__init__()
         self.setWindowTitle("Pokémon Card Guesser (PyQt6)")
         self.resize(1200, 900)
         self.cards = cards
+        from question_engine import CardIndex, CardTable
+        # Columnar view of the same cards, used for vectorized elimination
+        self.table = table if table is not None else CardTable.from_records(cards)
+        self.index = CardIndex(self.table)
         self.remaining_cards = cards.copy()
         self.manual_answer = manual_answer
         # Always select a random card in single player, only use selected_card in manual mode
@@ -318,7 +548,14 @@ class GameWindow(QWidget):
         else:
             self.selected_card = random.choice(self.cards)
         print(f"[DEBUG] Selected card for this game: {self.selected_card.get('name', 'Unknown')}")
+        # Network play: questions go to the other player's window, which answers
+        # from its own secret card (self.selected_card answers theirs)
+        self.peer = peer
+        self.pending_question = None
         self.init_ui()
+        if self.peer is not None:
+            self.setWindowTitle("Pokémon Card Guesser (PyQt6) - Network Game")
+            self.peer.attach(self.on_peer_message, self.on_peer_disconnected)
 
     def init_ui(self):
         main_layout = QHBoxLayout()
@@ -336,9 +573,8 @@ class GameWindow(QWidget):
             card_layout = QVBoxLayout()
             img_label = QLabel()
             img_path = self.selected_card.get('local_image')
-            if img_path and os.path.exists(img_path):
-                pixmap = QPixmap(img_path).scaled(180, 250, Qt.AspectRatioMode.KeepAspectRatio, 
-                                               Qt.TransformationMode.SmoothTransformation)
+            pixmap = thumbnail(img_path, (180, 250))
+            if pixmap is not None:
                 img_label.setPixmap(pixmap)
             else:
                 img_label.setText("[No Image]")
@@ -380,41 +616,44 @@ class GameWindow(QWidget):
         self.question_entry.setPlaceholderText("Ask a yes/no question (e.g. Is it a Fire type?)")
         self.question_entry.setFont(QFont('Segoe UI', 12))
         info_row.addWidget(self.question_entry)
-        ask_btn = QPushButton("Ask")
-        ask_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
-        ask_btn.setStyleSheet("background-color: #4CAF50; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
-        ask_btn.setMinimumHeight(40)
-        ask_btn.clicked.connect(self.process_question)
-        info_row.addWidget(ask_btn)
+        self.ask_btn = QPushButton("Ask")
+        self.ask_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
+        self.ask_btn.setStyleSheet("background-color: #4CAF50; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
+        self.ask_btn.setMinimumHeight(40)
+        self.ask_btn.clicked.connect(self.process_question)
+        info_row.addWidget(self.ask_btn)
         # Connect Enter key to ask question
         self.question_entry.returnPressed.connect(self.process_question)
         # Remove guess card button in manual (multiplayer) mode
+        self.guess_btn = None
         if not self.manual_answer:
-            guess_btn = QPushButton("Guess Card")
-            guess_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
-            guess_btn.setStyleSheet("background-color: #2196F3; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
-            guess_btn.setMinimumHeight(40)
-            guess_btn.clicked.connect(self.guess_card)
-            info_row.addWidget(guess_btn)
-        reset_btn = QPushButton("Reset Game")
-        reset_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
-        reset_btn.setStyleSheet("background-color: #FF9800; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
-        reset_btn.setMinimumHeight(40)
-        reset_btn.clicked.connect(self.reset_game)
-        info_row.addWidget(reset_btn)
+            self.guess_btn = QPushButton("Guess Card")
+            self.guess_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
+            self.guess_btn.setStyleSheet("background-color: #2196F3; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
+            self.guess_btn.setMinimumHeight(40)
+            self.guess_btn.clicked.connect(self.guess_card)
+            info_row.addWidget(self.guess_btn)
+        self.reset_btn = QPushButton("Reset Game")
+        self.reset_btn.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
+        self.reset_btn.setStyleSheet("background-color: #FF9800; color: white; padding: 10px 24px; border-radius: 8px; margin: 4px;")
+        self.reset_btn.setMinimumHeight(40)
+        self.reset_btn.clicked.connect(self.reset_game)
+        info_row.addWidget(self.reset_btn)
         middle_layout.addLayout(info_row)
 
         # Answer area
         self.answer_label = QLabel("")
         self.answer_label.setFont(QFont('Segoe UI', 11))
         middle_layout.addWidget(self.answer_label)
+        if self.peer is not None:
+            self.opponent_label = QLabel(f"Your secret card: {self.selected_card.get('name', 'Unknown')} | "
+                                         f"Opponent has {len(self.cards)} cards left")
+            self.opponent_label.setFont(QFont('Segoe UI', 10))
+            middle_layout.addWidget(self.opponent_label)
 
         # Card grid
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
         self.grid = CardGrid(self.cards, on_card_guess=self.reveal_card)
-        scroll.setWidget(self.grid)
-        middle_layout.addWidget(scroll)
+        middle_layout.addWidget(self.grid)
         main_layout.addLayout(middle_layout, 3)
 
         # Right: History panel (fixed width)
@@ -450,18 +689,85 @@ class GameWindow(QWidget):
         print(f"[DEBUG] Question asked: {q}")
         if not q:
             return
+        if self.peer is not None:
+            # The answer comes back as an 'answer' message (on_peer_message)
+            if self.pending_question is not None:
+                self.answer_label.setText(f"Q: {self.pending_question}\nWaiting for the other player...")
+                return
+            self.pending_question = q
+            self.peer.send({'type': 'question', 'text': q})
+            self.answer_label.setText(f"Q: {q}\nWaiting for the other player...")
+            self.question_entry.clear()
+            return
         if self.manual_answer:
             reply = QMessageBox.question(self, "Answer Question", f"Q: {q}\nIs the answer YES or NO?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             answer = "Yes" if reply == QMessageBox.StandardButton.Yes else "No"
         else:
             answer = self.answer_for_question(q)
         print(f"[DEBUG] User provided answer: {answer}")
+        self.question_entry.clear()
+        self.apply_answer(q, answer)
+
+    def apply_answer(self, q, answer):
+        # Show an answer and eliminate the cards it rules out; returns the eliminated bits
         self.answer_label.setText(f"Q: {q}\nA: {answer}")
         self.last_question = q
         self.last_answer = answer
-        self.question_entry.clear()
+        before = self.grid.remaining_bits
         eliminated_cards = self.eliminate_by_last_question(auto=True, return_eliminated=True)
         self.add_history_entry(q, eliminated_cards)
+        return before & ~self.grid.remaining_bits
+
+    def on_peer_message(self, message):
+        from net_play import ProtocolError, validate_game_message
+        try:
+            message = validate_game_message(message)
+        except ProtocolError as e:
+            print(f"[WARN] Ignoring network message: {e}")
+            return
+        kind = message['type']
+        if kind == 'question':
+            from question_engine import answer_card
+            q = message['text']
+            answer = answer_card(self.selected_card, q)
+            self.peer.send({'type': 'answer', 'question': q, 'answer': answer})
+            self.add_history_entry(f"(Opponent) {q}", [], answer_override=answer)
+        elif kind == 'answer' and message['question'] == self.pending_question:
+            self.pending_question = None
+            eliminated = self.apply_answer(message['question'], message['answer'])
+            self.peer.send({'type': 'eliminated', 'bits': format(eliminated, 'x'), 'remaining': self.grid.remaining_count})
+        elif kind == 'eliminated':
+            self.opponent_label.setText(f"Your secret card: {self.selected_card.get('name', 'Unknown')} | "
+                                        f"Opponent has {message['remaining']} cards left")
+        elif kind == 'guess':
+            name = message['name']
+            correct = name == self.selected_card.get('name')
+            self.peer.send({'type': 'guess_result', 'name': name, 'correct': correct})
+            self.add_history_entry(f"(Opponent) Is it {name}?", [], answer_override="Yes" if correct else "No")
+            if correct:
+                QMessageBox.information(self, "Found!", f"The other player found your card, {name}.")
+        elif kind == 'guess_result':
+            name = message['name']
+            if message['correct']:
+                QMessageBox.information(self, "Correct!", f"You guessed right! The card was {name}.")
+            else:
+                QMessageBox.warning(self, "Incorrect", f"Nope, the card was not {name}.")
+        elif kind == 'reset':
+            self.new_round()
+            self.answer_label.setText("The other player started a new game.")
+
+    def on_peer_disconnected(self, reason):
+        self.pending_question = None
+        self.answer_label.setText(f"Network game over: {reason}")
+        # Everything that would message the other player is off from here
+        for widget in (self.question_entry, self.ask_btn, self.guess_btn, self.reset_btn):
+            if widget is not None:
+                widget.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.peer is not None:
+            self.peer.stop()
+        super().closeEvent(event)
 
     def add_history_entry(self, question, eliminated_cards, answer_override=None):
         answer = answer_override if answer_override is not None else (self.last_answer if hasattr(self, 'last_answer') else '')
@@ -500,122 +806,17 @@ class GameWindow(QWidget):
         self.history_list.addWidget(entry_widget)
 
     def answer_for_question(self, q):
-        # Only consider the selected card if it is not eliminated
-        for w in self.grid.card_widgets:
-            if w.card == self.selected_card and w.eliminated:
-                return "No"
-        
         # Handle None card or missing data
-        card = self.selected_card
-        if card is None:
+        if self.selected_card is None:
             print("[DEBUG] Selected card is None, defaulting to No")
             return "No"
-            
-        # Normalize question for steel/metal equivalence
-        q_norm = q.replace('steel', 'metal')
-        
-        # Check for type
-        if "type" in q_norm:
-            types = card.get('types', [])
-            # Handle None types
-            if types is None:
-                types = []
-            for t in types:
-                if t is None:
-                    continue
-                t_norm = t.lower().replace('steel', 'metal')
-                print(f"[DEBUG] Checking type: {t_norm}")
-                if t_norm in q_norm:
-                    return "Yes"
-            return "No"
-            
-        # Check for holo/holographic
-        if "holo" in q_norm or "holographic" in q_norm:
-            # Accept both the boolean and the rarity string
-            holo = card.get('holographic', None)
-            rarity = card.get('rarity', '').strip().lower() if card.get('rarity') else ''
-            if holo is True or rarity == 'holographic':
-                return "Yes"
-            return "No"
-            
-        # Check for rarity
-        if "rarity" in q_norm:
-            r = card.get('rarity', '') 
-            if r is None:
-                r = ''
-            else:
-                r = r.strip().lower()
-            print(f"[DEBUG] Checking rarity: {r}")
-            import re
-            if r and re.search(rf'\b{re.escape(r)}\b', q_norm):
-                return "Yes"
-            return "No"
-            
-        # Check for HP
-        if "hp" in q_norm:
-            import re
-            hp = card.get('hp', '')
-            print(f"[DEBUG] Checking HP: {hp}")
-            # Handle None hp
-            if hp is None:
-                return "No"
-            # Extract integer from both the card's HP and the question
-            card_hp = None
-            if isinstance(hp, int):
-                card_hp = hp
-            elif isinstance(hp, str):
-                m = re.search(r'(\d+)', hp)
-                card_hp = int(m.group(1)) if m else None
-            q_hp = None
-            m2 = re.search(r'(\d+)', q_norm)
-            q_hp = int(m2.group(1)) if m2 else None
-            print(f"[DEBUG] Parsed card_hp: {card_hp}, q_hp: {q_hp}")
-            if card_hp is not None and q_hp is not None and card_hp == q_hp:
-                return "Yes"
+        # Only consider the selected card if it is not eliminated
+        pos = next((i for i, c in enumerate(self.cards) if c is self.selected_card), None)
+        if pos is not None and not self.grid.remaining_bits >> pos & 1:
             return "No"
-            
-        # Check for trainer/supporter/stadium/tool in any relevant field
-        trainer_keywords = ["trainer", "supporter", "stadium", "tool"]
-        for keyword in trainer_keywords:
-            if keyword in q_norm:
-                ct = card.get('card_type', '') or ''
-                if ct is not None:
-                    ct = ct.lower().replace('steel', 'metal')
-                else:
-                    ct = ''
-                    
-                types = card.get('types', []) or []
-                if types is None:
-                    types = []
-                types = [t.lower().replace('steel', 'metal') if t else '' for t in types]
-                    
-                name = card.get('name', '') or ''
-                if name is not None:
-                    name = name.lower().replace('steel', 'metal')
-                else:
-                    name = ''
-                    
-                print(f"[DEBUG] Checking for '{keyword}' in card_type: {ct}, types: {types}, name: {name}")
-                if keyword in ct or keyword in name or any(keyword in t for t in types if t):
-                    return "Yes"
-                return "No"
-                
+        from question_engine import answer_card
         # In manual mode, make the selected card's name unguessable
-        if self.manual_answer:
-            # If the question is a direct guess of the name, always return No
-            if self.selected_card and self.selected_card.get('name'):
-                name = self.selected_card['name'].strip().lower()
-                if name and name in q.strip().lower():
-                    return "No"
-        
-        # Fallback: check if any word in q_norm is in card fields (with steel/metal normalization)
-        for k, v in card.items():
-            if v is None:
-                continue
-            if isinstance(v, str) and v.lower().replace('steel', 'metal') in q_norm:
-                print(f"[DEBUG] Fallback match: {k}={v}")
-                return "Yes"
-        return "No"
+        return answer_card(self.selected_card, q, protect_name=self.manual_answer)
 
     def guess_card(self):
         if self.manual_answer:
@@ -625,7 +826,9 @@ class GameWindow(QWidget):
         names = [c['name'] for c in self.cards]
         print(f"[DEBUG] Guess card dialog opened. Possible names: {names[:5]}... (total {len(names)})")
         guess, ok = QInputDialog.getItem(self, "Guess the Card", "Which card do you think it is?", names, 0, False)
-        if ok and guess:
+        if ok and guess and self.peer is not None:
+            self.peer.send({'type': 'guess', 'name': guess})
+        elif ok and guess:
             print(f"[DEBUG] User guessed: {guess}, actual: {self.selected_card['name']}")
             if guess == self.selected_card['name']:
                 QMessageBox.information(self, "Correct!", f"You guessed right! The card was {guess}.")
@@ -643,7 +846,7 @@ class GameWindow(QWidget):
             QMessageBox.information(self, "Game Reset", "Pick a new secret card to start a new game.")
             from PyQt6.QtCore import QTimer
             def show_card_picker():
-                win = FriendManualGameWindow(self.cards)
+                win = FriendManualGameWindow(self.cards, table=self.table)
                 win.show()
                 # Keep reference to prevent garbage collection
                 app = QApplication.instance()
@@ -652,7 +855,14 @@ class GameWindow(QWidget):
             QTimer.singleShot(100, show_card_picker)
             self.close()
             return
+        self.new_round()
+        if self.peer is not None:
+            self.peer.send({'type': 'reset'})
+        QMessageBox.information(self, "Game Reset", "The game has been reset with a new secret card.")
+
+    def new_round(self):
         self.selected_card = random.choice(self.cards)
+        self.pending_question = None
         print(f"[DEBUG] Game reset. New selected card: {self.selected_card.get('name', 'Unknown')}")
         if hasattr(self, 'history_list'):
             while self.history_list.count():
@@ -668,17 +878,15 @@ class GameWindow(QWidget):
             reset_layout.addWidget(reset_label)
             reset_widget.setLayout(reset_layout)
             self.history_list.addWidget(reset_widget)
-        scroll = self.findChild(QScrollArea)
-        if scroll:
-            new_grid = CardGrid(self.cards, on_card_guess=self.reveal_card)
-            scroll.setWidget(new_grid)
-            self.grid = new_grid
-        else:
-            self.grid.reset_eliminations()
+        # Reuse the grid: restore every card from its master ordering
+        self.grid.reset_eliminations()
+        self.grid.scrollToTop()
         self.answer_label.setText("")
         self.info_label.setText(f"Cards remaining: {len(self.cards)}")
         self.question_entry.clear()
-        QMessageBox.information(self, "Game Reset", "The game has been reset with a new secret card.")
+        if self.peer is not None:
+            self.opponent_label.setText(f"Your secret card: {self.selected_card.get('name', 'Unknown')} | "
+                                        f"Opponent has {len(self.cards)} cards left")
 
     def eliminate_by_last_question(self, auto=False, return_eliminated=False):
         if not hasattr(self, 'last_question') or not hasattr(self, 'last_answer'):
@@ -688,31 +896,16 @@ class GameWindow(QWidget):
         q = self.last_question
         a = self.last_answer
         print(f"[DEBUG] Eliminating cards based on: Q: {q} | A: {a}")
-        eliminated_cards = []
+        from question_engine import iter_bits, split_by_bits
         # Only consider non-eliminated cards for elimination
-        def filter_func(card):
-            # Find the widget for this card
-            for w in self.grid.card_widgets:
-                if w.card == card and not w.eliminated:
-                    gw = GameWindow([card])
-                    gw.selected_card = card
-                    ans = gw.answer_for_question(q)
-                    print(f"[DEBUG] Card {card.get('name','?')} would answer: {ans}")
-                    if a == "Yes" and ans == "No":
-                        eliminated_cards.append(card)
-                        return True
-                    if a == "No" and ans == "Yes":
-                        eliminated_cards.append(card)
-                        return True
-            return False
-        self.grid.eliminate_cards(filter_func)
+        _, eliminated = split_by_bits(self.index, self.grid.remaining_bits, q, a)
+        eliminated_cards = [self.cards[i] for i in iter_bits(eliminated)]
+        print(f"[DEBUG] {len(eliminated_cards)} of {self.grid.remaining_count} cards eliminated")
+        self.grid.eliminate_bits(eliminated)
         # Remove eliminated cards from the grid and card_widgets
         self.grid.remove_eliminated_cards()
         # Update info label
-        remaining = sum(1 for w in self.grid.card_widgets if not w.eliminated)
-        self.info_label.setText(f"Cards remaining: {remaining}")
-        # Sort the grid after elimination
-        self.grid.sort_cards_by_elimination()
+        self.info_label.setText(f"Cards remaining: {self.grid.remaining_count}")
         if return_eliminated:
             return eliminated_cards
         return None
@@ -727,9 +920,9 @@ class SplashScreen(QWidget):
         title = QLabel("<h1>Pokémon Card Guesser</h1>")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
-        info = QLabel('<b>Note:</b> Loading the set list and logos may take up to 30 seconds on first launch.')
-        info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(info)
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status_label)
         credit = QLabel('<a href="https://www.pokemon.com">Pokémon images © Nintendo/Creatures Inc./GAME FREAK inc.</a>')
         credit.setOpenExternalLinks(True)
         credit.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -750,77 +943,113 @@ class SplashScreen(QWidget):
         QTimer.singleShot(100, self.load_sets)
 
     def load_sets(self):
-        # Show a loading dialog while fetching set info and logos
-        loading_dialog = ProgressDialog("Welcome! Loading set list and logos...")
-        loading_dialog.show()
-        QApplication.processEvents()
-        sets = self.get_english_set_links()
-        os.makedirs('images/assets/set_logos', exist_ok=True)
-        # Check if all set logos are already downloaded
-        logo_files = set(os.listdir('images/assets/set_logos'))
-        expected_logos = set(os.path.basename(s['logo_url']) for s in sets if s['logo_url'])
-        if expected_logos.issubset(logo_files):
-            loading_dialog.close()
+        # Draw the saved catalog right away, then refresh it in the background
+        self.sets = load_catalog()
+        if self.sets:
+            self.display_sets(self.sets)
+            self.status_label.setText("Checking for new sets...")
+            QTimer.singleShot(PREFETCH_DELAY_MS, lambda: self.start_prefetch(self.sets))
+        else:
+            self.status_label.setText("Loading the set list for the first time...")
+        self.catalog_thread = CatalogRefreshThread()
+        self.catalog_thread.refreshed.connect(self.on_catalog_refreshed)
+        self.catalog_thread.failed.connect(self.on_catalog_failed)
+        self.catalog_thread.start()
+
+    def on_catalog_refreshed(self, sets):
+        added, removed, changed = diff_catalog(self.sets, sets)
+        first_load = not self.sets
+        self.sets = sets
+        get_logo_atlas().reload()
+        if added or removed or changed:
             self.display_sets(sets)
+        new_sets = len(added) if not first_load else 0
+        self.status_label.setText(f"{new_sets} new set{'s' if new_sets != 1 else ''} added" if new_sets else "")
+        if first_load:
+            QTimer.singleShot(PREFETCH_DELAY_MS, lambda: self.start_prefetch(self.sets))
+
+    def on_catalog_failed(self, message):
+        print(f"[WARN] Could not refresh the set list: {message}")
+        if self.sets:
+            self.status_label.setText("")
+        else:
+            self.status_label.setText("Could not load the set list. Check your connection and restart.")
+
+    def stop_catalog_refresh(self):
+        thread = getattr(self, 'catalog_thread', None)
+        if thread is not None and thread.isRunning():
+            thread.cancel()
+            thread.wait()
+
+    def start_prefetch(self, sets):
+        # Download images for likely next sets at low priority while idle
+        if getattr(self, 'prefetch_thread', None) is not None:
             return
-        # Download missing logos
-        for s in sets:
-            logo_path = None
-            logo_url = s.get('logo_url')
-            if logo_url:
-                logo_filename = os.path.basename(logo_url)
-                logo_path = os.path.join('images', 'assets', 'set_logos', logo_filename)
-                if not os.path.exists(logo_path):
-                    try:
-                        from urllib.request import urlretrieve
-                        urlretrieve(logo_url, logo_path)
-                    except Exception:
-                        logo_path = None
-        loading_dialog.close()
-        self.display_sets(sets)
+        self.prefetch_thread = PrefetchThread(prefetch_order(sets))
+        self.prefetch_thread.start()
+
+    def stop_prefetch(self):
+        thread = getattr(self, 'prefetch_thread', None)
+        if thread is not None and thread.isRunning():
+            thread.cancel()
+            thread.wait()
 
     def display_sets(self, sets):
-        # Make the set grid scrollable
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        grid_widget = QWidget()
-        grid_layout = QGridLayout()
-        grid_layout.setSpacing(12)
-        row, col = 0, 0
+        """
+        Show a button per set, in catalog order. Buttons are kept by set URL,
+        so a refresh only creates buttons for new sets, drops removed ones
+        and reloads the logos that changed.
+        """
+        if not hasattr(self, 'sets_grid_widget'):
+            # Make the set grid scrollable
+            scroll = QScrollArea()
+            scroll.setWidgetResizable(True)
+            grid_widget = QWidget()
+            self.set_grid_layout = QGridLayout()
+            self.set_grid_layout.setSpacing(12)
+            grid_widget.setLayout(self.set_grid_layout)
+            scroll.setWidget(grid_widget)
+            self.sets_grid_widget = scroll
+            self.set_buttons = {}
+            self.layout().addWidget(scroll)
+        wanted = {s['url']: s for s in sets}
+        for url in [url for url in self.set_buttons if url not in wanted]:
+            btn, _ = self.set_buttons.pop(url)
+            self.set_grid_layout.removeWidget(btn)
+            btn.deleteLater()
         sets_per_row = 4
-        for s in sets:
-            logo_path = None
-            logo_url = s.get('logo_url')
-            if logo_url:
-                logo_filename = os.path.basename(logo_url)
-                logo_path = os.path.join('images', 'assets', 'set_logos', logo_filename)
-            btn = QPushButton()
-            btn.setMinimumSize(160, 80)
-            btn.setMaximumSize(180, 100)
-            # Remove the set name text, only show logo
-            if logo_path and os.path.exists(logo_path):
-                pixmap = QPixmap(logo_path).scaled(100, 50, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                btn.setIcon(QIcon(pixmap))
-                btn.setIconSize(QSize(100, 50))
-            btn.setStyleSheet("QPushButton { padding-left: 8px; }")
-            btn.clicked.connect(lambda checked, url=s['url']: self.on_set_selected(url))
-            grid_layout.addWidget(btn, row, col)
-            col += 1
-            if col >= sets_per_row:
-                col = 0
-                row += 1
-        grid_widget.setLayout(grid_layout)
-        scroll.setWidget(grid_widget)
-        # Remove old grid if present
-        if hasattr(self, 'sets_grid_widget'):
-            self.layout().removeWidget(self.sets_grid_widget)
-            self.sets_grid_widget.deleteLater()
-        self.sets_grid_widget = scroll
-        self.layout().addWidget(scroll)
+        for i, s in enumerate(sets):
+            btn, logo_file = self.set_buttons.get(s['url'], (None, None))
+            is_new = btn is None
+            if is_new:
+                btn = QPushButton()
+                btn.setMinimumSize(160, 80)
+                btn.setMaximumSize(180, 100)
+                btn.setStyleSheet("QPushButton { padding-left: 8px; }")
+                btn.clicked.connect(lambda checked, url=s['url']: self.on_set_selected(url))
+            if is_new or logo_file != s.get('logo_file'):
+                self.set_button_logo(btn, s.get('logo_file'))
+            self.set_buttons[s['url']] = (btn, s.get('logo_file'))
+            # addWidget moves an existing button to its new cell
+            self.set_grid_layout.addWidget(btn, i // sets_per_row, i % sets_per_row)
+
+    def set_button_logo(self, btn, logo_path):
+        # Only the logo is shown, no set name text. Logos come from the atlas
+        # (one decode for the whole grid); files not in it yet are read directly
+        pixmap = get_logo_atlas().pixmap(logo_path) if logo_path else None
+        if pixmap is None and logo_path and os.path.exists(logo_path):
+            pixmap = QPixmap(logo_path).scaled(100, 50, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        if pixmap is not None:
+            btn.setIcon(QIcon(pixmap))
+            btn.setIconSize(QSize(100, 50))
+        else:
+            btn.setIcon(QIcon())
 
     def get_set_logo_url(self, set_url):
+        from bs4 import BeautifulSoup
+        from scraper.http_cache import get_http_cache
         try:
-            resp = requests.get(set_url)
+            resp = get_http_cache().get(set_url)
             soup = BeautifulSoup(resp.text, 'html.parser')
             meta = soup.find('meta', property='og:image')
             if meta and meta.get('content'):
@@ -830,44 +1059,8 @@ class SplashScreen(QWidget):
         return None
 
     def get_english_set_links(self):
-        url = "https://www.serebii.net/card/english.shtml"
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        sets = []
-        # Find the main table with all sets
-        main_table = None
-        for table in soup.find_all('table'):
-            headers = [th.get_text(strip=True).lower() for th in table.find_all('td')[:5]]
-            if 'set name' in ''.join(headers).lower() and 'number of cards' in ''.join(headers).lower():
-                main_table = table
-                break
-        if not main_table:
-            return sets
-        for row in main_table.find_all('tr')[1:]:
-            cells = row.find_all('td')
-            if len(cells) < 5:
-                continue
-            # Set detail page
-            set_link = cells[2].find('a')
-            set_name = set_link.get_text(strip=True) if set_link else ''
-            set_url = f"https://www.serebii.net{set_link['href']}" if set_link and set_link.has_attr('href') else ''
-            # Set logo
-            logo_img = cells[0].find('img')
-            logo_url = f"https://www.serebii.net{logo_img['src']}" if logo_img and logo_img.has_attr('src') else ''
-            # Number of cards
-            num_cards = cells[3].get_text(strip=True)
-            # Release date
-            release_date = cells[4].get_text(strip=True)
-            if set_url and set_name:
-                sets.append({
-                    'name': set_name,
-                    'url': set_url,
-                    'logo_url': logo_url,
-                    'num_cards': num_cards,
-                    'release_date': release_date
-                })
-        return sets
+        from scraper.serebii_card_scraper import fetch_english_sets
+        return fetch_english_sets()
 
 class ScrapeThread(QThread):
     progress = pyqtSignal(str)
@@ -920,26 +1113,34 @@ class ModeSelectDialog(QDialog):
         single_btn.setStyleSheet("background-color: #4CAF50; color: white; font-size: 18px; padding: 16px; border-radius: 10px;")
         friend_btn = QPushButton("Play with a Friend")
         friend_btn.setStyleSheet("background-color: #2196F3; color: white; font-size: 18px; padding: 16px; border-radius: 10px;")
+        network_btn = QPushButton("Play over the Network")
+        network_btn.setStyleSheet("background-color: #9C27B0; color: white; font-size: 18px; padding: 16px; border-radius: 10px;")
         vbox.addWidget(single_btn)
         vbox.addWidget(friend_btn)
+        vbox.addWidget(network_btn)
         self.setLayout(vbox)
         self.selected_mode = None
         single_btn.clicked.connect(self.choose_single)
         friend_btn.clicked.connect(self.choose_friend)
+        network_btn.clicked.connect(self.choose_network)
     def choose_single(self):
         self.selected_mode = 'single'
         self.accept()
     def choose_friend(self):
         self.selected_mode = 'friend'
         self.accept()
+    def choose_network(self):
+        self.selected_mode = 'network'
+        self.accept()
 
 class FriendManualGameWindow(QWidget):
-    def __init__(self, cards):
+    def __init__(self, cards, table=None):
         print("[DEBUG] FriendManualGameWindow __init__ called")
         super().__init__()
         self.setWindowTitle("Pokémon Card Guesser - Play with a Friend (Manual)")
         self.resize(1200, 900)
         self.cards = cards
+        self.table = table
         self.selected_card = None
         self.init_ui()
 
@@ -1044,74 +1245,16 @@ class FriendManualGameWindow(QWidget):
         pick_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         right_panel.addWidget(pick_label)
         
-        # Scrollable card grid
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.card_grid = QWidget()
-        grid_layout = QGridLayout()
-        grid_layout.setSpacing(10)
-        
-        row, col = 0, 0
-        cards_per_row = 6
-        
-        for i, card in enumerate(self.cards):
-            card_widget = self.create_selectable_card_widget(card)
-            grid_layout.addWidget(card_widget, row, col)
-            col += 1
-            if col >= cards_per_row:
-                col = 0
-                row += 1
-        
-        self.card_grid.setLayout(grid_layout)
-        scroll.setWidget(self.card_grid)
-        right_panel.addWidget(scroll)
+        # Card grid (only the visible cards are painted)
+        self.card_grid = CardListView(CardListModel(self.cards, parent=self))
+        self.card_grid.clicked.connect(lambda index: self.card_selected(self.card_grid.card_at(index)))
+        right_panel.addWidget(self.card_grid)
         
         # Add both panels to main layout
         main_layout.addLayout(left_panel, 1)
         main_layout.addLayout(right_panel, 3)
         self.setLayout(main_layout)
 
-    def create_selectable_card_widget(self, card):
-        """Create a clickable card widget for the selection grid"""
-        widget = QWidget()
-        layout = QVBoxLayout()
-        layout.setContentsMargins(4, 4, 4, 4)
-        
-        # Card image
-        img_path = card.get('local_image')
-        name = card.get('name', 'Unknown')
-        
-        img_label = QLabel()
-        thumb_size = (100, 140)
-        if img_path and os.path.exists(img_path):
-            pixmap = QPixmap(img_path).scaled(*thumb_size, Qt.AspectRatioMode.KeepAspectRatio, 
-                                             Qt.TransformationMode.SmoothTransformation)
-            img_label.setPixmap(pixmap)
-        else:
-            img_label.setText("[No Image]")
-        
-        img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Card name
-        name_label = QLabel(name)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name_label.setFont(QFont('Segoe UI', 9))
-        
-        layout.addWidget(img_label)
-        layout.addWidget(name_label)
-        widget.setLayout(layout)
-        
-        # Style for hover effect
-        widget.setStyleSheet("""
-            QWidget { background-color: #f0f0f0; border-radius: 8px; }
-            QWidget:hover { background-color: #e0e0e0; border: 2px solid #4CAF50; }
-        """)
-        
-        # Connect click event
-        widget.mousePressEvent = lambda e, c=card: self.card_selected(c)
-        
-        return widget
-
     def card_selected(self, card):
         """Handle card selection from the grid"""
         print(f"[DEBUG] Card selected: {card.get('name', 'Unknown')}")
@@ -1138,9 +1281,8 @@ class FriendManualGameWindow(QWidget):
         name = self.selected_card.get('name', 'Unknown')
         
         # Set card image
-        if img_path and os.path.exists(img_path):
-            pixmap = QPixmap(img_path).scaled(200, 280, Qt.AspectRatioMode.KeepAspectRatio, 
-                                           Qt.TransformationMode.SmoothTransformation)
+        pixmap = thumbnail(img_path, (200, 280))
+        if pixmap is not None:
             self.card_image.setPixmap(pixmap)
         else:
             self.card_image.setText("[No Image]")
@@ -1160,7 +1302,7 @@ class FriendManualGameWindow(QWidget):
         )
         print("[DEBUG] Launching GameWindow from FriendManualGameWindow")
         # Launch GameWindow in manual answer mode
-        win = GameWindow(self.cards, manual_answer=True, selected_card=self.selected_card)
+        win = GameWindow(self.cards, manual_answer=True, selected_card=self.selected_card, table=self.table)
         win.show()
         print(f"[DEBUG] GameWindow shown: {win}")
         self.close()
@@ -1182,7 +1324,10 @@ def main():
     app.references = []
     
     def start_game_with_set(set_url):
-        set_id = set_url.rstrip('/').split('/')[-1]
+        # Stop background prefetching so this set gets the full connection pool
+        splash.stop_prefetch()
+        set_id = set_id_from_url(set_url)
+        record_recent_set(set_id)
         parquet_path = 'data/pokemon_cards_all_latest.parquet'  # Update to your latest file
         card_df = get_set_df_from_parquet(set_id, parquet_path)
         if card_df.empty:
@@ -1191,25 +1336,31 @@ def main():
         download_set_images(card_df, set_id, parent=splash)
         set_dir = os.path.join('images', set_id)
         for i, row in card_df.iterrows():
-            num = str(row['number']).split('/')[0].replace(' ', '')
-            name = str(row['name']).replace(' ', '').replace('/', '').replace('?', '')
-            ext = os.path.splitext(row['image_url'])[-1] if '.' in row['image_url'] else '.jpg'
-            fname = f"{num}_{name}{ext}"
-            card_df.at[i, 'local_image'] = os.path.join(set_dir, fname)
+            card_df.at[i, 'local_image'] = os.path.join(set_dir, card_image_filename(row))
         cards = card_df.to_dict(orient='records')
+        from question_engine import CardTable
+        # Keep the set columnar as well so questions are answered with one vectorized mask
+        table = CardTable(card_df)
         mode_dialog = ModeSelectDialog(parent=splash)
         if mode_dialog.exec() == QDialog.DialogCode.Accepted:
             if mode_dialog.selected_mode == 'single':
                 print("[DEBUG] Opening GameWindow (single player mode)")
-                win = GameWindow(cards)
+                win = GameWindow(cards, table=table)
                 win.show()
                 # Keep reference to prevent garbage collection
                 app.references.append(win)
+            elif mode_dialog.selected_mode == 'network':
+                setup = NetworkSetupDialog(set_id, len(cards), parent=splash)
+                if setup.exec() == QDialog.DialogCode.Accepted:
+                    print(f"[DEBUG] Opening GameWindow (network mode) with {setup.peer_info}")
+                    win = GameWindow(cards, table=table, peer=setup.thread)
+                    win.show()
+                    app.references.append(win)
             elif mode_dialog.selected_mode == 'friend':
                 print("[DEBUG] Opening FriendManualGameWindow (play with a friend mode)")
                 try:
                     # Create window
-                    friend_win = FriendManualGameWindow(cards)
+                    friend_win = FriendManualGameWindow(cards, table=table)
                     # Keep reference to prevent garbage collection
                     app.references.append(friend_win)
                     # Show window and make sure it's on top
@@ -1223,6 +1374,8 @@ def main():
                     traceback.print_exc()
     
     splash = SplashScreen(on_set_selected=start_game_with_set)
+    app.aboutToQuit.connect(splash.stop_prefetch)
+    app.aboutToQuit.connect(splash.stop_catalog_refresh)
     splash.show()
     sys.exit(app.exec())
 
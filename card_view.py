@@ -0,0 +1,241 @@
+"""
+Model/view card grid.
+
+The card grid is a QListView in icon mode over a CardListModel, so only the
+cells that are scrolled into view are ever painted and the per-card cost is
+one row in a model rather than a widget with its own layout and labels.
+Thumbnails are requested from the ThumbnailLoader as cells are painted and
+swapped in with a dataChanged when they finish decoding; when the view
+scrolls, the cells now in view move to the front of the decode queue. Eliminated cards are
+removed from the model in batches, keeping the remaining cards sorted by card
+number.
+"""
+import os
+from bisect import bisect_left
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QPoint, QRect, QSize, Qt, pyqtSlot
+from PyQt6.QtGui import QColor, QFont, QPen, QPixmap
+from PyQt6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+from card_database import card_sort_key
+from thumbnail_cache import get_thumbnail_loader
+
+EliminatedRole = Qt.ItemDataRole.UserRole
+PlaceholderRole = Qt.ItemDataRole.UserRole + 1
+
+
+def card_name(card):
+    name = card.get('name')
+    return name if isinstance(name, str) else 'Unknown'
+
+
+class CardListModel(QAbstractListModel):
+    """
+    The cards still shown in a grid, as positions into the cards list.
+
+    Rows always follow the master ordering (cards sorted by number, computed
+    once), so removing cards never needs a re-sort: the rows of the removed
+    positions are found by bisecting on their rank and deleted in contiguous
+    batches, and only the rows after the first removal move. Eliminated cards
+    are tracked as a bitset over positions.
+    """
+    def __init__(self, cards, thumb_size=(100, 140), parent=None):
+        super().__init__(parent)
+        self.cards = cards
+        self.thumb_size = tuple(thumb_size)
+        self.order = sorted(range(len(cards)), key=lambda i: card_sort_key(cards[i].get('number', '')))
+        self.rank = [0] * len(cards)
+        for rank, pos in enumerate(self.order):
+            self.rank[pos] = rank
+        self.positions = list(self.order)
+        # Rank of each shown row, kept in step with positions for bisecting
+        self._row_ranks = list(range(len(cards)))
+        self.eliminated_bits = 0
+        self._image_positions = {}
+        for pos, card in enumerate(cards):
+            path = card.get('local_image')
+            if isinstance(path, str) and path:
+                self._image_positions.setdefault(path, []).append(pos)
+        # 'loading' or 'missing' for images without a cached thumbnail
+        self._image_status = {}
+        # Bumped on every scroll, so the latest viewport outranks earlier ones
+        self._view_generation = 0
+        self._loader = get_thumbnail_loader()
+        self._loader.ready.connect(self._on_thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.positions)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        pos = self.positions[row]
+        card = self.cards[pos]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return card_name(card)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._thumbnail(row, card.get('local_image'))
+        if role == PlaceholderRole:
+            status = self._image_status.get(card.get('local_image'), 'missing')
+            return "Loading..." if status == 'loading' else "[No Image]"
+        if role == EliminatedRole:
+            return bool(self.eliminated_bits >> pos & 1)
+        return None
+
+    def card(self, row):
+        return self.cards[self.positions[row]]
+
+    def row_of(self, pos):
+        """Row currently showing position pos, or None if it was removed."""
+        row = bisect_left(self._row_ranks, self.rank[pos])
+        if row < len(self.positions) and self.positions[row] == pos:
+            return row
+        return None
+
+    def _thumbnail(self, row, path, priority=None):
+        if not isinstance(path, str) or not path or self._image_status.get(path) == 'missing':
+            return None
+        pixmap = self._loader.request(path, self.thumb_size, priority=row if priority is None else priority)
+        if pixmap is None and path not in self._image_status:
+            self._image_status[path] = 'loading' if os.path.exists(path) else 'missing'
+        return pixmap
+
+    def prioritize_rows(self, first, last):
+        """Decode the thumbnails of rows first..last (the ones in view) before any others."""
+        self._view_generation += 1
+        base = -self._view_generation * (len(self.cards) + 1)
+        for row in range(max(0, first), min(last, len(self.positions) - 1) + 1):
+            self._thumbnail(row, self.card(row).get('local_image'), priority=base + row - first)
+
+    @pyqtSlot(str, object, object)
+    def _on_thumbnail_ready(self, path, size, pixmap):
+        positions = self._image_positions.get(path)
+        if not positions or size != self.thumb_size:
+            return
+        if pixmap is None:
+            self._image_status[path] = 'missing'
+        else:
+            self._image_status.pop(path, None)
+        for pos in positions:
+            row = self.row_of(pos)
+            if row is not None:
+                idx = self.index(row)
+                self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+    def _row_runs(self, bits):
+        # Contiguous (first, last) runs of shown rows whose positions are in bits
+        from question_engine import iter_bits
+        rows = sorted(row for row in map(self.row_of, iter_bits(bits)) if row is not None)
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+
+    def mark_eliminated(self, bits):
+        """Grey out the cards at the positions in bits."""
+        bits &= ~self.eliminated_bits
+        self.eliminated_bits |= bits
+        for first, last in self._row_runs(bits):
+            self.dataChanged.emit(self.index(first), self.index(last), [EliminatedRole])
+
+    def remove_positions(self, bits):
+        """Remove the rows showing the positions in bits, one batch per run."""
+        # Last run first, so the rows of earlier runs stay valid
+        for first, last in reversed(self._row_runs(bits)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.positions[first:last + 1]
+            del self._row_ranks[first:last + 1]
+            self.endRemoveRows()
+
+    def reset_positions(self):
+        """Show every card again in the master ordering, none eliminated."""
+        self.beginResetModel()
+        self.positions = list(self.order)
+        self._row_ranks = list(range(len(self.cards)))
+        self.eliminated_bits = 0
+        self.endResetModel()
+
+
+class CardDelegate(QStyledItemDelegate):
+    """Paints a card cell: thumbnail (or placeholder text) with the name below."""
+    NAME_HEIGHT = 22
+    PADDING = 6
+
+    def __init__(self, thumb_size=(100, 140), parent=None):
+        super().__init__(parent)
+        self.thumb_size = tuple(thumb_size)
+        self.font = QFont('Segoe UI', 9)
+
+    def sizeHint(self, option, index):
+        w, h = self.thumb_size
+        return QSize(w + 2 * self.PADDING, h + self.NAME_HEIGHT + 2 * self.PADDING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        eliminated = index.data(EliminatedRole)
+        painter.fillRect(rect, QColor(Qt.GlobalColor.lightGray) if eliminated else QColor(Qt.GlobalColor.white))
+        if option.state & QStyle.StateFlag.State_MouseOver and not eliminated:
+            painter.setPen(QPen(QColor('#4CAF50'), 2))
+            painter.drawRect(rect.adjusted(1, 1, -1, -1))
+        if eliminated:
+            painter.setOpacity(0.4)
+        img_rect = QRect(rect.x(), rect.y() + self.PADDING - 2, rect.width(), self.thumb_size[1])
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        painter.setFont(self.font)
+        painter.setPen(QColor(Qt.GlobalColor.black))
+        if isinstance(pixmap, QPixmap):
+            x = img_rect.x() + (img_rect.width() - pixmap.width()) // 2
+            y = img_rect.y() + (img_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.drawText(img_rect, Qt.AlignmentFlag.AlignCenter, index.data(PlaceholderRole))
+        name_rect = QRect(rect.x() + 2, img_rect.bottom() + 2, rect.width() - 4, self.NAME_HEIGHT)
+        name = painter.fontMetrics().elidedText(index.data(), Qt.TextElideMode.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignCenter, name)
+        painter.restore()
+
+
+class CardListView(QListView):
+    """Icon-mode list view that lays card cells out in a wrapping grid."""
+    def __init__(self, model, thumb_size=(100, 140), parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setSpacing(4)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)
+        self.setItemDelegate(CardDelegate(thumb_size, self))
+        self.setModel(model)
+        self.verticalScrollBar().valueChanged.connect(self.prioritize_visible)
+
+    def visible_rows(self):
+        """(first, last) rows at least partly in view, or None if none are."""
+        viewport = self.viewport().rect()
+        first = self.indexAt(viewport.topLeft())
+        if not first.isValid():
+            # The top-left corner may fall in the spacing between cells
+            first = self.indexAt(viewport.topLeft() + QPoint(self.spacing() + 1, self.spacing() + 1))
+        if not first.isValid():
+            return None
+        last = first.row()
+        count = self.model().rowCount()
+        while last + 1 < count and self.visualRect(self.model().index(last + 1)).intersects(viewport):
+            last += 1
+        return first.row(), last
+
+    def prioritize_visible(self, *args):
+        rows = self.visible_rows()
+        if rows is not None:
+            self.model().prioritize_rows(*rows)
+
+    def card_at(self, index):
+        """The card dict for a view index (the original object, not a copy)."""
+        return self.model().card(index.row()) if index.isValid() else None
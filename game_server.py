@@ -0,0 +1,463 @@
+"""
+Headless game server hosting many card guesser rooms at once.
+
+Players connect over TCP and speak net_play's framing: a 4-byte big-endian
+length followed by a JSON object with a 'type' field. The server is the
+referee, so frames are plain JSON (run it with --certfile/--keyfile to wrap
+connections in TLS). A room is one game on one set, for one player against
+a hidden card or for two players guessing each other's card:
+
+    client -> create   {'set_id', 'players': 1 or 2}   -> room {'code', 'seat'}
+    client -> join     {'code'}                        -> start (to both players)
+    client -> question {'text'}                        -> answer {'question', 'answer', 'eliminated', 'remaining'}
+                                                          (the other player gets opponent {'question', 'answer', 'remaining'})
+    client -> guess    {'name'}                        -> guess_result {'name', 'correct'}, then over {'winner'}
+    client -> leave / stats
+    server -> error {'message'} for a request that could not be served
+
+Every room on a set shares one SetTable (the set's CardTable, CardIndex and
+card names, loaded once from the Parquet database), and holds only small
+ints of its own: the card each seat must find and each seat's remaining
+cards as a bitset. Answers come from the shared index's bitsets, so a
+question costs one bitset lookup (cached per set) and two AND operations.
+
+    python game_server.py [--host HOST] [--port PORT] [--preload SET_ID ...]
+
+benchmarks/server_load_test.py drives it with simulated players.
+"""
+import argparse
+import asyncio
+import random
+import ssl
+import sys
+
+from card_database import DEFAULT_PARQUET_PATH, get_card_database
+from net_play import ProtocolError, decode_message, encode_message, new_session_code, read_frame, write_frame
+from question_engine import CardIndex, CardTable, count_bits, normalize_question
+
+DEFAULT_SERVER_PORT = 47616
+DEFAULT_MAX_ROOMS = 20000
+# A connection that sends nothing for this long is dropped (and its room closed)
+IDLE_TIMEOUT = 600
+QUESTION_CACHE_SIZE = 4096
+# Questions are short sentences; longer ones are refused before they are compiled or cached
+MAX_QUESTION_CHARS = 200
+# Every client message is small, so frames are capped far below net_play's limit
+MAX_CLIENT_FRAME_BYTES = 4096
+# A player with this much unsent output is not keeping up and is disconnected
+MAX_PENDING_BYTES = 256 * 1024
+
+
+class GameError(Exception):
+    """A request that can't be served; reported to the player, who stays connected."""
+
+
+class SetTable:
+    """The cards of one set, shared by every room playing it."""
+    def __init__(self, set_id, df):
+        self.set_id = set_id
+        self.size = len(df)
+        names = df['name'].tolist() if 'name' in df.columns else [None] * self.size
+        self.names = [name if isinstance(name, str) and name else None for name in names]
+        # Only cards with a name can be guessed, so only they are hidden
+        self.playable = [i for i, name in enumerate(self.names) if name is not None]
+        self.index = CardIndex(CardTable(df))
+        self._questions = {}
+
+    def question_bits(self, q):
+        """Bitset of the cards that answer "Yes" to q, cached per normalized question."""
+        q = normalize_question(q)
+        bits = self._questions.get(q)
+        if bits is None:
+            if len(self._questions) >= QUESTION_CACHE_SIZE:
+                self._questions.clear()
+            bits = self._questions[q] = self.index.question_bits(q)
+        return bits
+
+
+class SetTables:
+    """
+    SetTables by set_id, each loaded once (off the event loop) on first use.
+    Only set ids listed in the database are loaded, so clients can't fill
+    the caches with made-up ids.
+    """
+    def __init__(self, parquet_path=DEFAULT_PARQUET_PATH):
+        self.parquet_path = parquet_path
+        self._tables = {}
+        self._set_ids = None
+
+    def _list_set_ids(self):
+        return frozenset(get_card_database(self.parquet_path).set_ids())
+
+    def _load(self, set_id):
+        df = get_card_database(self.parquet_path).get_set_df(set_id)
+        table = SetTable(set_id, df)
+        if not table.playable:
+            raise GameError(f"no cards for set {set_id}")
+        return table
+
+    async def get(self, set_id):
+        loop = asyncio.get_running_loop()
+        future = self._tables.get(set_id)
+        if future is None:
+            if self._set_ids is None:
+                self._set_ids = await loop.run_in_executor(None, self._list_set_ids)
+            if set_id not in self._set_ids:
+                raise GameError(f"unknown set {set_id}")
+            future = self._tables.get(set_id)
+        if future is None:
+            future = loop.run_in_executor(None, self._load, set_id)
+            self._tables[set_id] = future
+        try:
+            # Shielded: one player giving up must not cancel the load for the others
+            return await asyncio.shield(future)
+        except Exception as e:
+            # Forget a failed load so the next player retries it
+            if self._tables.get(set_id) is future:
+                del self._tables[set_id]
+            if isinstance(e, GameError):
+                raise
+            print(f"[ERROR] Could not load set {set_id}: {e}")
+            raise GameError(f"could not load set {set_id}") from e
+
+    def __len__(self):
+        return len(self._tables)
+
+
+class Player:
+    __slots__ = ('writer', 'room', 'seat', 'last_seen')
+
+    def __init__(self, writer, now):
+        self.writer = writer
+        self.room = None
+        self.seat = None
+        self.last_seen = now
+
+    def send(self, message):
+        """
+        Queue a message without waiting. Messages to the other player in a
+        room are not drained by their handler, so a player who stops reading
+        is dropped once MAX_PENDING_BYTES are waiting, instead of the server
+        buffering for them without limit.
+        """
+        writer = self.writer
+        if writer.is_closing():
+            return
+        write_frame(writer, encode_message(message))
+        if writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            print("[WARN] Dropping a player who is not reading their messages")
+            # The handler sees end of stream and closes the room
+            writer.transport.abort()
+
+
+class Room:
+    """
+    One game. targets[seat] is the position of the card that seat is trying
+    to find and remaining[seat] its bitset of cards still in play.
+    """
+    __slots__ = ('code', 'table', 'players', 'targets', 'remaining')
+
+    def __init__(self, code, table, num_players):
+        self.code = code
+        self.table = table
+        self.players = [None] * num_players
+        self.targets = None
+        self.remaining = None
+
+    @property
+    def started(self):
+        return self.targets is not None
+
+
+class GameServer:
+    def __init__(self, parquet_path=DEFAULT_PARQUET_PATH, max_rooms=DEFAULT_MAX_ROOMS, idle_timeout=IDLE_TIMEOUT):
+        self.sets = SetTables(parquet_path)
+        self.max_rooms = max_rooms
+        self.idle_timeout = idle_timeout
+        self.rooms = {}
+        self.players = set()
+        self.rooms_played = 0
+        self.questions_answered = 0
+        self.server = None
+        self._sweeper = None
+        self._handlers = {
+            'create': self.on_create,
+            'join': self.on_join,
+            'question': self.on_question,
+            'guess': self.on_guess,
+            'leave': self.on_leave,
+            'stats': self.on_stats,
+        }
+
+    async def start(self, host='0.0.0.0', port=DEFAULT_SERVER_PORT, ssl_context=None):
+        """Start listening; returns the bound port (useful with port 0)."""
+        self.server = await asyncio.start_server(self.handle, host, port, ssl=ssl_context, backlog=1024)
+        self._sweeper = asyncio.create_task(self.sweep_idle())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self.server is not None:
+            self.server.close()
+            # Let each handler see end of stream and close its room
+            for player in list(self.players):
+                player.writer.transport.abort()
+            for _ in range(100):
+                if not self.players:
+                    break
+                await asyncio.sleep(0)
+            await self.server.wait_closed()
+
+    async def sweep_idle(self):
+        # One periodic pass instead of a timeout per read, which would cost a task per message
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(max(1, self.idle_timeout / 10))
+            cutoff = loop.time() - self.idle_timeout
+            for player in [p for p in self.players if p.last_seen < cutoff]:
+                # The handler sees end of stream and cleans up
+                player.writer.close()
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        player = Player(writer, loop.time())
+        self.players.add(player)
+        try:
+            while True:
+                try:
+                    data = await read_frame(reader, MAX_CLIENT_FRAME_BYTES)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                player.last_seen = loop.time()
+                message = decode_message(data)
+                handler = self._handlers.get(message['type'])
+                if handler is None:
+                    raise ProtocolError(f"unknown message type {message['type']!r}")
+                try:
+                    await handler(player, message)
+                except GameError as e:
+                    player.send({'type': 'error', 'message': str(e)})
+                await writer.drain()
+        except ProtocolError as e:
+            player.send({'type': 'error', 'message': str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            self.players.discard(player)
+            self.leave_room(player)
+            writer.close()
+
+    def _new_code(self):
+        while True:
+            code = new_session_code()
+            if code not in self.rooms:
+                return code
+
+    async def on_create(self, player, message):
+        if player.room is not None:
+            raise GameError("already in a room")
+        num_players = message.get('players', 2)
+        if num_players not in (1, 2):
+            raise GameError("a room is for 1 or 2 players")
+        if len(self.rooms) >= self.max_rooms:
+            raise GameError("the server is full, try again later")
+        table = await self.sets.get(str(message.get('set_id')))
+        room = Room(self._new_code(), table, num_players)
+        self.rooms[room.code] = room
+        self.seat(room, player, 0)
+        player.send({'type': 'room', 'code': room.code, 'seat': 0})
+        if num_players == 1:
+            self.start_room(room)
+
+    async def on_join(self, player, message):
+        if player.room is not None:
+            raise GameError("already in a room")
+        room = self.rooms.get(str(message.get('code', '')).strip().upper())
+        if room is None:
+            raise GameError("no room with that code")
+        if room.started:
+            raise GameError("that room is full")
+        self.seat(room, player, room.players.index(None))
+        self.start_room(room)
+
+    def seat(self, room, player, seat):
+        room.players[seat] = player
+        player.room = room
+        player.seat = seat
+
+    def start_room(self, room):
+        table = room.table
+        n = len(room.players)
+        # Each seat hides a card; a seat looks for the next seat's card (its own in a one-player room)
+        hidden = [random.choice(table.playable) for _ in range(n)]
+        room.targets = [hidden[(seat + 1) % n] for seat in range(n)]
+        room.remaining = [(1 << table.size) - 1] * n
+        for seat, player in enumerate(room.players):
+            start = {'type': 'start', 'code': room.code, 'set_id': table.set_id, 'cards': table.size, 'seat': seat}
+            if n > 1:
+                start['your_card'] = {'position': hidden[seat], 'name': table.names[hidden[seat]]}
+            player.send(start)
+
+    def _started_room(self, player):
+        room = player.room
+        if room is None or not room.started:
+            raise GameError("the game has not started")
+        return room
+
+    async def on_question(self, player, message):
+        room = self._started_room(player)
+        q = message.get('text')
+        if not isinstance(q, str) or not q.strip():
+            raise GameError("empty question")
+        if len(q) > MAX_QUESTION_CHARS:
+            raise GameError(f"questions are limited to {MAX_QUESTION_CHARS} characters")
+        seat = player.seat
+        yes = room.table.question_bits(q)
+        answer = "Yes" if yes >> room.targets[seat] & 1 else "No"
+        # Same split as question_engine.split_by_bits, from the cached bitset
+        remaining = room.remaining[seat]
+        eliminated = remaining & ~yes if answer == "Yes" else remaining & yes
+        remaining &= ~eliminated
+        room.remaining[seat] = remaining
+        left = count_bits(remaining)
+        self.questions_answered += 1
+        player.send({'type': 'answer', 'question': q, 'answer': answer, 'eliminated': format(eliminated, 'x'),
+                     'remaining': left})
+        for other in room.players:
+            if other is not player:
+                other.send({'type': 'opponent', 'question': q, 'answer': answer, 'remaining': left})
+
+    async def on_guess(self, player, message):
+        room = self._started_room(player)
+        name = str(message.get('name', ''))
+        correct = name == room.table.names[room.targets[player.seat]]
+        player.send({'type': 'guess_result', 'name': name, 'correct': correct})
+        if correct:
+            for other in room.players:
+                other.send({'type': 'over', 'winner': player.seat})
+            self.close_room(room)
+
+    async def on_leave(self, player, message):
+        self.leave_room(player)
+
+    async def on_stats(self, player, message):
+        player.send({'type': 'stats', 'rooms': len(self.rooms), 'sets': len(self.sets),
+                     'connections': len(self.players), 'rooms_played': self.rooms_played,
+                     'questions': self.questions_answered, 'max_rss_kb': _max_rss_kb()})
+
+    def leave_room(self, player):
+        room = player.room
+        if room is None:
+            return
+        for other in room.players:
+            if other is not None and other is not player:
+                other.send({'type': 'left', 'seat': player.seat})
+        self.close_room(room)
+
+    def close_room(self, room):
+        if self.rooms.pop(room.code, None) is not None and room.started:
+            self.rooms_played += 1
+        for player in room.players:
+            if player is not None:
+                player.room = None
+                player.seat = None
+
+
+class GameClient:
+    """A minimal asyncio client for the server (used by the load test)."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host, port=DEFAULT_SERVER_PORT, ssl_context=None):
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return cls(reader, writer)
+
+    async def send(self, message):
+        write_frame(self.writer, encode_message(message))
+        await self.writer.drain()
+
+    async def recv(self):
+        """The next message, or None once the server has closed the connection."""
+        try:
+            return decode_message(await read_frame(self.reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    async def expect(self, *types):
+        """The next message of one of these types, skipping others; raises GameError on an error reply."""
+        while True:
+            message = await self.recv()
+            if message is None:
+                raise ConnectionError("the server closed the connection")
+            if message['type'] == 'error':
+                raise GameError(message.get('message', 'error'))
+            if message['type'] in types:
+                return message
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+def _max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def raise_open_file_limit():
+    # Each player is a socket; lift the soft limit to the hard one where there is one
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def serve(args):
+    server = GameServer(args.database, max_rooms=args.max_rooms)
+    for set_id in args.preload:
+        table = await server.sets.get(set_id)
+        print(f"[INFO] Preloaded {set_id} ({table.size} cards)")
+    ssl_context = None
+    if args.certfile:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.certfile, args.keyfile)
+    port = await server.start(args.host, args.port, ssl_context)
+    print(f"[INFO] Listening on {args.host}:{port}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host card guesser rooms over TCP.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT, help="0 picks a free port")
+    parser.add_argument('--database', default=DEFAULT_PARQUET_PATH, help="card Parquet file")
+    parser.add_argument('--max-rooms', type=int, default=DEFAULT_MAX_ROOMS)
+    parser.add_argument('--preload', action='append', default=[], metavar='SET_ID', help="load a set before listening")
+    parser.add_argument('--certfile', help="serve over TLS with this certificate")
+    parser.add_argument('--keyfile', help="private key for --certfile")
+    args = parser.parse_args(argv)
+    raise_open_file_limit()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Sprite atlas of the set logos shown on the splash screen.
+
+Every logo is scaled once to fit a fixed cell and packed into a single PNG,
+with a JSON index giving each logo's rectangle in the atlas and the size and
+mtime of the file it was built from. The splash grid then decodes one image
+instead of one per set, and each button icon is a copy of its rectangle.
+The atlas is rebuilt whenever the index no longer matches the logo files.
+
+build_logo_atlas only uses QImage and QPainter, so it can run on a worker
+thread; LogoAtlas hands out QPixmaps and belongs to the GUI thread.
+"""
+import json
+import math
+import os
+import threading
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QImage, QPainter, QPixmap
+
+DEFAULT_ATLAS_PATH = os.path.join('images', 'assets', 'set_logo_atlas.png')
+LOGO_CELL = (100, 50)
+ATLAS_COLUMNS = 16
+
+
+def index_path_for(atlas_path):
+    return os.path.splitext(atlas_path)[0] + '.json'
+
+
+def logo_signature(path):
+    # (size, mtime) of a logo file, or None if it is missing
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_atlas_index(atlas_path=DEFAULT_ATLAS_PATH):
+    try:
+        with open(index_path_for(atlas_path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def atlas_is_current(logo_files, atlas_path=DEFAULT_ATLAS_PATH, cell=LOGO_CELL):
+    """True if the atlas holds exactly these logo files, unchanged since it was built."""
+    index = load_atlas_index(atlas_path)
+    if not index or index.get('cell') != list(cell) or not os.path.exists(atlas_path):
+        return False
+    logos = index.get('logos', {})
+    wanted = {path for path in logo_files if path}
+    if set(logos) != wanted:
+        return False
+    return all(logos[path].get('source') == logo_signature(path) for path in wanted)
+
+
+def build_logo_atlas(logo_files, atlas_path=DEFAULT_ATLAS_PATH, cell=LOGO_CELL, columns=ATLAS_COLUMNS):
+    """
+    Scale each logo to fit cell and pack them into one PNG plus its index.
+    Logos that can't be read are left out. Returns the index.
+    """
+    cell_w, cell_h = cell
+    paths = sorted({path for path in logo_files if path})
+    rows = max(1, math.ceil(len(paths) / columns))
+    atlas = QImage(cell_w * min(columns, max(1, len(paths))), cell_h * rows, QImage.Format.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.GlobalColor.transparent)
+    logos = {}
+    painter = QPainter(atlas)
+    try:
+        slot = 0
+        for path in paths:
+            img = QImage(path)
+            if img.isNull():
+                print(f"[WARN] Could not read logo {path}")
+                continue
+            img = img.scaled(cell_w, cell_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            x, y = (slot % columns) * cell_w, (slot // columns) * cell_h
+            painter.drawImage(x, y, img)
+            logos[path] = {'rect': [x, y, img.width(), img.height()], 'source': logo_signature(path)}
+            slot += 1
+    finally:
+        painter.end()
+    index = {'cell': [cell_w, cell_h], 'logos': logos}
+    directory = os.path.dirname(atlas_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{atlas_path}.{threading.get_ident()}.tmp"
+    if not atlas.save(tmp_path, "PNG"):
+        raise OSError(f"could not write {atlas_path}")
+    index_path = index_path_for(atlas_path)
+    with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    # Image first, so an index never points into an atlas it was not built with
+    os.replace(tmp_path, atlas_path)
+    os.replace(index_path + '.tmp', index_path)
+    return index
+
+
+def ensure_logo_atlas(logo_files, atlas_path=DEFAULT_ATLAS_PATH):
+    """Rebuild the atlas if it is out of date. Returns True if it was rebuilt."""
+    if atlas_is_current(logo_files, atlas_path):
+        return False
+    build_logo_atlas(logo_files, atlas_path)
+    return True
+
+
+class LogoAtlas:
+    """Logo pixmaps cut from the atlas, decoded once. GUI thread only."""
+    def __init__(self, atlas_path=DEFAULT_ATLAS_PATH):
+        self.atlas_path = atlas_path
+        self.reload()
+
+    def reload(self):
+        self._pixmap = None
+        self._rects = {}
+        self._pixmaps = {}
+        index = load_atlas_index(self.atlas_path)
+        if not index:
+            return
+        pixmap = QPixmap(self.atlas_path)
+        if pixmap.isNull():
+            return
+        self._pixmap = pixmap
+        self._rects = {path: entry['rect'] for path, entry in index.get('logos', {}).items()}
+
+    def pixmap(self, logo_path):
+        """The scaled logo for a logo file, or None if the atlas does not have it."""
+        pixmap = self._pixmaps.get(logo_path)
+        if pixmap is None and logo_path in self._rects:
+            pixmap = self._pixmap.copy(QRect(*self._rects[logo_path]))
+            self._pixmaps[logo_path] = pixmap
+        return pixmap
+
+
+_atlas = None
+
+
+def get_logo_atlas():
+    """The process-wide LogoAtlas (loaded on first use, after QApplication)."""
+    global _atlas
+    if _atlas is None:
+        _atlas = LogoAtlas()
+    return _atlas
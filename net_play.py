@@ -0,0 +1,245 @@
+"""
+Network play between two card guesser windows over TCP.
+
+Every frame is a 4-byte big-endian length followed by the payload. The host
+opens with one plaintext hello frame carrying the protocol version and the
+key-derivation salt; from then on every payload is a Fernet token (see
+session_crypto) of a JSON object with a 'type' field, keyed by the session
+code both players typed in. A joiner with the wrong code fails on its first
+frame and the host keeps listening for the next attempt.
+
+Handshake:
+    host -> hello   {'type': 'hello', 'version', 'salt'}      (plaintext)
+    join -> join    {'type': 'join', 'info': {...}}
+    host -> welcome {'type': 'welcome', 'info': {...}}  or  {'type': 'error', 'message'}
+
+info describes the game each side is playing ({'set_id', 'cards'}); the
+host refuses a joiner whose game does not match. After the handshake both
+sides exchange game messages: question, answer, eliminated (an elimination
+bitset as hex), guess, guess_result, reset.
+
+This module is asyncio only, so it can be driven from a worker thread in the
+GUI or directly over loopback in scripts.
+"""
+import asyncio
+import base64
+import json
+import secrets
+import string
+import struct
+
+from session_crypto import get_session_cipher, new_salt
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 47615
+MAX_FRAME_BYTES = 1 << 20
+HANDSHAKE_TIMEOUT = 15
+HEADER = struct.Struct('!I')
+# Fields each game message must carry, and their types
+GAME_MESSAGES = {
+    'question': {'text': str},
+    'answer': {'question': str, 'answer': str},
+    'eliminated': {'bits': str, 'remaining': int},
+    'guess': {'name': str},
+    'guess_result': {'name': str, 'correct': bool},
+    'reset': {},
+}
+# No 0/O or 1/I, so codes survive being read out loud
+CODE_ALPHABET = ''.join(c for c in string.ascii_uppercase + string.digits if c not in '0O1I')
+
+
+class ProtocolError(Exception):
+    """The other side sent something that is not a valid frame or message."""
+
+
+def new_session_code(length=6):
+    return ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+
+
+async def read_frame(reader, max_bytes=MAX_FRAME_BYTES):
+    """The next frame's payload; raises asyncio.IncompleteReadError at end of stream."""
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    if length > max_bytes:
+        raise ProtocolError(f"frame of {length} bytes is over the {max_bytes} byte limit")
+    return await reader.readexactly(length)
+
+
+def write_frame(writer, payload):
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame of {len(payload)} bytes is over the {MAX_FRAME_BYTES} byte limit")
+    writer.write(HEADER.pack(len(payload)) + payload)
+
+
+def encode_message(message):
+    return json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+
+def decode_message(data):
+    """A message dict from a frame's JSON; raises ProtocolError if it is not one."""
+    try:
+        message = json.loads(data)
+    except ValueError as e:
+        raise ProtocolError(f"bad message: {e}") from None
+    if not isinstance(message, dict) or not isinstance(message.get('type'), str):
+        raise ProtocolError("message without a type")
+    return message
+
+
+def validate_game_message(message):
+    """
+    A game message from the other player with its fields checked and coerced
+    to the types in GAME_MESSAGES (extra fields are dropped). Raises
+    ProtocolError for an unknown type or a missing or malformed field.
+    """
+    fields = GAME_MESSAGES.get(message.get('type'))
+    if fields is None:
+        raise ProtocolError(f"unknown message type {message.get('type')!r}")
+    clean = {'type': message['type']}
+    for name, kind in fields.items():
+        if name not in message:
+            raise ProtocolError(f"{message['type']} message without {name}")
+        value = message[name]
+        if kind is int:
+            if isinstance(value, bool):
+                raise ProtocolError(f"bad {name} in {message['type']} message: {value!r}")
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ProtocolError(f"bad {name} in {message['type']} message: {value!r}") from None
+        elif not isinstance(value, kind):
+            raise ProtocolError(f"bad {name} in {message['type']} message: {value!r}")
+        clean[name] = value
+    if clean['type'] == 'answer' and clean['answer'] not in ("Yes", "No"):
+        raise ProtocolError(f"bad answer {clean['answer']!r}")
+    if clean['type'] == 'eliminated':
+        if clean['remaining'] < 0:
+            raise ProtocolError(f"bad remaining count {clean['remaining']}")
+        try:
+            int(clean['bits'] or '0', 16)
+        except ValueError:
+            raise ProtocolError(f"bad elimination bitset {clean['bits']!r}") from None
+    return clean
+
+
+class Connection:
+    """An established, encrypted connection to the other player."""
+    def __init__(self, reader, writer, cipher):
+        self.reader = reader
+        self.writer = writer
+        self.cipher = cipher
+
+    async def recv(self):
+        """The next message, or None when the other side has closed the connection."""
+        from cryptography.fernet import InvalidToken
+        try:
+            token = await read_frame(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+        try:
+            return decode_message(self.cipher.decrypt(token))
+        except InvalidToken:
+            raise ProtocolError("message could not be decrypted (wrong session code?)") from None
+
+    async def send(self, message):
+        write_frame(self.writer, self.cipher.encrypt(json.dumps(message)))
+        await self.writer.drain()
+
+    async def send_many(self, messages):
+        for token in self.cipher.encrypt_many([json.dumps(m) for m in messages]):
+            write_frame(self.writer, token)
+        await self.writer.drain()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.recv()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def _cipher_for(session_code, salt):
+    # The KDF is deliberately slow; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, get_session_cipher, session_code, salt)
+
+
+def _check_info(own, other):
+    if other.get('set_id') != own.get('set_id') or other.get('cards') != own.get('cards'):
+        return f"the host is playing {own.get('set_id')} ({own.get('cards')} cards); pick the same set to join"
+    return None
+
+
+async def host_session(session_code, info, host='0.0.0.0', port=DEFAULT_PORT, on_listening=None):
+    """
+    Listen until a player joins with the right session code and a matching
+    game, then stop listening. Returns (Connection, the joiner's info).
+    on_listening(port) is called once the server is bound.
+    """
+    salt = new_salt()
+    cipher = await _cipher_for(session_code, salt)
+    joined = asyncio.get_running_loop().create_future()
+
+    async def handle(reader, writer):
+        if joined.done():
+            writer.close()
+            return
+        conn = Connection(reader, writer, cipher)
+        try:
+            hello = {'type': 'hello', 'version': PROTOCOL_VERSION, 'salt': base64.b64encode(salt).decode('ascii')}
+            write_frame(writer, encode_message(hello))
+            await writer.drain()
+            message = await asyncio.wait_for(conn.recv(), HANDSHAKE_TIMEOUT)
+            if message is None or message['type'] != 'join' or not isinstance(message.get('info'), dict):
+                raise ProtocolError("expected a join message")
+            error = _check_info(info, message['info'])
+            if error is not None:
+                await conn.send({'type': 'error', 'message': error})
+                raise ProtocolError(error)
+            if joined.done():
+                raise ProtocolError("another player joined first")
+            await conn.send({'type': 'welcome', 'info': info})
+            joined.set_result((conn, message['info']))
+        except (ProtocolError, asyncio.TimeoutError, ConnectionError) as e:
+            print(f"[WARN] Rejected a player: {e}")
+            await conn.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    try:
+        if on_listening is not None:
+            on_listening(server.sockets[0].getsockname()[1])
+        return await joined
+    finally:
+        server.close()
+
+
+async def join_session(session_code, info, host, port=DEFAULT_PORT):
+    """Connect to a host and join its session. Returns (Connection, the host's info)."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), HANDSHAKE_TIMEOUT)
+    try:
+        hello = decode_message(await asyncio.wait_for(read_frame(reader), HANDSHAKE_TIMEOUT))
+        if hello['type'] != 'hello' or hello.get('version') != PROTOCOL_VERSION:
+            raise ProtocolError(f"unsupported host (protocol {hello.get('version')})")
+        salt = base64.b64decode(hello['salt'])
+        conn = Connection(reader, writer, await _cipher_for(session_code, salt))
+        await conn.send({'type': 'join', 'info': info})
+        reply = await asyncio.wait_for(conn.recv(), HANDSHAKE_TIMEOUT)
+        if reply is None:
+            raise ProtocolError("the host closed the connection (wrong session code?)")
+        if reply['type'] == 'error':
+            raise ProtocolError(reply.get('message', 'the host refused to start the game'))
+        if reply['type'] != 'welcome':
+            raise ProtocolError(f"unexpected {reply['type']} message from the host")
+        return conn, reply.get('info', {})
+    except BaseException:
+        writer.close()
+        raise
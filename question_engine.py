@@ -0,0 +1,361 @@
+"""
+Qt-free question answering for Pokémon Card Guesser.
+
+GameWindow.answer_for_question and the elimination step both go through this
+module, so checking a question against a card never has to build any widgets.
+
+A question is compiled once into a predicate (see compile_question) and then
+tested against cards whose fields were normalized up front, either one card
+at a time in a NormalizedCard or column by column in a CardTable. On a CardTable
+every predicate becomes a single vectorized boolean mask over the whole set.
+
+For the attributes questions test most (type, rarity, holo, HP, trainer
+subtype) a CardIndex keeps one Python int bitset per attribute value, so a
+question resolves to a single AND against the remaining-cards bitset.
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+
+TRAINER_KEYWORDS = ["trainer", "supporter", "stadium", "tool"]
+
+
+def _norm(value):
+    # Lowercase a card field and apply the steel/metal equivalence.
+    # Missing values (None, NaN from pandas) become ''.
+    if not isinstance(value, str):
+        return ''
+    return value.lower().replace('steel', 'metal')
+
+
+def _parse_hp(hp):
+    if isinstance(hp, int):
+        return hp
+    if isinstance(hp, str):
+        m = re.search(r'(\d+)', hp)
+        return int(m.group(1)) if m else None
+    return None
+
+
+class NormalizedCard:
+    """The fields of a card dict that questions look at, normalized once."""
+    __slots__ = ('types', 'holo', 'rarity', 'hp', 'card_type', 'name', 'plain_name', 'text_fields')
+
+    def __init__(self, card):
+        types = card.get('types', [])
+        if types is None or isinstance(types, (float, str)):
+            types = []
+        self.types = tuple(_norm(t) for t in types if isinstance(t, str))
+        self.holo = card.get('holographic', None) is True
+        self.rarity = _norm(card.get('rarity')).strip()
+        self.hp = _parse_hp(card.get('hp', ''))
+        self.card_type = _norm(card.get('card_type'))
+        self.name = _norm(card.get('name'))
+        name = card.get('name')
+        self.plain_name = name.strip().lower() if isinstance(name, str) else ''
+        self.text_fields = tuple(_norm(v) for v in card.values() if isinstance(v, str))
+
+
+def _factorize_strings(values):
+    # Factorize a column, treating anything that is not a str as missing.
+    # Returns (codes, normalized uniques); missing values get code -1.
+    import pandas as pd
+    values = pd.Series(values, dtype=object)
+    values = values.where(values.map(lambda v: isinstance(v, str)), None)
+    codes, uniques = pd.factorize(values)
+    return codes, [_norm(u) for u in uniques.tolist()]
+
+
+def _lookup(codes, table):
+    # Map codes through a per-unique boolean table; code -1 maps to False
+    return np.append(np.asarray(table, dtype=bool), False)[codes]
+
+
+class CardTable:
+    """
+    Columnar, pre-normalized view of a set, one entry per card position.
+
+    Columns: type_bits (bitmask over type_names), hp (int, -1 if missing),
+    rarity_code (index into rarity_names, -1 if missing), holo (bool),
+    trainer_bits (bitmask over TRAINER_KEYWORDS) and the factorized text
+    columns used by the free-text fallback.
+    """
+    def __init__(self, df):
+        self.size = len(df)
+        n = self.size
+
+        def column(name):
+            return df[name].tolist() if name in df.columns else [None] * n
+
+        # Types: lowercase list exploded to a bitmask per card
+        self.type_names = []
+        type_index = {}
+        card_types = []
+        for types in column('types'):
+            if types is None or isinstance(types, (float, str)):
+                types = []
+            card_types.append(tuple(_norm(t) for t in types if isinstance(t, str)))
+            for t in card_types[-1]:
+                if t not in type_index:
+                    type_index[t] = len(self.type_names)
+                    self.type_names.append(t)
+        if len(self.type_names) > 64:
+            raise ValueError(f"Too many distinct card types for a 64-bit mask: {len(self.type_names)}")
+        self.type_bits = np.zeros(n, dtype=np.uint64)
+        for i, types in enumerate(card_types):
+            bits = 0
+            for t in types:
+                bits |= 1 << type_index[t]
+            self.type_bits[i] = bits
+
+        hp_values = [_parse_hp(v) for v in column('hp')]
+        self.hp = np.array([-1 if v is None else v for v in hp_values], dtype=np.int64)
+
+        self.rarity_code, rarities = _factorize_strings(column('rarity'))
+        self.rarity_names = [r.strip() for r in rarities]
+        rarity_missing = np.append(np.array([not r for r in self.rarity_names], dtype=bool), True)
+        self.rarity_code = np.where(rarity_missing[self.rarity_code], -1, self.rarity_code)
+
+        is_holo_rarity = _lookup(self.rarity_code, [r == 'holographic' for r in self.rarity_names])
+        self.holo = np.array([v is True for v in column('holographic')], dtype=bool) | is_holo_rarity
+
+        # Trainer subtype: bit k set when TRAINER_KEYWORDS[k] appears in the
+        # card type, the name or any of the types
+        ct_codes, ct_names = _factorize_strings(column('card_type'))
+        name_codes, names = _factorize_strings(column('name'))
+        self.trainer_bits = np.zeros(n, dtype=np.uint8)
+        for k, keyword in enumerate(TRAINER_KEYWORDS):
+            hit = _lookup(ct_codes, [keyword in v for v in ct_names])
+            hit |= _lookup(name_codes, [keyword in v for v in names])
+            type_hits = sum(1 << type_index[t] for t in self.type_names if keyword in t)
+            hit |= (self.type_bits & np.uint64(type_hits)) != 0
+            self.trainer_bits[hit] |= np.uint8(1 << k)
+
+        # Every text column, factorized, for the free-text fallback
+        self.text_columns = []
+        for name in df.columns:
+            codes, uniques = _factorize_strings(df[name].tolist())
+            if uniques:
+                self.text_columns.append((codes, uniques))
+
+    @classmethod
+    def from_records(cls, cards):
+        import pandas as pd
+        return cls(pd.DataFrame.from_records(cards))
+
+    def question_mask(self, q):
+        """Boolean array: which cards would answer "Yes" to question q."""
+        return compile_question(q).mask(self)
+
+
+def mask_to_bits(mask):
+    """Pack a boolean array into an int bitset (bit i = card position i)."""
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def count_bits(bits):
+    return bin(bits).count('1')
+
+
+def iter_bits(bits):
+    """Yield the card positions set in a bitset, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CardIndex:
+    """
+    Per-set bitset index over card positions of a CardTable: one int per
+    type, rarity, HP value and trainer keyword, plus the holo cards.
+    """
+    def __init__(self, table):
+        self.table = table
+        self.all_bits = (1 << table.size) - 1
+        self.types = {t: mask_to_bits((table.type_bits & np.uint64(1 << i)) != 0)
+                      for i, t in enumerate(table.type_names)}
+        self.rarities = {r: mask_to_bits(table.rarity_code == code)
+                         for code, r in enumerate(table.rarity_names) if r}
+        self.hp = {int(hp): mask_to_bits(table.hp == hp) for hp in np.unique(table.hp) if hp >= 0}
+        self.holo = mask_to_bits(table.holo)
+        self.trainer = {keyword: mask_to_bits((table.trainer_bits & np.uint8(1 << k)) != 0)
+                        for k, keyword in enumerate(TRAINER_KEYWORDS)}
+
+    def question_bits(self, q):
+        """Bitset of the cards that would answer "Yes" to question q."""
+        return compile_question(q).bits(self)
+
+
+class TypePredicate:
+    """Is it a <type> type? Matches when any of the card's types is named."""
+    def __init__(self, q_norm):
+        self.q_norm = q_norm
+
+    def matches(self, nc):
+        return any(t and t in self.q_norm for t in nc.types)
+
+    def mask(self, table):
+        hits = sum(1 << i for i, t in enumerate(table.type_names) if t and t in self.q_norm)
+        return (table.type_bits & np.uint64(hits)) != 0
+
+    def bits(self, index):
+        result = 0
+        for t, bits in index.types.items():
+            if t and t in self.q_norm:
+                result |= bits
+        return result
+
+
+class HoloPredicate:
+    """Is it holo/holographic? Accepts both the boolean and the rarity string."""
+    def matches(self, nc):
+        return nc.holo or nc.rarity == 'holographic'
+
+    def mask(self, table):
+        return table.holo.copy()
+
+    def bits(self, index):
+        return index.holo
+
+
+class RarityPredicate:
+    """Is its rarity <rarity>? Matches the card's rarity as a whole word."""
+    def __init__(self, q_norm):
+        self.q_norm = q_norm
+        self._hits = {}
+
+    def matches(self, nc):
+        r = nc.rarity
+        if not r:
+            return False
+        hit = self._hits.get(r)
+        if hit is None:
+            hit = self._hits[r] = bool(re.search(rf'\b{re.escape(r)}\b', self.q_norm))
+        return hit
+
+    def mask(self, table):
+        return _lookup(table.rarity_code, [bool(re.search(rf'\b{re.escape(r)}\b', self.q_norm)) for r in table.rarity_names])
+
+    def bits(self, index):
+        result = 0
+        for r, bits in index.rarities.items():
+            if re.search(rf'\b{re.escape(r)}\b', self.q_norm):
+                result |= bits
+        return result
+
+
+class HPPredicate:
+    """Does it have <n> HP? Compares the first number in the question."""
+    def __init__(self, q_norm):
+        m = re.search(r'(\d+)', q_norm)
+        self.hp = int(m.group(1)) if m else None
+
+    def matches(self, nc):
+        return self.hp is not None and nc.hp is not None and nc.hp == self.hp
+
+    def mask(self, table):
+        if self.hp is None:
+            return np.zeros(table.size, dtype=bool)
+        return table.hp == self.hp
+
+    def bits(self, index):
+        return index.hp.get(self.hp, 0)
+
+
+class TrainerPredicate:
+    """Is it a trainer/supporter/stadium/tool? Checks card type, name and types."""
+    def __init__(self, keyword):
+        self.keyword = keyword
+
+    def matches(self, nc):
+        k = self.keyword
+        return k in nc.card_type or k in nc.name or any(k in t for t in nc.types if t)
+
+    def mask(self, table):
+        bit = 1 << TRAINER_KEYWORDS.index(self.keyword)
+        return (table.trainer_bits & np.uint8(bit)) != 0
+
+    def bits(self, index):
+        return index.trainer[self.keyword]
+
+
+class FieldMatchPredicate:
+    """Fallback: matches when any text field of the card appears in the question."""
+    def __init__(self, q_norm):
+        self.q_norm = q_norm
+
+    def matches(self, nc):
+        return any(v in self.q_norm for v in nc.text_fields)
+
+    def mask(self, table):
+        result = np.zeros(table.size, dtype=bool)
+        for codes, uniques in table.text_columns:
+            result |= _lookup(codes, [v in self.q_norm for v in uniques])
+        return result
+
+    def bits(self, index):
+        # Free text has no precomputed bitset; pack the vectorized mask
+        return mask_to_bits(self.mask(index.table))
+
+
+def normalize_question(q):
+    return q.strip().lower()
+
+
+@lru_cache(maxsize=256)
+def _compile_normalized(q):
+    # Normalize question for steel/metal equivalence
+    q_norm = q.replace('steel', 'metal')
+    if "type" in q_norm:
+        return TypePredicate(q_norm)
+    if "holo" in q_norm:
+        return HoloPredicate()
+    if "rarity" in q_norm:
+        return RarityPredicate(q_norm)
+    if "hp" in q_norm:
+        return HPPredicate(q_norm)
+    for keyword in TRAINER_KEYWORDS:
+        if keyword in q_norm:
+            return TrainerPredicate(keyword)
+    return FieldMatchPredicate(q_norm)
+
+
+def compile_question(q):
+    """
+    Turn question text into a predicate object with a matches(nc) method for
+    a NormalizedCard, a mask(table) method for a CardTable and a bits(index)
+    method for a CardIndex.
+    Compiled predicates are cached by normalized question text.
+    """
+    return _compile_normalized(normalize_question(q))
+
+
+def answer_card(card, q, protect_name=False):
+    """
+    Answer a yes/no question about a single card dict.
+    Returns "Yes" or "No". With protect_name, a free-text question containing
+    the card's own name is always answered "No" (used in manual mode).
+    """
+    if card is None:
+        return "No"
+    predicate = compile_question(q)
+    nc = NormalizedCard(card)
+    if protect_name and isinstance(predicate, FieldMatchPredicate):
+        if nc.plain_name and nc.plain_name in normalize_question(q):
+            return "No"
+    return "Yes" if predicate.matches(nc) else "No"
+
+
+def split_by_bits(index, remaining, q, answer):
+    """
+    Split the cards still in play by question q, keeping those that give the
+    same answer as the secret card did. remaining is an int bitset of them.
+    Returns (surviving, eliminated) as int bitsets.
+    """
+    yes = index.question_bits(q)
+    if answer == "Yes":
+        return remaining & yes, remaining & ~yes
+    return remaining & ~yes, remaining & yes
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+from scraper.http_session import make_session
+
+DEFAULT_CACHE_DIR = os.path.join('data', 'http_cache')
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class OfflineCacheMiss(requests.RequestException):
+    """Raised in offline mode for a URL that has never been cached."""
+
+
+class CachedResponse:
+    """The parts of a requests.Response the scrapers use, served from disk."""
+    def __init__(self, url, content, encoding=None, status_code=200, from_cache=False):
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+
+class HTTPCache:
+    """
+    On-disk cache for GET requests of HTML pages.
+
+    Bodies are stored with their ETag and Last-Modified headers. Entries
+    younger than ttl seconds are served without touching the network; older
+    ones are revalidated with If-None-Match/If-Modified-Since, so an unchanged
+    page costs a 304 with no body. In offline mode only cached entries are
+    served, and if the network fails a stale entry is used rather than
+    failing.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, offline=False, session=None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.session = session
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, digest)
+        return base + '.json', base + '.body'
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get('url') != url:
+            return None, None
+        return meta, body
+
+    def _write(self, path, data, mode):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store(self, url, meta, body=None):
+        meta_path, body_path = self._paths(url)
+        if body is not None:
+            self._write(body_path, body, 'wb')
+        self._write(meta_path, json.dumps(meta), 'w')
+
+    def get(self, url, session=None, ttl=None, rate_limiter=None, timeout=15):
+        """
+        GET url through the cache. rate_limiter.wait(url) is only called
+        when the request actually goes to the network.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        meta, body = self._load(url)
+        if meta is not None and (self.offline or time.time() - meta['fetched_at'] < ttl):
+            return CachedResponse(url, body, meta.get('encoding'), from_cache=True)
+        if self.offline:
+            raise OfflineCacheMiss(f"{url} is not cached and the cache is offline")
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        session = session or self._session()
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if meta is None:
+                raise
+            print(f"[WARN] Using stale cache for {url}: {e}")
+            return CachedResponse(url, body, meta.get('encoding'), from_cache=True)
+        if resp.status_code == 304 and meta is not None:
+            meta['fetched_at'] = time.time()
+            self._store(url, meta)
+            return CachedResponse(url, body, meta.get('encoding'), from_cache=True)
+        resp.raise_for_status()
+        self._store(url, {
+            'url': url,
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'encoding': resp.encoding,
+            'fetched_at': time.time(),
+        }, resp.content)
+        return CachedResponse(url, resp.content, resp.encoding)
+
+    def _session(self):
+        with self._lock:
+            if self.session is None:
+                self.session = make_session()
+            return self.session
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """
+    The process-wide HTTPCache. Set CARD_GUESSER_OFFLINE=1 to serve only
+    cached pages.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache(offline=os.environ.get('CARD_GUESSER_OFFLINE') == '1')
+        return _cache
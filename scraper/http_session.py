@@ -0,0 +1,62 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def make_session(pool_size=8, retries=3, backoff=0.5, headers=None):
+    """
+    Build a requests.Session with a keep-alive connection pool big enough for
+    pool_size concurrent workers, retrying connection errors and 429/5xx
+    responses with exponential backoff.
+    """
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+class RateLimiter:
+    """Polite per-host rate limit: at most rate requests per second to each host."""
+    def __init__(self, rate=10.0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BandwidthLimiter:
+    """Cap the combined download rate of all threads at max_bytes_per_sec."""
+    def __init__(self, max_bytes_per_sec=None):
+        self.rate = max_bytes_per_sec
+        self._free_at = 0.0
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._free_at = max(now, self._free_at) + nbytes / self.rate
+            delay = self._free_at - now
+        time.sleep(delay)
@@ -0,0 +1,85 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scraper.http_session import BandwidthLimiter, RateLimiter, make_session
+
+
+class ImageDownloader:
+    """
+    Download many images concurrently over one pooled session.
+    Jobs are (url, path, label) tuples; files that already exist are skipped
+    and each download is written to a temporary file first so a partial
+    download never looks complete. max_bytes_per_sec caps the combined
+    bandwidth, for background work that should stay out of the way.
+    """
+    def __init__(self, max_workers=8, rate=10.0, session=None, max_bytes_per_sec=None):
+        self.max_workers = max_workers
+        self.session = session or make_session(pool_size=max_workers)
+        self.rate_limiter = RateLimiter(rate)
+        self.bandwidth = BandwidthLimiter(max_bytes_per_sec)
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def fetch(self, url, path):
+        if self.cancelled.is_set():
+            return False
+        self.rate_limiter.wait(url)
+        tmp_path = path + '.part'
+        try:
+            with self.session.get(url, timeout=10, stream=True) as resp:
+                resp.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=64 * 1024):
+                        if self.cancelled.is_set():
+                            break
+                        self.bandwidth.consume(len(chunk))
+                        f.write(chunk)
+            if self.cancelled.is_set():
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Don't leave a partial image behind for a failed download
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return True
+
+    def download_all(self, jobs, progress=None):
+        """
+        Download every job not already on disk. progress(done, total, label)
+        is called from the calling thread after each job. Returns the number
+        of images downloaded.
+        """
+        total = len(jobs)
+        pending = [job for job in jobs if not os.path.exists(job[1])]
+        done = total - len(pending)
+        downloaded = 0
+        if progress and done:
+            progress(done, total, "")
+        if not pending:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.fetch, url, path): (url, path, label) for url, path, label in pending}
+            for future in as_completed(futures):
+                url, path, label = futures[future]
+                done += 1
+                try:
+                    if future.result():
+                        downloaded += 1
+                        print(f"[INFO] Downloaded {os.path.basename(path)}")
+                except Exception as e:
+                    print(f"[WARN] Could not download {url}: {e}")
+                if progress:
+                    progress(done, total, label)
+                if self.cancelled.is_set():
+                    # Drop the jobs that have not started; the ones running finish as the pool shuts down
+                    for f in futures:
+                        f.cancel()
+                    break
+        return downloaded
@@ -0,0 +1,164 @@
+"""
+Incremental refresh of sets in the card Parquet database.
+
+update_set compares a set's card count with the rows already in the
+database and only fetches detail pages for the card numbers that are
+missing, falling back to the H-numbered pages from the first numbered page
+that fails (as scrape_cards does). With check_changed, known pages are
+revalidated through the HTTP cache too: only pages whose body changed are
+re-parsed, and a card is replaced only if its row checksum differs.
+Updated sets are merged with replace_sets, which copies every other set
+unchanged.
+
+    python -m scraper.incremental [--check-changed] [--all] [set_url_or_id ...]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from card_database import DEFAULT_PARQUET_PATH, load_manifest, record_checksum, replace_sets
+from scraper.serebii_card_scraper import SerebiiCardScraper, card_record
+
+
+TAG_COLUMNS = ('types', 'weakness', 'resistance')
+
+
+def comparable_row(row):
+    """
+    A row with the representations that mean the same card made equal:
+    missing tag lists become [] (older rows hold None where CardRecord.as_row
+    emits []) and NaN becomes None.
+    """
+    clean = {}
+    for key, value in row.items():
+        if isinstance(value, float) and value != value:
+            value = None
+        if key in TAG_COLUMNS:
+            value = list(value) if value is not None else []
+        clean[key] = value
+    return clean
+
+
+def row_changed(old, new):
+    """True if the scraped row new differs from the stored row old, on new's columns."""
+    old = comparable_row({k: old.get(k) for k in new})
+    return record_checksum(old) != record_checksum(comparable_row(new))
+
+
+def set_url_for(set_id):
+    return f"https://www.serebii.net/card/{set_id}/"
+
+
+def read_set_records(parquet_path, set_id):
+    """All rows of one set in the database, as dicts (empty if the set is new)."""
+    import pyarrow.parquet as pq
+    manifest = load_manifest(parquet_path)
+    entry = manifest['sets'].get(set_id) if manifest else None
+    if entry is None:
+        return []
+    with open(parquet_path, 'rb') as f:
+        return pq.ParquetFile(f).read_row_group(entry['row_group']).to_pylist()
+
+
+def changed_pages(scraper, urls):
+    """Revalidate pages through the HTTP cache; return the URLs whose body changed."""
+    def changed(url):
+        try:
+            return not scraper.cache.get(url, session=scraper.session, ttl=0, rate_limiter=scraper.rate_limiter).from_cache
+        except Exception as e:
+            print(f"[WARN] Could not revalidate {url}: {e}")
+            return False
+    with ThreadPoolExecutor(max_workers=scraper.workers) as pool:
+        flags = list(pool.map(changed, urls))
+    return [url for url, flag in zip(urls, flags) if flag]
+
+
+def scrape_records(scraper, urls):
+    # {url: record} for the pages that parsed into a card, plus the first URL that did not
+    records, first_failed = {}, None
+    for url, (card_data, error) in zip(urls, scraper.scrape_card_details(urls, set_id=scraper.set_id)):
+        if card_data and card_data.get('number'):
+            records[url] = card_record(card_data, scraper.set_id, url)
+        elif first_failed is None:
+            first_failed = url
+    return records, first_failed
+
+
+def find_set_updates(set_url, parquet_path=DEFAULT_PARQUET_PATH, check_changed=False, scraper=None):
+    """
+    Work out what changed for one set. Returns (set_id, records, summary)
+    where records is the set's complete new row list, or None if nothing
+    changed.
+    """
+    scraper = scraper or SerebiiCardScraper(set_url)
+    set_id = scraper.set_id
+    existing = read_set_records(parquet_path, set_id)
+    by_url = {r['detail_url']: r for r in existing}
+    summary = {'set_id': set_id, 'added': 0, 'changed': 0}
+    num_cards = scraper.fetch_card_count()
+    if not num_cards:
+        print(f"[WARN] Could not read the card count for {set_url}")
+        return set_id, None, summary
+    updates = {}
+    if len(existing) < num_cards:
+        numbered = [scraper.detail_page_url(str(i).zfill(3)) for i in range(1, num_cards + 1)]
+        missing = [url for url in numbered if url not in by_url]
+        records, first_failed = scrape_records(scraper, missing)
+        updates.update(records)
+        # If a numbered page failed, try H-numbering from there on
+        if first_failed is not None:
+            failed_at = numbered.index(first_failed) + 1
+            h_urls = [scraper.detail_page_url(f"H{h}") for h in range(failed_at, num_cards + 1)]
+            records, _ = scrape_records(scraper, [url for url in h_urls if url not in by_url])
+            updates.update(records)
+        summary['added'] = len(updates)
+    if check_changed and by_url:
+        records, _ = scrape_records(scraper, changed_pages(scraper, list(by_url)))
+        for url, record in records.items():
+            if row_changed(by_url[url], record):
+                updates[url] = dict(by_url[url], **record)
+                summary['changed'] += 1
+    if not updates:
+        return set_id, None, summary
+    records = [r for r in existing if r['detail_url'] not in updates] + list(updates.values())
+    return set_id, records, summary
+
+
+def update_sets(set_urls, parquet_path=DEFAULT_PARQUET_PATH, check_changed=False):
+    """Refresh several sets and merge all of their changes in one write."""
+    changed_sets, summaries = {}, []
+    for set_url in set_urls:
+        set_id, records, summary = find_set_updates(set_url, parquet_path, check_changed)
+        summaries.append(summary)
+        print(f"[INFO] {set_id}: {summary['added']} new, {summary['changed']} changed")
+        if records is not None:
+            changed_sets[set_id] = records
+    if changed_sets:
+        manifest = replace_sets(parquet_path, changed_sets)
+        print(f"[INFO] Merged {len(changed_sets)} updated sets into {parquet_path} ({manifest['num_rows']} cards)")
+    else:
+        print("[INFO] Database is up to date")
+    return summaries
+
+
+def update_set(set_url, parquet_path=DEFAULT_PARQUET_PATH, check_changed=False):
+    return update_sets([set_url], parquet_path, check_changed)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch only new or changed cards into the card database.")
+    parser.add_argument('sets', nargs='*', help="set URLs or set ids")
+    parser.add_argument('--all', action='store_true', help="refresh every set already in the database")
+    parser.add_argument('--check-changed', action='store_true', help="also revalidate known cards")
+    parser.add_argument('--parquet', default=DEFAULT_PARQUET_PATH)
+    args = parser.parse_args(argv)
+    set_urls = [s if s.startswith('http') else set_url_for(s) for s in args.sets]
+    if args.all:
+        manifest = load_manifest(args.parquet) or {'sets': {}}
+        set_urls += [set_url_for(set_id) for set_id in manifest['sets']]
+    if not set_urls:
+        parser.error("give at least one set or --all")
+    update_sets(set_urls, args.parquet, args.check_changed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Bulk scrape of many sets into the consolidated card Parquet file.
+
+Sets come from the English set list and are scraped several at a time, all
+sharing one pooled session and one per-host rate limit. Each finished set
+is streamed into a checkpoint Parquet file (typed with card_schema, written
+in record batches) under the checkpoint directory, so an interrupted run
+picks up with the sets that have no checkpoint yet. A set that scrapes
+empty gets an empty checkpoint, so it does not hold up the run. The
+checkpoints are then written out as the partitioned database (one row group
+per set, plus its manifest) and replaced atomically. Sets that failed keep
+their rows from the existing database, if it has them, and are reported;
+the checkpoints are kept until a run completes every set.
+
+    python -m scraper.pipeline [--sets ID ...] [--limit N] [--output PATH] [--fresh]
+"""
+import argparse
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from card_database import DEFAULT_PARQUET_PATH, card_schema, load_manifest, sort_set_table, write_set_tables
+from scraper.http_session import RateLimiter, make_session
+from scraper.records import ParquetSink, write_records
+from scraper.serebii_card_scraper import DEFAULT_PARSER, SerebiiCardScraper, fetch_english_sets
+
+DEFAULT_CHECKPOINT_DIR = os.path.join('data', 'scrape_checkpoints')
+
+
+def checkpoint_path(checkpoint_dir, set_id):
+    return os.path.join(checkpoint_dir, f"{set_id}.parquet")
+
+
+def write_checkpoint(records, path, batch_size=256):
+    """Stream CardRecords into a Parquet file in batches; the file appears only when complete."""
+    return write_records(records, [ParquetSink(path, batch_size)])
+
+
+class ScrapePipeline:
+    def __init__(self, output_path=DEFAULT_PARQUET_PATH, checkpoint_dir=DEFAULT_CHECKPOINT_DIR,
+                 set_workers=3, page_workers=8, rate=10.0, batch_size=256, parser=DEFAULT_PARSER):
+        self.output_path = output_path
+        self.checkpoint_dir = checkpoint_dir
+        self.set_workers = max(1, set_workers)
+        self.page_workers = max(1, page_workers)
+        self.batch_size = batch_size
+        self.parser = parser
+        self.session = make_session(pool_size=self.set_workers * self.page_workers)
+        # One limiter for every set, so the host sees a single polite rate
+        self.rate_limiter = RateLimiter(rate)
+
+    def scrape_set(self, set_url):
+        """Scrape one set into its checkpoint file. Returns (set_id, card count)."""
+        scraper = SerebiiCardScraper(set_url, workers=self.page_workers, session=self.session,
+                                     rate_limiter=self.rate_limiter, parser=self.parser)
+        count = write_checkpoint(scraper.iter_records(), checkpoint_path(self.checkpoint_dir, scraper.set_id),
+                                 self.batch_size)
+        if not count:
+            print(f"[WARN] No cards found for {set_url}; checkpointed it as empty (use --fresh to retry)")
+        return scraper.set_id, count
+
+    def run(self, set_urls):
+        """
+        Scrape every set without a checkpoint, then write the consolidated
+        file from whatever completed (see consolidate). Returns the manifest.
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        set_ids = {url: SerebiiCardScraper.set_id_from_url(url) for url in set_urls}
+        todo = [url for url in set_urls if not os.path.exists(checkpoint_path(self.checkpoint_dir, set_ids[url]))]
+        print(f"[INFO] {len(set_urls) - len(todo)} of {len(set_urls)} sets already checkpointed")
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.set_workers) as pool:
+            futures = {pool.submit(self.scrape_set, url): url for url in todo}
+            for done, future in enumerate(as_completed(futures), start=1):
+                url = futures[future]
+                try:
+                    set_id, count = future.result()
+                    print(f"[INFO] ({done}/{len(todo)}) Checkpointed {count} cards for {set_id}")
+                except Exception as e:
+                    failed.append(url)
+                    print(f"[WARN] ({done}/{len(todo)}) Failed to scrape {url}: {e}")
+        if failed:
+            print(f"[WARN] {len(failed)} sets failed")
+        return self.consolidate([set_ids[url] for url in set_urls])
+
+    def consolidate(self, set_ids):
+        """
+        Write the partitioned database from the checkpoints of this run's
+        set_ids. A set without a checkpoint, or with an empty one, keeps its
+        row group from the current output file, if that has one, and every
+        set the run did not cover is copied over unchanged (as replace_sets
+        does). The checkpoints are removed only when no set was missing, so
+        a rerun retries just the missing ones.
+        """
+        import pyarrow.parquet as pq
+        manifest = load_manifest(self.output_path) if os.path.exists(self.output_path) else None
+        old_file = open(self.output_path, 'rb') if manifest else None
+        try:
+            old = pq.ParquetFile(old_file) if old_file else None
+            if old is not None and manifest.get('num_rows') != old.metadata.num_rows:
+                old = None  # stale manifest: its row groups can't be trusted
+            parts, kept, missing = {}, [], []
+            if old is not None:
+                # Sets outside this run keep their row group and checksum as they are
+                for set_id, entry in sorted(manifest['sets'].items(), key=lambda item: item[1]['row_group']):
+                    parts[set_id] = (set_id, old.read_row_group(entry['row_group']), entry['checksum'])
+            for set_id in dict.fromkeys(set_ids):
+                path = checkpoint_path(self.checkpoint_dir, set_id)
+                checkpointed = os.path.exists(path)
+                table = pq.read_table(path) if checkpointed else None
+                if table is not None and table.num_rows:
+                    parts[set_id] = (set_id, sort_set_table(table), None)
+                elif set_id in parts:
+                    # Never replace known cards with an empty scrape
+                    if not checkpointed:
+                        kept.append(set_id)
+                elif not checkpointed:
+                    missing.append(set_id)
+        finally:
+            if old_file:
+                old_file.close()
+        new_manifest = write_set_tables(self.output_path, card_schema(), parts.values())
+        print(f"[INFO] Wrote {new_manifest['num_rows']} cards in {len(new_manifest['sets'])} sets to {self.output_path}")
+        if kept:
+            print(f"[WARN] Kept the previous cards for {len(kept)} sets that did not finish: {', '.join(kept)}")
+        if missing:
+            print(f"[WARN] {len(missing)} sets are missing from the database: {', '.join(missing)}")
+        if kept or missing:
+            print("[WARN] Run again to retry them; finished sets stay checkpointed")
+        else:
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+        return new_manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape many sets into the consolidated card Parquet file.")
+    parser.add_argument('--sets', nargs='*', help="set ids or URLs (default: every English set)")
+    parser.add_argument('--limit', type=int, help="only the first N sets of the set list")
+    parser.add_argument('--output', default=DEFAULT_PARQUET_PATH)
+    parser.add_argument('--checkpoints', default=DEFAULT_CHECKPOINT_DIR)
+    parser.add_argument('--set-workers', type=int, default=3)
+    parser.add_argument('--page-workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=10.0, help="requests per second to serebii.net")
+    parser.add_argument('--parser', default=DEFAULT_PARSER, help="BeautifulSoup tree builder, e.g. lxml")
+    parser.add_argument('--fresh', action='store_true', help="discard checkpoints from an earlier run")
+    args = parser.parse_args(argv)
+    if args.sets:
+        set_urls = [s if s.startswith('http') else f"https://www.serebii.net/card/{s}/" for s in args.sets]
+    else:
+        set_urls = [s['url'] for s in fetch_english_sets()]
+    if args.limit:
+        set_urls = set_urls[:args.limit]
+    if args.fresh:
+        shutil.rmtree(args.checkpoints, ignore_errors=True)
+    pipeline = ScrapePipeline(args.output, args.checkpoints, args.set_workers, args.page_workers, args.rate,
+                              parser=args.parser)
+    pipeline.run(set_urls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Typed card records and the sinks scraped cards are written to.
+
+The scraper yields CardRecord objects one at a time. write_records hands
+each record to every sink as it arrives, so a set is written in a single
+pass without keeping all of its cards in memory. Each sink writes to a
+temporary file that replaces the target only once the stream is complete,
+so a failed scrape never leaves a half-written file behind.
+"""
+import csv
+import json
+import os
+import re
+from contextlib import ExitStack
+
+CSV_HEADER = ["Number", "Name", "Card Type", "Types", "Rarity", "HP", "Weakness", "Resistance",
+              "Retreat Cost", "Image URL", "Local Image"]
+
+
+def _int_or_none(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float):
+        return None if value != value else int(value)
+    if isinstance(value, str):
+        m = re.search(r'(\d+)', value)
+        return int(m.group(1)) if m else None
+    return None
+
+
+def _tags(value):
+    if isinstance(value, str):
+        return (value,) if value else ()
+    return tuple(v for v in value or () if isinstance(v, str))
+
+
+class CardRecord:
+    """
+    One scraped card. hp and retreat_cost are ints (None if the page had
+    none), types/weakness/resistance are tuples of symbol names.
+    """
+    __slots__ = ('number', 'name', 'card_type', 'types', 'rarity', 'hp', 'holographic', 'weakness',
+                 'resistance', 'retreat_cost', 'image_url', 'local_image', 'detail_url', 'set_id')
+
+    def __init__(self, number=None, name=None, card_type=None, types=(), rarity=None, hp=None, holographic=None,
+                 weakness=(), resistance=(), retreat_cost=None, image_url=None, local_image=None,
+                 detail_url=None, set_id=None):
+        self.number = number
+        self.name = name
+        self.card_type = card_type
+        self.types = _tags(types)
+        self.rarity = rarity
+        self.hp = _int_or_none(hp)
+        self.holographic = holographic
+        self.weakness = _tags(weakness)
+        self.resistance = _tags(resistance)
+        self.retreat_cost = _int_or_none(retreat_cost)
+        self.image_url = image_url
+        self.local_image = local_image
+        self.detail_url = detail_url
+        self.set_id = set_id
+
+    @classmethod
+    def from_card_data(cls, card_data, set_id=None, detail_url=None):
+        """Record for a card dict from parse_card_detail (or the set table)."""
+        detail_url = detail_url or card_data.get('detail_url')
+        if detail_url and not detail_url.startswith('http'):
+            detail_url = f"https://www.serebii.net{detail_url}"
+        return cls(
+            number=card_data.get('number'), name=card_data.get('name'), card_type=card_data.get('card_type'),
+            types=card_data.get('types'), rarity=card_data.get('rarity'), hp=card_data.get('hp'),
+            holographic=card_data.get('holographic'), weakness=card_data.get('weakness'),
+            resistance=card_data.get('resistance'), retreat_cost=card_data.get('retreat_cost'),
+            image_url=card_data.get('image_url'), local_image=card_data.get('local_image'),
+            detail_url=detail_url, set_id=set_id,
+        )
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def as_row(self):
+        """The card Parquet's columns (card_schema), where hp is text and retreat cost a float."""
+        return {
+            'image_url': self.image_url,
+            'number': self.number,
+            'detail_url': self.detail_url,
+            'set_id': self.set_id,
+            'language': 'english',
+            'promo': False,
+            'name': self.name,
+            'hp': None if self.hp is None else str(self.hp),
+            'types': list(self.types),
+            'card_type': self.card_type,
+            'rarity': self.rarity,
+            'holographic': self.holographic,
+            'weakness': list(self.weakness),
+            'resistance': list(self.resistance),
+            'retreat_cost': None if self.retreat_cost is None else float(self.retreat_cost),
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, CardRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"CardRecord(set_id={self.set_id!r}, number={self.number!r}, name={self.name!r})"
+
+
+class RecordSink:
+    """
+    Base class for an output file. Use as a context manager: write() each
+    record, and the file is moved into place when the block exits cleanly
+    (and discarded if it raised).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.count = 0
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        finally:
+            if exc_type is None:
+                os.replace(self.tmp_path, self.path)
+            elif os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+    def open(self):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def write(self, record):
+        self.count += 1
+
+
+class CsvSink(RecordSink):
+    """CSV for inspection, with the tag columns joined by ';'."""
+    def open(self):
+        self._file = open(self.tmp_path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_HEADER)
+
+    def close(self):
+        self._file.close()
+
+    def write(self, record):
+        super().write(record)
+        self._writer.writerow([
+            record.number or '',
+            record.name or '',
+            record.card_type or '',
+            ";".join(record.types),
+            record.rarity or '',
+            '' if record.hp is None else record.hp,
+            ";".join(record.weakness),
+            ";".join(record.resistance),
+            record.retreat_cost or 0,
+            record.image_url or '',
+            record.local_image or '',
+        ])
+
+
+class JsonlSink(RecordSink):
+    """One JSON object per line, keeping the record's types."""
+    def open(self):
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def close(self):
+        self._file.close()
+
+    def write(self, record):
+        super().write(record)
+        self._file.write(json.dumps(record.as_dict(), ensure_ascii=False))
+        self._file.write('\n')
+
+
+class ParquetSink(RecordSink):
+    """Parquet with the card database's schema, written in record batches."""
+    def __init__(self, path, batch_size=256):
+        super().__init__(path)
+        self.batch_size = batch_size
+
+    def open(self):
+        import pyarrow.parquet as pq
+        from card_database import card_schema
+        self._schema = card_schema()
+        self._writer = pq.ParquetWriter(self.tmp_path, self._schema, compression='zstd')
+        self._batch = []
+
+    def _flush(self):
+        import pyarrow as pa
+        if self._batch:
+            self._writer.write_batch(pa.RecordBatch.from_pylist(self._batch, schema=self._schema))
+            self._batch = []
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+
+    def write(self, record):
+        super().write(record)
+        self._batch.append(record.as_row())
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+
+SINKS = {'.csv': CsvSink, '.jsonl': JsonlSink, '.parquet': ParquetSink}
+
+
+def sink_for_path(path):
+    """A sink chosen by the file extension (.csv, .jsonl or .parquet)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise ValueError(f"no sink for {ext or 'files without an extension'} (use {', '.join(SINKS)})")
+    return SINKS[ext](path)
+
+
+def write_records(records, sinks):
+    """
+    Stream records into every sink in one pass. Returns the number of
+    records written; if the stream raises, no sink's file is replaced.
+    """
+    count = 0
+    with ExitStack() as stack:
+        for sink in sinks:
+            stack.enter_context(sink)
+        for record in records:
+            for sink in sinks:
+                sink.write(record)
+            count += 1
+    return count
@@ -1,27 +1,313 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+from bisect import bisect_right
+from bs4 import BeautifulSoup, NavigableString
 import os
 import re
-import time
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+if __package__ in (None, ''):
+    # Running this file directly: make the scraper package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.http_cache import get_http_cache
+from scraper.http_session import DEFAULT_HEADERS, RateLimiter, make_session
+from scraper.records import CardRecord, CsvSink, sink_for_path, write_records
+
+ENGLISH_SETS_URL = "https://www.serebii.net/card/english.shtml"
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'pokemon_cards_data.csv')
+
+# BeautifulSoup tree builder for detail pages. 'lxml' (if installed) builds
+# the tree about twice as fast, but repairs malformed markup differently from
+# html.parser; benchmarks/parse_benchmark.py checks both against saved pages.
+DEFAULT_PARSER = 'html.parser'
+
+SYMBOL_IMG_RE = re.compile(r'/card/image/.*\.(png|jpg)$')
+SET_IMG_RE = re.compile(r'/card/journeytogether/\d+\.(jpg|png)$')
+RARITY_IMG_RE = re.compile(r'/card/image/(holographic|common|uncommon|rare|ultra|secret)\.(png|jpg)$')
+RETREAT_IMG_RE = re.compile(r'/card/image/colorless\.(png|jpg)$')
+NUMBER_RE = re.compile(r'\d+\s*/\s*\d+')
+HP_RE = re.compile(r'(\d+)\s*HP')
+WEAKNESS_RE = re.compile(r'Weakness', re.IGNORECASE)
+RESISTANCE_RE = re.compile(r'Resistance', re.IGNORECASE)
+RETREAT_RE = re.compile(r'Retreat', re.IGNORECASE)
+NOT_TYPES = ["common", "uncommon", "rare"]
+
+
+def _symbol_type(img):
+    type_match = re.search(r'/([^/]+)\.(png|jpg)', img['src'])
+    if type_match and type_match.group(1) not in NOT_TYPES:
+        return type_match.group(1)
+    return None
+
+
+def parse_card_detail(html, parser=DEFAULT_PARSER):
+    """
+    Card fields from a detail page's HTML. The document is walked once,
+    noting the first element each field is read from (the same elements the
+    per-field searches used to find), so the cost is one pass per page.
+    """
+    soup = BeautifulSoup(html, parser)
+    elements = list(soup.descendants)
+    og_image = set_img = font2 = font5 = number_text = hp_val = b_hp_val = None
+    rarity_img = title = weakness_at = resistance_at = retreat_at = None
+    # Positions of every <img> with a card symbol src, for "next image after" lookups
+    symbol_imgs = []
+    for i, el in enumerate(elements):
+        if isinstance(el, NavigableString):
+            if number_text is None and NUMBER_RE.search(el):
+                number_text = el
+            if weakness_at is None and WEAKNESS_RE.search(el):
+                weakness_at = i
+            if resistance_at is None and RESISTANCE_RE.search(el):
+                resistance_at = i
+            if retreat_at is None and RETREAT_RE.search(el):
+                retreat_at = i
+            continue
+        name = el.name
+        if name == 'img':
+            src = el.get('src')
+            if isinstance(src, str):
+                if SYMBOL_IMG_RE.search(src):
+                    symbol_imgs.append(i)
+                if rarity_img is None and RARITY_IMG_RE.search(src):
+                    rarity_img = el
+                if set_img is None and SET_IMG_RE.search(src):
+                    set_img = el
+        elif name == 'font':
+            size = el.get('size')
+            if font2 is None and size == '2':
+                font2 = el
+            elif font5 is None and size == '5':
+                font5 = el
+            if hp_val is None and el.string and 'HP' in el.string:
+                hp_match = HP_RE.search(el.string)
+                if hp_match:
+                    hp_val = hp_match.group(1)
+        elif name == 'b':
+            if b_hp_val is None and el.string and 'HP' in el.string:
+                hp_match = HP_RE.search(el.string)
+                if hp_match:
+                    b_hp_val = hp_match.group(1)
+        elif name == 'meta':
+            if og_image is None and el.get('property') == 'og:image':
+                og_image = el
+        elif name == 'title' and title is None:
+            title = el
+
+    def next_symbol_img(text_at):
+        # First symbol image after the start of the text's parent tag
+        parent = elements[text_at].parent
+        start = text_at
+        while start >= 0 and elements[start] is not parent:
+            start -= 1
+        k = bisect_right(symbol_imgs, start)
+        return elements[symbol_imgs[k]] if k < len(symbol_imgs) else None
+
+    card_data = {}
+    if og_image and og_image.get('content'):
+        card_data['image_url'] = og_image['content']
+    if 'image_url' not in card_data and set_img is not None:
+        img_src = set_img['src']
+        if not img_src.startswith('http'):
+            img_src = f"https://www.serebii.net{img_src}"
+        card_data['image_url'] = img_src
+    card_name_elem = font2 or font5
+    if card_name_elem:
+        card_data['name'] = card_name_elem.get_text(strip=True)
+    if number_text is not None:
+        card_num_match = re.search(r'(\d+\s*/\s*\d+)', number_text)
+        if card_num_match:
+            card_data['number'] = card_num_match.group(1).replace(' ', '')
+    # Prefer HP from a <font>, then from a bold tag
+    hp_val = hp_val or b_hp_val
+    if hp_val:
+        card_data['hp'] = hp_val
+        card_data['card_type'] = card_data.get('card_type', 'Pokémon')
+    if symbol_imgs:
+        type_name = _symbol_type(elements[symbol_imgs[0]])
+        if type_name:
+            card_data['types'] = [type_name]
+            card_data['card_type'] = f"{type_name.capitalize()} Pokémon"
+    if 'card_type' not in card_data:
+        card_data['card_type'] = 'Trainer'
+        card_data['types'] = ['trainer']
+    for key, text_at in (('weakness', weakness_at), ('resistance', resistance_at)):
+        if text_at is not None:
+            img = next_symbol_img(text_at)
+            type_name = _symbol_type(img) if img is not None else None
+            if type_name:
+                card_data[key] = [type_name]
+    if retreat_at is not None:
+        retreat_imgs = elements[retreat_at].parent.find_next_siblings('img', src=RETREAT_IMG_RE)
+        card_data['retreat_cost'] = len(retreat_imgs) if retreat_imgs else 0
+    # Capture holographic trait if present
+    if rarity_img is not None:
+        rarity_match = re.search(r'/card/image/([a-z]+)\.(png|jpg)', rarity_img['src'])
+        if rarity_match:
+            card_data['rarity'] = rarity_match.group(1).capitalize()
+            # Holographic is also considered Rare
+            card_data['holographic'] = rarity_match.group(1).lower() == 'holographic'
+            if card_data['holographic']:
+                card_data['rarity'] = 'Rare'
+    if 'name' not in card_data:
+        title_text = title.string if title else ''
+        match = re.search(r'#\d+\s+(.+)', title_text)
+        if match:
+            card_data['name'] = match.group(1).strip()
+    return card_data
+
+
+def parse_english_sets(html):
+    """Set dicts (name, url, logo_url, num_cards, release_date) from the English set list page."""
+    soup = BeautifulSoup(html, 'html.parser')
+    sets = []
+    # Find the main table with all sets
+    main_table = None
+    for table in soup.find_all('table'):
+        headers = [th.get_text(strip=True).lower() for th in table.find_all('td')[:5]]
+        if 'set name' in ''.join(headers).lower() and 'number of cards' in ''.join(headers).lower():
+            main_table = table
+            break
+    if not main_table:
+        return sets
+    for row in main_table.find_all('tr')[1:]:
+        cells = row.find_all('td')
+        if len(cells) < 5:
+            continue
+        # Set detail page
+        set_link = cells[2].find('a')
+        set_name = set_link.get_text(strip=True) if set_link else ''
+        set_url = f"https://www.serebii.net{set_link['href']}" if set_link and set_link.has_attr('href') else ''
+        # Set logo
+        logo_img = cells[0].find('img')
+        logo_url = f"https://www.serebii.net{logo_img['src']}" if logo_img and logo_img.has_attr('src') else ''
+        # Number of cards
+        num_cards = cells[3].get_text(strip=True)
+        # Release date
+        release_date = cells[4].get_text(strip=True)
+        if set_url and set_name:
+            sets.append({
+                'name': set_name,
+                'url': set_url,
+                'logo_url': logo_url,
+                'num_cards': num_cards,
+                'release_date': release_date
+            })
+    return sets
+
+
+def fetch_english_sets(cache=None, ttl=None):
+    """The English set list, fetched through the HTTP cache (ttl=0 to revalidate)."""
+    cache = cache or get_http_cache()
+    return parse_english_sets(cache.get(ENGLISH_SETS_URL, ttl=ttl).text)
+
+
+def card_record(card_data, set_id, detail_url):
+    """Database row (the card Parquet's columns) for a scraped detail page."""
+    return CardRecord.from_card_data(card_data, set_id, detail_url).as_row()
+
 
 class SerebiiCardScraper:
-    """A specialized scraper for Serebii.net Pokemon card pages"""
-    def __init__(self, set_url="https://www.serebii.net/card/journeytogether/"):
+    """
+    A specialized scraper for Serebii.net Pokemon card pages.
+    Detail pages are fetched by `workers` threads sharing one keep-alive
+    session, at most `rate` requests per second to the host. HTML pages go
+    through the HTTP cache (pass cache=False to always refetch).
+    """
+    def __init__(self, set_url="https://www.serebii.net/card/journeytogether/", workers=8, rate=10.0, session=None, cache=None, rate_limiter=None, parser=DEFAULT_PARSER):
         self.set_url = set_url
-        set_path = re.search(r'/card/([a-z0-9_-]+)/?', set_url, re.IGNORECASE)
-        self.set_id = set_path.group(1) if set_path else None
-        if not self.set_id:
-            set_path = re.search(r'/card/([a-z0-9_-]+)', set_url, re.IGNORECASE)
-            self.set_id = set_path.group(1) if set_path else 'journeytogether'
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.set_id = self.set_id_from_url(set_url)
+        self.headers = dict(DEFAULT_HEADERS)
+        self.workers = max(1, workers)
+        self.session = session or make_session(pool_size=self.workers, headers=self.headers)
+        self.rate_limiter = rate_limiter or RateLimiter(rate)
+        self.cache = get_http_cache() if cache is None else cache
+        self.parser = parser
         self.output_file = "pokemon_cards.json"
         self.images_dir = "card_images"
         if not os.path.exists(self.images_dir):
             os.makedirs(self.images_dir)
 
+    @staticmethod
+    def set_id_from_url(set_url):
+        set_path = re.search(r'/card/([a-z0-9_-]+)/?', set_url, re.IGNORECASE)
+        set_id = set_path.group(1) if set_path else None
+        if not set_id:
+            set_path = re.search(r'/card/([a-z0-9_-]+)', set_url, re.IGNORECASE)
+            set_id = set_path.group(1) if set_path else 'journeytogether'
+        return set_id
+
+    def get(self, url, cached=True):
+        """
+        GET through the shared session, honouring the per-host rate limit.
+        Pages are served from the HTTP cache when cached is set.
+        """
+        if cached and self.cache:
+            return self.cache.get(url, session=self.session, rate_limiter=self.rate_limiter)
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, timeout=15)
+        response.raise_for_status()
+        return response
+
+    def detail_page_url(self, page):
+        """Full URL of a detail page, e.g. page '001' or 'H3'."""
+        return f"https://www.serebii.net/card/{self.set_id}/{page}.shtml"
+
+    def parse_card_count(self, soup):
+        # Number of cards from the "Amount of Cards" line of a set page
+        amount_text = soup.find(string=re.compile(r'Amount of Cards', re.IGNORECASE))
+        if amount_text:
+            match = re.search(r'Amount of Cards.*?(\d+)', amount_text)
+            if match:
+                return int(match.group(1))
+        # Fallback: try to find in the first <p> after <h1>
+        h1 = soup.find('h1')
+        if h1:
+            p = h1.find_next('p')
+            if p:
+                match = re.search(r'Amount of Cards.*?(\d+)', p.get_text())
+                if match:
+                    return int(match.group(1))
+        return None
+
+    def fetch_card_count(self):
+        response = self.get(self.set_url)
+        return self.parse_card_count(BeautifulSoup(response.text, 'html.parser'))
+
+    def scrape_card_details(self, detail_urls, set_id=None):
+        """
+        Scrape detail pages concurrently with scrape_card_detail. Returns a
+        (card_data, error) pair per URL, in the same order as detail_urls.
+        """
+        return list(self.iter_card_details(detail_urls, set_id=set_id))
+
+    def iter_card_details(self, detail_urls, set_id=None):
+        """
+        Like scrape_card_details, but yields the pairs in order as they
+        finish. Only a couple of pages per worker are in flight at a time, so
+        a consumer that stops early does not pay for the rest of the set.
+        """
+        def scrape(detail_url):
+            try:
+                return self.scrape_card_detail(detail_url, set_id=set_id), None
+            except Exception as e:
+                return None, e
+        urls = iter(detail_urls)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque(pool.submit(scrape, url) for url in islice(urls, 2 * self.workers))
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    for url in urls:
+                        pending.append(pool.submit(scrape, url))
+                        break
+                    yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def scrape_card_detail(self, detail_url, set_id=None):
         print(f"Scraping card details from: {detail_url}")
         try:
@@ -38,107 +324,8 @@ class SerebiiCardScraper:
                 full_url = f"https://www.serebii.net{detail_url}"
             else:
                 full_url = detail_url
-            response = requests.get(full_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            card_data = {}
-            meta_img = soup.find('meta', property='og:image')
-            if meta_img and meta_img.get('content'):
-                card_data['image_url'] = meta_img['content']
-            if 'image_url' not in card_data:
-                card_image = soup.find('img', src=re.compile(r'/card/journeytogether/\d+\.(jpg|png)$'))
-                if card_image and 'src' in card_image.attrs:
-                    img_src = card_image['src']
-                    if not img_src.startswith('http'):
-                        img_src = f"https://www.serebii.net{img_src}"
-                    card_data['image_url'] = img_src
-            card_name_elem = soup.find('font', size='2') or soup.find('font', size='5')
-            if card_name_elem:
-                card_data['name'] = card_name_elem.get_text(strip=True)
-            card_number_elem = soup.find(string=re.compile(r'\d+\s*/\s*\d+'))
-            if card_number_elem:
-                card_num_match = re.search(r'(\d+\s*/\s*\d+)', card_number_elem)
-                if card_num_match:
-                    card_data['number'] = card_num_match.group(1).replace(' ', '')
-            # --- Improved HP extraction ---
-            # Look for HP in the right-aligned font in the main card info table
-            hp_val = None
-            for font_tag in soup.find_all('font'):
-                if font_tag.string and 'HP' in font_tag.string:
-                    hp_match = re.search(r'(\d+)\s*HP', font_tag.string)
-                    if hp_match:
-                        hp_val = hp_match.group(1)
-                        break
-            if not hp_val:
-                # Fallback: look for bold red font (as in <font color="#FF0000"><b>50 HP</b></font>)
-                b_tags = soup.find_all('b')
-                for b in b_tags:
-                    if b.string and 'HP' in b.string:
-                        hp_match = re.search(r'(\d+)\s*HP', b.string)
-                        if hp_match:
-                            hp_val = hp_match.group(1)
-                            break
-            if hp_val:
-                card_data['hp'] = hp_val
-                card_data['card_type'] = card_data.get('card_type', 'Pokémon')
-            type_img = soup.find('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
-            if type_img and 'src' in type_img.attrs:
-                src = type_img['src']
-                type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
-                if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
-                    card_data['types'] = [type_match.group(1)]
-                    card_data['card_type'] = f"{type_match.group(1).capitalize()} Pokémon"
-            if 'card_type' not in card_data:
-                card_data['card_type'] = 'Trainer'
-                card_data['types'] = ['trainer']
-            weakness_section = soup.find(string=re.compile(r'Weakness', re.IGNORECASE))
-            if weakness_section:
-                parent = weakness_section.parent
-                if parent:
-                    weakness_img = parent.find_next('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
-                    if weakness_img and 'src' in weakness_img.attrs:
-                        src = weakness_img['src']
-                        type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
-                        if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
-                            card_data['weakness'] = [type_match.group(1)]
-            resistance_section = soup.find(string=re.compile(r'Resistance', re.IGNORECASE))
-            if resistance_section:
-                parent = resistance_section.parent
-                if parent:
-                    resistance_img = parent.find_next('img', src=re.compile(r'/card/image/.*\.(png|jpg)$'))
-                    if resistance_img and 'src' in resistance_img.attrs:
-                        src = resistance_img['src']
-                        type_match = re.search(r'/([^/]+)\.(png|jpg)', src)
-                        if type_match and type_match.group(1) not in ["common", "uncommon", "rare"]:
-                            card_data['resistance'] = [type_match.group(1)]
-            retreat_section = soup.find(string=re.compile(r'Retreat', re.IGNORECASE))
-            if retreat_section:
-                parent = retreat_section.parent
-                if parent:
-                    retreat_imgs = parent.find_next_siblings('img', src=re.compile(r'/card/image/colorless\.(png|jpg)$'))
-                    card_data['retreat_cost'] = len(retreat_imgs) if retreat_imgs else 0
-            # Capture holographic trait if present
-            rarity_img = soup.find('img', src=re.compile(r'/card/image/(holographic|common|uncommon|rare|ultra|secret)\.(png|jpg)$'))
-            if rarity_img and 'src' in rarity_img.attrs:
-                src = rarity_img['src']
-                rarity_match = re.search(r'/card/image/([a-z]+)\.(png|jpg)', src)
-                if rarity_match:
-                    rarity_val = rarity_match.group(1).capitalize()
-                    card_data['rarity'] = rarity_val
-                    # Add a boolean trait for holographic
-                    if rarity_match.group(1).lower() == 'holographic':
-                        card_data['holographic'] = True
-                        card_data['rarity'] = 'Rare'  # Holographic is also considered Rare
-                    else:
-                        card_data['holographic'] = False
-            if 'card_type' not in card_data:
-                card_data['card_type'] = 'Trainer'
-                card_data['types'] = ['trainer']
-            if 'name' not in card_data:
-                title = soup.title.string if soup.title else ''
-                match = re.search(r'#\d+\s+(.+)', title)
-                if match:
-                    card_data['name'] = match.group(1).strip()
+            response = self.get(full_url)
+            card_data = parse_card_detail(response.text, self.parser)
             print(f"✓ Successfully scraped details for {card_data.get('name', 'Unknown card')}")
             return card_data
         except Exception as e:
@@ -173,8 +360,7 @@ class SerebiiCardScraper:
                     image_url = f"https://www.serebii.net{image_url}"
                 else:
                     image_url = f"https://www.serebii.net/{image_url}"
-            response = requests.get(image_url, headers=self.headers)
-            response.raise_for_status()
+            response = self.get(image_url, cached=False)
             with open(image_path, 'wb') as f:
                 f.write(response.content)
             print(f"✓ Downloaded image for {card_name}")
@@ -206,212 +392,191 @@ class SerebiiCardScraper:
             local = self.download_image(url, num, name, set_id=set_id)
             card['local_image'] = local or ''
 
-    def scrape_cards(self):
-        print(f"Scraping Pokemon cards from {self.set_url}")
-        cards = []
-        try:
-            response = requests.get(self.set_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Try to extract number of cards from the page text
-            num_cards = None
-            amount_text = soup.find(string=re.compile(r'Amount of Cards', re.IGNORECASE))
-            if amount_text:
-                match = re.search(r'Amount of Cards.*?(\d+)', amount_text)
-                if match:
-                    num_cards = int(match.group(1))
-            if not num_cards:
-                # Fallback: try to find in the first <p> after <h1>
-                h1 = soup.find('h1')
-                if h1:
-                    p = h1.find_next('p')
-                    if p:
-                        match = re.search(r'Amount of Cards.*?(\d+)', p.get_text())
-                        if match:
-                            num_cards = int(match.group(1))
-            print(f"[DEBUG] Detected num_cards: {num_cards}")
-            # Hardcode detail page scraping if num_cards is found
-            failed_at = None
-            if num_cards:
-                for i in range(1, num_cards+1):
-                    num_str = str(i).zfill(3)
+    def collect_cards(self):
+        """
+        Gather the card dicts for this set from its detail pages (or the set
+        table when the page has no card count), without downloading images
+        or writing files. Each card carries its detail_url.
+        """
+        return list(self.iter_card_data())
+
+    def iter_records(self, download_images=False):
+        """
+        Stream the set's cards as CardRecords, in card order. With
+        download_images, each card's image is fetched before its record is
+        yielded and local_image is filled in.
+        """
+        for card in self.iter_card_data():
+            if download_images:
+                card['local_image'] = self.download_image(card.get('image_url', ''), card.get('number', ''),
+                                                          card.get('name', ''), set_id=self.set_id) or ''
+            yield CardRecord.from_card_data(card, self.set_id)
+
+    def iter_card_data(self):
+        """The card dicts of collect_cards, yielded as each detail page is parsed."""
+        count = 0
+        response = self.get(self.set_url)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        # Try to extract number of cards from the page text
+        num_cards = self.parse_card_count(soup)
+        print(f"[DEBUG] Detected num_cards: {num_cards}")
+        # Hardcode detail page scraping if num_cards is found
+        failed_at = None
+        if num_cards:
+            detail_urls = [f"/card/{self.set_id}/{str(i).zfill(3)}.shtml" for i in range(1, num_cards+1)]
+            results = self.iter_card_details(detail_urls, set_id=self.set_id)
+            for i, (card_data, error) in enumerate(results, start=1):
+                if error is not None:
+                    print(f"[WARN] Failed to scrape card {str(i).zfill(3)} in set {self.set_id}: {error}")
+                    failed_at = i
+                    # Stop the pages still in flight before moving on to H-numbering
+                    results.close()
+                    break
+                if card_data and card_data.get('number'):
+                    card_data['detail_url'] = detail_urls[i-1]
+                    print(f"[DEBUG] Parsed card: {card_data}")
+                    count += 1
+                    yield card_data
+            # If we failed before num_cards, try H-numbering
+            if failed_at and failed_at <= num_cards:
+                print(f"[INFO] Trying H-numbering for set {self.set_id} starting at H{failed_at}")
+                h_urls = [f"/card/{self.set_id}/H{h}.shtml" for h in range(failed_at, num_cards+1)]
+                results = self.iter_card_details(h_urls, set_id=self.set_id)
+                for h, (card_data, error) in enumerate(results, start=failed_at):
+                    if error is not None:
+                        print(f"[WARN] Failed to scrape card H{h} in set {self.set_id}: {error}")
+                    elif card_data and card_data.get('number'):
+                        card_data['detail_url'] = h_urls[h-failed_at]
+                        print(f"[DEBUG] Parsed card: {card_data}")
+                        count += 1
+                        yield card_data
+        else:
+            # Fallback: try to parse the table as before
+            table = soup.find('table', class_='dextable')
+            rows = table.find_all('tr', recursive=False)
+            if len(rows) <= 1:
+                print("[DEBUG] Fallback: using all <tr> in table")
+                rows = table.find_all('tr')
+            print(f"[DEBUG] Using {len(rows)} rows (including header)")
+            for i, tr in enumerate(rows[:10]):
+                print(f"[DEBUG] Row {i} HTML: {tr}")
+            rows = rows[1:]  # skip header
+            print(f"Found {len(rows)} main-page cards to process")
+            for idx, row in enumerate(rows):
+                cells = row.find_all('td')
+                print(f"[DEBUG] Row {idx} has {len(cells)} cells")
+                if len(cells) < 4:
+                    print(f"[DEBUG] Skipping row {idx}: not enough cells ({len(cells)})")
+                    continue
+                num_text = cells[0].get_text(strip=True)
+                print(f"[DEBUG] Row {idx} num_text: '{num_text}'")
+                match = re.search(r'(\d+)\s*/\s*\d+', num_text)
+                if not match:
+                    print(f"[DEBUG] Skipping row {idx}: no card number match in '{num_text}'")
+                    continue
+                number = match.group(0).replace(' ', '')
+                rarity_img = cells[0].find('img', src=re.compile(r'/card/image/.+\.png'))
+                rarity = rarity_img and re.search(r'/([^/]+)\.png', rarity_img['src']).group(1).capitalize() or 'Unknown'
+                link = cells[1].find('a')
+                if link and link.has_attr('href'):
+                    detail_url = link['href']
+                else:
+                    num_digits = re.search(r'(\d+)', number)
+                    num_str = num_digits.group(1).zfill(3) if num_digits else '001'
                     detail_url = f"/card/{self.set_id}/{num_str}.shtml"
-                    try:
-                        card_data = self.scrape_card_detail(detail_url, set_id=self.set_id)
-                        if card_data and card_data.get('number'):
-                            print(f"[DEBUG] Parsed card: {card_data}")
-                            cards.append(card_data)
-                    except Exception as e:
-                        print(f"[WARN] Failed to scrape card {num_str} in set {self.set_id}: {e}")
-                        failed_at = i
-                        break
-                # If we failed before num_cards, try H-numbering
-                if failed_at and failed_at <= num_cards:
-                    print(f"[INFO] Trying H-numbering for set {self.set_id} starting at H{failed_at}")
-                    for h in range(failed_at, num_cards+1):
-                        h_str = f"H{h}"
-                        detail_url = f"/card/{self.set_id}/{h_str}.shtml"
-                        try:
-                            card_data = self.scrape_card_detail(detail_url, set_id=self.set_id)
-                            if card_data and card_data.get('number'):
-                                print(f"[DEBUG] Parsed card: {card_data}")
-                                cards.append(card_data)
-                        except Exception as e:
-                            print(f"[WARN] Failed to scrape card {h_str} in set {self.set_id}: {e}")
-            else:
-                # Fallback: try to parse the table as before
-                table = soup.find('table', class_='dextable')
-                rows = table.find_all('tr', recursive=False)
-                if len(rows) <= 1:
-                    print("[DEBUG] Fallback: using all <tr> in table")
-                    rows = table.find_all('tr')
-                print(f"[DEBUG] Using {len(rows)} rows (including header)")
-                for i, tr in enumerate(rows[:10]):
-                    print(f"[DEBUG] Row {i} HTML: {tr}")
-                rows = rows[1:]  # skip header
-                print(f"Found {len(rows)} main-page cards to process")
-                for idx, row in enumerate(rows):
-                    cells = row.find_all('td')
-                    print(f"[DEBUG] Row {idx} has {len(cells)} cells")
-                    if len(cells) < 4:
-                        print(f"[DEBUG] Skipping row {idx}: not enough cells ({len(cells)})")
-                        continue
-                    num_text = cells[0].get_text(strip=True)
-                    print(f"[DEBUG] Row {idx} num_text: '{num_text}'")
-                    match = re.search(r'(\d+)\s*/\s*\d+', num_text)
-                    if not match:
-                        print(f"[DEBUG] Skipping row {idx}: no card number match in '{num_text}'")
-                        continue
-                    number = match.group(0).replace(' ', '')
-                    rarity_img = cells[0].find('img', src=re.compile(r'/card/image/.+\.png'))
-                    rarity = rarity_img and re.search(r'/([^/]+)\.png', rarity_img['src']).group(1).capitalize() or 'Unknown'
-                    link = cells[1].find('a')
-                    if link and link.has_attr('href'):
-                        detail_url = link['href']
-                    else:
-                        num_digits = re.search(r'(\d+)', number)
-                        num_str = num_digits.group(1).zfill(3) if num_digits else '001'
-                        detail_url = f"/card/{self.set_id}/{num_str}.shtml"
-                    name_link = cells[2].find('a')
-                    if name_link:
-                        font_elem = name_link.find('font')
-                        if font_elem:
-                            name = font_elem.get_text(strip=True)
-                        else:
-                            name = name_link.get_text(strip=True)
+                name_link = cells[2].find('a')
+                if name_link:
+                    font_elem = name_link.find('font')
+                    if font_elem:
+                        name = font_elem.get_text(strip=True)
                     else:
-                        name = cells[2].get_text(strip=True)
-                    detail_cell = cells[3]
-                    hp = re.search(r'(\d+)HP', detail_cell.get_text())
-                    hp = hp.group(1) if hp else ''
-                    primary = ''
-                    hp_elem = detail_cell.find(text=re.compile(r'\d+HP'))
-                    if hp_elem:
-                        img = hp_elem.parent.find_next('img', src=re.compile(r'/card/image/.+\.png'))
-                        if img: primary = re.search(r'/([^/]+)\.png', img['src']).group(1)
-                    weakness = []
-                    resistance = []
-                    retreat = 0
-                    for hdr in detail_cell.find_all('b'):
-                        txt = hdr.get_text(strip=True).lower()
-                        cell = hdr.find_parent('td').find_next_sibling('td')
-                        if not cell: continue
-                        img = cell.find('img')
-                        if txt == 'weakness' and img:
-                            weakness = [re.search(r'/([^/]+)\.png', img['src']).group(1)]
-                        elif txt == 'resistance' and img:
-                            resistance = [re.search(r'/([^/]+)\.png', img['src']).group(1)]
-                        elif txt == 'retreat cost':
-                            retreat = len(cell.find_all('img', src=re.compile(r'/card/image/colorless\.png')))
-                    types = [primary] if primary else []
-                    card = {
-                        'number': number,
-                        'name': name,
-                        'card_type': f"{primary.capitalize()} Pokémon" if primary else 'Unknown',
-                        'types': types,
-                        'rarity': rarity,
-                        'hp': hp,
-                        'weakness': weakness,
-                        'resistance': resistance,
-                        'retreat_cost': retreat,
-                        'detail_url': detail_url
-                    }
-                    print(f"[DEBUG] Parsed card: {card}")
-                    cards.append(card)
-            print(f"Total cards gathered: {len(cards)}")
-            self.download_card_images(cards)
-            self.export_cards_to_csv(cards)
-            # Save CSV to the data/ directory only (remove JSON creation)
-            data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            csv_path = os.path.join(data_dir, 'pokemon_cards_data.csv')
-            # Move CSV if it was created in the current dir
-            if os.path.exists('pokemon_cards_data.csv'):
-                import shutil
-                shutil.move('pokemon_cards_data.csv', csv_path)
-            print(f"✓ Saved all {len(cards)} cards to {csv_path}")
-            return cards
+                        name = name_link.get_text(strip=True)
+                else:
+                    name = cells[2].get_text(strip=True)
+                detail_cell = cells[3]
+                hp = re.search(r'(\d+)HP', detail_cell.get_text())
+                hp = hp.group(1) if hp else ''
+                primary = ''
+                hp_elem = detail_cell.find(text=re.compile(r'\d+HP'))
+                if hp_elem:
+                    img = hp_elem.parent.find_next('img', src=re.compile(r'/card/image/.+\.png'))
+                    if img: primary = re.search(r'/([^/]+)\.png', img['src']).group(1)
+                weakness = []
+                resistance = []
+                retreat = 0
+                for hdr in detail_cell.find_all('b'):
+                    txt = hdr.get_text(strip=True).lower()
+                    cell = hdr.find_parent('td').find_next_sibling('td')
+                    if not cell: continue
+                    img = cell.find('img')
+                    if txt == 'weakness' and img:
+                        weakness = [re.search(r'/([^/]+)\.png', img['src']).group(1)]
+                    elif txt == 'resistance' and img:
+                        resistance = [re.search(r'/([^/]+)\.png', img['src']).group(1)]
+                    elif txt == 'retreat cost':
+                        retreat = len(cell.find_all('img', src=re.compile(r'/card/image/colorless\.png')))
+                types = [primary] if primary else []
+                card = {
+                    'number': number,
+                    'name': name,
+                    'card_type': f"{primary.capitalize()} Pokémon" if primary else 'Unknown',
+                    'types': types,
+                    'rarity': rarity,
+                    'hp': hp,
+                    'weakness': weakness,
+                    'resistance': resistance,
+                    'retreat_cost': retreat,
+                    'detail_url': detail_url
+                }
+                print(f"[DEBUG] Parsed card: {card}")
+                count += 1
+                yield card
+        print(f"Total cards gathered: {count}")
+
+    def scrape_cards(self, sinks=None):
+        """
+        Scrape the set, downloading card images, and stream the records into
+        sinks (default: a CSV at DEFAULT_CSV_PATH) in a single write. Returns
+        the number of cards written.
+        """
+        print(f"Scraping Pokemon cards from {self.set_url}")
+        sinks = sinks if sinks is not None else [CsvSink(DEFAULT_CSV_PATH)]
+        try:
+            count = write_records(self.iter_records(download_images=True), sinks)
+            for sink in sinks:
+                print(f"✓ Saved all {count} cards to {sink.path}")
+            return count
         except Exception as e:
             print(f"❌ scrape_cards failed: {e}")
-            return []
+            return 0
 
-    def export_cards_to_csv(self, cards):
-        """Export card data to CSV for easy inspection"""
-        csv_file = "pokemon_cards_data.csv"
+    def export_cards_to_csv(self, cards, csv_path="pokemon_cards_data.csv"):
+        """Export card dicts (or CardRecords) to CSV for easy inspection"""
         try:
-            import csv
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Header row
-                writer.writerow(["Number", "Name", "Card Type", "Types", "Rarity", "HP", "Weakness", "Resistance", "Retreat Cost", "Image URL", "Local Image"])
-                # Write card rows
-                for card in cards:
-                    writer.writerow([
-                        card.get('number', ''),
-                        card.get('name', ''),
-                        card.get('card_type', ''),
-                        ";".join(card.get('types', [])),
-                        card.get('rarity', ''),
-                        card.get('hp', ''),
-                        ";".join(card.get('weakness', [])),
-                        ";".join(card.get('resistance', [])),
-                        card.get('retreat_cost', 0),
-                        card.get('image_url', ''),
-                        card.get('local_image', '')
-                    ])
-            print(f"✓ Exported card data to {csv_file}")
+            records = (c if isinstance(c, CardRecord) else CardRecord.from_card_data(c, self.set_id) for c in cards)
+            write_records(records, [CsvSink(csv_path)])
+            print(f"✓ Exported card data to {csv_path}")
         except Exception as e:
             print(f"✗ Error exporting cards to CSV: {e}")
 
     def scrape_cards_to_csv(self, csv_path):
-        # Scrape cards for the current set_url and write to the given csv_path
-        cards = self.scrape_cards()
-        if not cards:
+        # Scrape cards for the current set_url and write them to the given csv_path only
+        count = self.scrape_cards([CsvSink(csv_path)])
+        if not count:
             print(f"[ERROR] No cards scraped for set: {self.set_url}")
-            return []
-        import csv
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Number", "Name", "Card Type", "Types", "Rarity", "HP", "Weakness", "Resistance", "Retreat Cost", "Image URL", "Local Image"])
-            for card in cards:
-                writer.writerow([
-                    card.get('number', ''),
-                    card.get('name', ''),
-                    card.get('card_type', ''),
-                    ";".join(card.get('types', [])),
-                    card.get('rarity', ''),
-                    card.get('hp', ''),
-                    ";".join(card.get('weakness', [])),
-                    ";".join(card.get('resistance', [])),
-                    card.get('retreat_cost', 0),
-                    card.get('image_url', ''),
-                    card.get('local_image', '')
-                ])
-        print(f"[INFO] Scraped and saved {len(cards)} cards to {csv_path}")
-        return cards
+            return 0
+        print(f"[INFO] Scraped and saved {count} cards to {csv_path}")
+        return count
+
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Scrape one set from serebii.net.")
+    parser.add_argument('set_url', nargs='?', default="https://www.serebii.net/card/journeytogether/")
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help="output file (.csv, .jsonl or .parquet); repeat for several")
+    args = parser.parse_args()
     print("[INFO] Running SerebiiCardScraper as a script...")
-    scraper = SerebiiCardScraper()
-    scraper.scrape_cards()
+    scraper = SerebiiCardScraper(args.set_url)
+    scraper.scrape_cards([sink_for_path(path) for path in args.output] or None)
     print("[INFO] Scraping complete.")
@@ -0,0 +1,96 @@
+"""
+Encryption of messages between two players sharing a session code.
+
+SessionCipher derives a Fernet key from the session code once, with a salted
+and tunable KDF (scrypt by default, or PBKDF2-HMAC-SHA256), and keeps the
+Fernet object for the whole session, so each message costs one AES/HMAC
+operation rather than a key derivation. The salt is not secret: the host
+creates it with new_salt() and sends it along with the session details,
+and both sides build the same cipher from (session code, salt).
+
+get_session_cipher caches ciphers per (session code, salt, KDF settings),
+so repeated lookups for a session reuse the derived key.
+"""
+import base64
+import hashlib
+import os
+import time
+from functools import lru_cache
+
+SALT_BYTES = 16
+DEFAULT_KDF = 'scrypt'
+# scrypt cost: n=2**14, r=8 uses 16 MiB and takes tens of milliseconds, once per session
+SCRYPT_PARAMS = {'n': 2 ** 14, 'r': 8, 'p': 1}
+PBKDF2_ITERATIONS = 600_000
+
+
+def new_salt():
+    return os.urandom(SALT_BYTES)
+
+
+def derive_key(session_code, salt, kdf=DEFAULT_KDF, **params):
+    """
+    32-byte Fernet key (urlsafe base64) for a session code and salt.
+    kdf is 'scrypt' (params n, r, p) or 'pbkdf2' (param iterations).
+    """
+    if not salt:
+        raise ValueError("a salt is required")
+    secret = session_code.encode('utf-8')
+    if kdf == 'scrypt':
+        settings = dict(SCRYPT_PARAMS, **params)
+        raw = hashlib.scrypt(secret, salt=salt, n=settings['n'], r=settings['r'], p=settings['p'],
+                             maxmem=256 * settings['n'] * settings['r'] * settings['p'], dklen=32)
+    elif kdf == 'pbkdf2':
+        raw = hashlib.pbkdf2_hmac('sha256', secret, salt, params.get('iterations', PBKDF2_ITERATIONS), dklen=32)
+    else:
+        raise ValueError(f"unknown KDF {kdf!r} (use 'scrypt' or 'pbkdf2')")
+    return base64.urlsafe_b64encode(raw)
+
+
+class SessionCipher:
+    """
+    Fernet encryption for one session. Messages are str, tokens are bytes;
+    decrypt raises cryptography.fernet.InvalidToken for a token that was
+    not made with this session's key (or is older than ttl seconds).
+    """
+    def __init__(self, session_code, salt, kdf=DEFAULT_KDF, **params):
+        from cryptography.fernet import Fernet
+        self.salt = salt
+        self.kdf = kdf
+        self._fernet = Fernet(derive_key(session_code, salt, kdf, **params))
+
+    @classmethod
+    def new(cls, session_code, kdf=DEFAULT_KDF, **params):
+        """Cipher with a fresh salt (read it from .salt to share it with the other player)."""
+        return cls(session_code, new_salt(), kdf, **params)
+
+    def encrypt(self, message):
+        return self._fernet.encrypt(message.encode('utf-8'))
+
+    def decrypt(self, token, ttl=None):
+        return self._fernet.decrypt(token, ttl).decode('utf-8')
+
+    def encrypt_many(self, messages):
+        """Tokens for several messages, all stamped with the same time."""
+        now = int(time.time())
+        encrypt = self._fernet.encrypt_at_time
+        return [encrypt(message.encode('utf-8'), now) for message in messages]
+
+    def decrypt_many(self, tokens, ttl=None):
+        """Messages for several tokens; raises InvalidToken on the first bad one."""
+        if ttl is None:
+            decrypt = self._fernet.decrypt
+            return [decrypt(token).decode('utf-8') for token in tokens]
+        now = int(time.time())
+        decrypt = self._fernet.decrypt_at_time
+        return [decrypt(token, ttl, now).decode('utf-8') for token in tokens]
+
+
+@lru_cache(maxsize=16)
+def _cached_cipher(session_code, salt, kdf, params):
+    return SessionCipher(session_code, salt, kdf, **dict(params))
+
+
+def get_session_cipher(session_code, salt, kdf=DEFAULT_KDF, **params):
+    """The SessionCipher for a session, deriving its key only the first time."""
+    return _cached_cipher(session_code, bytes(salt), kdf, tuple(sorted(params.items())))
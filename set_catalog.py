@@ -0,0 +1,92 @@
+"""
+Local catalog of the English sets shown on the splash screen.
+
+The catalog is a small JSON manifest (name, url, logo file, card count and
+release date per set) so the splash screen can draw the set grid straight
+from disk. refresh_catalog revalidates the set list through the HTTP cache,
+downloads any logos that are missing and rewrites the manifest; it does not
+touch Qt, so it can run on a worker thread. diff_catalog tells the caller
+which sets were added, removed or changed so the grid can be updated in
+place.
+"""
+import json
+import os
+
+DEFAULT_CATALOG_PATH = os.path.join('data', 'set_catalog.json')
+DEFAULT_LOGO_DIR = os.path.join('images', 'assets', 'set_logos')
+
+
+def logo_path_for(logo_url, logo_dir=DEFAULT_LOGO_DIR):
+    return os.path.join(logo_dir, os.path.basename(logo_url)) if logo_url else None
+
+
+def catalog_entry(set_info, logo_dir=DEFAULT_LOGO_DIR):
+    """Manifest entry for a set from parse_english_sets; logo_file is None until the logo is on disk."""
+    logo_path = logo_path_for(set_info.get('logo_url'), logo_dir)
+    return {
+        'name': set_info.get('name', ''),
+        'url': set_info['url'],
+        'logo_url': set_info.get('logo_url', ''),
+        'logo_file': logo_path if logo_path and os.path.exists(logo_path) else None,
+        'num_cards': set_info.get('num_cards', ''),
+        'release_date': set_info.get('release_date', ''),
+    }
+
+
+def load_catalog(path=DEFAULT_CATALOG_PATH):
+    """The saved catalog entries, or [] if there is no usable catalog yet."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    sets = data.get('sets') if isinstance(data, dict) else None
+    return [s for s in sets or [] if isinstance(s, dict) and s.get('url')]
+
+
+def save_catalog(sets, path=DEFAULT_CATALOG_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'sets': sets}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def diff_catalog(old, new):
+    """(added, removed, changed) set URLs between two catalogs."""
+    old_by_url = {s['url']: s for s in old}
+    new_by_url = {s['url']: s for s in new}
+    added = [url for url in new_by_url if url not in old_by_url]
+    removed = [url for url in old_by_url if url not in new_by_url]
+    changed = [url for url, s in new_by_url.items() if url in old_by_url and old_by_url[url] != s]
+    return added, removed, changed
+
+
+def fetch_logos(sets, logo_dir=DEFAULT_LOGO_DIR, downloader=None):
+    """
+    Download the logos not yet in logo_dir, several at a time over one
+    pooled session. Returns the number downloaded.
+    """
+    from scraper.image_downloader import ImageDownloader
+    os.makedirs(logo_dir, exist_ok=True)
+    downloader = downloader or ImageDownloader(max_workers=8)
+    # One job per logo file; a few sets share a logo
+    jobs = {logo_path_for(s['logo_url'], logo_dir): (s['logo_url'], logo_path_for(s['logo_url'], logo_dir), s['name'])
+            for s in sets if s.get('logo_url')}
+    return downloader.download_all(list(jobs.values()))
+
+
+def refresh_catalog(path=DEFAULT_CATALOG_PATH, logo_dir=DEFAULT_LOGO_DIR, downloader=None, cache=None):
+    """
+    Fetch the current set list (revalidating the cached page), download
+    missing logos and save the catalog. Returns the new catalog entries.
+    """
+    from scraper.serebii_card_scraper import fetch_english_sets
+    sets = fetch_english_sets(cache, ttl=0)
+    fetch_logos(sets, logo_dir, downloader)
+    entries = [catalog_entry(s, logo_dir) for s in sets]
+    if entries:
+        save_catalog(entries, path)
+    return entries
@@ -0,0 +1,75 @@
+"""Loopback tests for game_server's request limits."""
+import asyncio
+
+import pandas as pd
+
+import game_server
+import question_engine
+from game_server import GameClient, GameServer, SetTable
+from net_play import write_frame
+
+CARDS = pd.DataFrame({
+    'name': ['Charmander', 'Squirtle', 'Bulbasaur', 'Pikachu'],
+    'types': [['fire'], ['water'], ['grass'], ['lightning']],
+    'hp': ['60 HP', '70 HP', '70 HP', '60 HP'],
+    'rarity': ['Common', 'Common', 'Uncommon', 'Rare'],
+    'card_type': ['Pokémon'] * 4,
+    'holographic': [False, False, False, True],
+    'number': ['1/4', '2/4', '3/4', '4/4'],
+})
+
+
+async def start_server():
+    # A server on a free port playing one in-memory set, so no database is needed
+    server = GameServer()
+    server.sets._set_ids = frozenset(['testset'])
+    loaded = asyncio.get_running_loop().create_future()
+    loaded.set_result(SetTable('testset', CARDS))
+    server.sets._tables['testset'] = loaded
+    port = await server.start('127.0.0.1', 0)
+    return server, port
+
+
+async def solo_room(port):
+    client = await GameClient.connect('127.0.0.1', port)
+    await client.send({'type': 'create', 'set_id': 'testset', 'players': 1})
+    await client.expect('start')
+    return client
+
+
+def test_long_question_is_refused_before_it_is_compiled():
+    async def scenario():
+        server, port = await start_server()
+        client = await solo_room(port)
+        compiled = question_engine._compile_normalized.cache_info().currsize
+        long_question = 'is it a fire type? ' + 'x' * game_server.MAX_QUESTION_CHARS
+        await client.send({'type': 'question', 'text': long_question})
+        reply = await client.recv()
+        assert reply['type'] == 'error' and 'limited' in reply['message']
+        table = await server.sets.get('testset')
+        assert table._questions == {}
+        assert question_engine._compile_normalized.cache_info().currsize == compiled
+
+        # The connection is still usable for normal questions
+        await client.send({'type': 'question', 'text': 'is it a fire type?'})
+        assert (await client.expect('answer'))['answer'] in ('Yes', 'No')
+        await client.close()
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_oversized_frame_closes_the_connection():
+    async def scenario():
+        server, port = await start_server()
+        client = await solo_room(port)
+        write_frame(client.writer, b'{"type": "question", "text": "' + b'x' * game_server.MAX_CLIENT_FRAME_BYTES + b'"}')
+        await client.writer.drain()
+        reply = await client.recv()
+        assert reply['type'] == 'error' and 'byte limit' in reply['message']
+        assert await client.recv() is None
+        assert server.rooms == {}
+        await client.close()
+        await server.close()
+
+    asyncio.run(scenario())
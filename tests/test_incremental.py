@@ -0,0 +1,42 @@
+"""Change detection in scraper.incremental against rows already in the database."""
+import pyarrow as pa
+
+from card_database import card_schema, write_partitioned_table
+from scraper.incremental import read_set_records, row_changed
+from scraper.records import CardRecord
+
+DETAIL_URL = 'https://www.serebii.net/card/obsidianflames/001.shtml'
+CARD = {
+    'number': '1/197', 'name': 'Oddish', 'card_type': 'Pokémon', 'types': ['grass'], 'rarity': 'Common',
+    'hp': '60 HP', 'holographic': False, 'weakness': [], 'resistance': [], 'retreat_cost': 1,
+    'image_url': 'https://www.serebii.net/card/obsidianflames/1.jpg',
+}
+
+
+def legacy_row():
+    # How older scrapes stored a card without weakness or resistance
+    row = CardRecord.from_card_data(CARD, 'obsidianflames', DETAIL_URL).as_row()
+    row.update(weakness=None, resistance=None)
+    return row
+
+
+def test_legacy_row_from_parquet_is_unchanged(tmp_path):
+    path = str(tmp_path / 'cards.parquet')
+    write_partitioned_table(pa.Table.from_pylist([legacy_row()], schema=card_schema()), path)
+    [stored] = read_set_records(path, 'obsidianflames')
+    assert stored['weakness'] is None and stored['resistance'] is None
+    scraped = CardRecord.from_card_data(CARD, 'obsidianflames', DETAIL_URL).as_row()
+    assert not row_changed(stored, scraped)
+
+
+def test_nan_matches_missing_value():
+    scraped = CardRecord.from_card_data(dict(CARD, retreat_cost=None), 'obsidianflames', DETAIL_URL).as_row()
+    stored = dict(legacy_row(), retreat_cost=float('nan'))
+    assert not row_changed(stored, scraped)
+
+
+def test_real_change_is_detected():
+    scraped = CardRecord.from_card_data(dict(CARD, hp='70 HP'), 'obsidianflames', DETAIL_URL).as_row()
+    assert row_changed(legacy_row(), scraped)
+    scraped = CardRecord.from_card_data(dict(CARD, weakness=['fire']), 'obsidianflames', DETAIL_URL).as_row()
+    assert row_changed(legacy_row(), scraped)
@@ -0,0 +1,100 @@
+"""Loopback tests for net_play's handshake and encrypted messages."""
+import asyncio
+
+import pytest
+
+import net_play
+
+CODE = 'ABC234'
+INFO = {'set_id': 'obsidianflames', 'cards': 230}
+
+
+async def start_host(info=INFO):
+    # host_session as a task, plus the port it ended up listening on
+    ports = asyncio.Queue()
+    task = asyncio.create_task(net_play.host_session(CODE, info, '127.0.0.1', 0, on_listening=ports.put_nowait))
+    return task, await ports.get()
+
+
+def test_handshake_and_round_trip():
+    async def scenario():
+        host_task, port = await start_host()
+        joiner, host_info = await net_play.join_session(CODE, INFO, '127.0.0.1', port)
+        host, joiner_info = await host_task
+        assert host_info == INFO and joiner_info == INFO
+
+        await joiner.send({'type': 'question', 'text': 'is it a fire type?'})
+        assert await host.recv() == {'type': 'question', 'text': 'is it a fire type?'}
+        await host.send_many([{'type': 'answer', 'question': 'is it a fire type?', 'answer': 'Yes'},
+                              {'type': 'eliminated', 'bits': 'ff', 'remaining': 22}])
+        assert (await joiner.recv())['answer'] == 'Yes'
+        assert (await joiner.recv())['remaining'] == 22
+
+        await joiner.close()
+        assert await host.recv() is None
+        await host.close()
+
+    asyncio.run(scenario())
+
+
+def test_frames_on_the_wire_are_encrypted():
+    async def scenario():
+        host_task, port = await start_host()
+        joiner, _ = await net_play.join_session(CODE, INFO, '127.0.0.1', port)
+        host, _ = await host_task
+        await joiner.send({'type': 'question', 'text': 'is it a fire type?'})
+        frame = await net_play.read_frame(host.reader)
+        assert b'fire' not in frame
+        assert 'fire' in host.cipher.decrypt(frame)
+        await joiner.close()
+        await host.close()
+
+    asyncio.run(scenario())
+
+
+def test_wrong_session_code_is_rejected_and_host_keeps_listening():
+    async def scenario():
+        host_task, port = await start_host()
+        with pytest.raises(net_play.ProtocolError):
+            await net_play.join_session('WRONG9', INFO, '127.0.0.1', port)
+        assert not host_task.done()
+        # The right code still gets in afterwards
+        joiner, _ = await net_play.join_session(CODE, INFO, '127.0.0.1', port)
+        host, _ = await host_task
+        await joiner.close()
+        await host.close()
+
+    asyncio.run(scenario())
+
+
+def test_different_set_is_rejected():
+    async def scenario():
+        host_task, port = await start_host()
+        with pytest.raises(net_play.ProtocolError, match='pick the same set'):
+            await net_play.join_session(CODE, {'set_id': 'paldeaevolved', 'cards': 279}, '127.0.0.1', port)
+        host_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await host_task
+
+    asyncio.run(scenario())
+
+
+def test_game_messages_are_validated_and_coerced():
+    assert net_play.validate_game_message({'type': 'eliminated', 'bits': 'ff', 'remaining': '22', 'x': 1}) == \
+        {'type': 'eliminated', 'bits': 'ff', 'remaining': 22}
+    assert net_play.validate_game_message({'type': 'reset'}) == {'type': 'reset'}
+
+
+@pytest.mark.parametrize('message', [
+    {'type': 'launch'},
+    {'type': 'question'},
+    {'type': 'question', 'text': None},
+    {'type': 'answer', 'question': 'is it holo?', 'answer': 'Maybe'},
+    {'type': 'eliminated', 'bits': 'ff', 'remaining': 'lots'},
+    {'type': 'eliminated', 'bits': 'zz', 'remaining': 3},
+    {'type': 'eliminated', 'bits': 'ff', 'remaining': -1},
+    {'type': 'guess_result', 'name': 'Pikachu', 'correct': 'yes'},
+])
+def test_malformed_game_messages_are_rejected(message):
+    with pytest.raises(net_play.ProtocolError):
+        net_play.validate_game_message(message)
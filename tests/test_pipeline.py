@@ -0,0 +1,67 @@
+"""Consolidation of scrape checkpoints into the partitioned card database."""
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from card_database import card_schema, load_manifest, write_partitioned_table
+from scraper import pipeline
+from scraper.records import CardRecord
+
+SETS = ['jungle', 'fossil', 'obsidianflames']
+
+
+def card(set_id, number, name):
+    data = {'number': f'{number}/3', 'name': name, 'types': ['grass'], 'hp': '60 HP', 'retreat_cost': 1}
+    return CardRecord.from_card_data(data, set_id, f'https://www.serebii.net/card/{set_id}/{number:03}.shtml')
+
+
+def read_set(path, set_id):
+    entry = load_manifest(path)['sets'][set_id]
+    return pq.ParquetFile(path).read_row_group(entry['row_group'])
+
+
+def make_pipeline(tmp_path, scraped):
+    # A pipeline whose scrape_set checkpoints canned records instead of fetching pages
+    scrape = pipeline.ScrapePipeline(str(tmp_path / 'cards.parquet'), str(tmp_path / 'checkpoints'))
+
+    def scrape_set(set_url):
+        set_id = pipeline.SerebiiCardScraper.set_id_from_url(set_url)
+        path = pipeline.checkpoint_path(scrape.checkpoint_dir, set_id)
+        return set_id, pipeline.write_checkpoint(iter(scraped.get(set_id, [])), path)
+
+    scrape.scrape_set = scrape_set
+    return scrape
+
+
+def test_subset_run_leaves_other_sets_unchanged(tmp_path):
+    path = str(tmp_path / 'cards.parquet')
+    rows = [card(set_id, n, f'{set_id} {n}').as_row() for set_id in SETS for n in (1, 2, 3)]
+    before = write_partitioned_table(pa.Table.from_pylist(rows, schema=card_schema()), path)
+    old_tables = {set_id: read_set(path, set_id) for set_id in SETS}
+
+    scrape = make_pipeline(tmp_path, {'fossil': [card('fossil', 1, 'Aerodactyl')]})
+    after = scrape.run(['https://www.serebii.net/card/fossil/'])
+
+    assert set(after['sets']) == set(SETS)
+    assert after['num_rows'] == before['num_rows'] - 2
+    for set_id in ('jungle', 'obsidianflames'):
+        assert after['sets'][set_id]['checksum'] == before['sets'][set_id]['checksum']
+        assert read_set(path, set_id).equals(old_tables[set_id])
+    assert read_set(path, 'fossil').column('name').to_pylist() == ['Aerodactyl']
+
+
+def test_failed_and_empty_sets_keep_their_cards(tmp_path):
+    path = str(tmp_path / 'cards.parquet')
+    rows = [card(set_id, n, f'{set_id} {n}').as_row() for set_id in SETS for n in (1, 2, 3)]
+    before = write_partitioned_table(pa.Table.from_pylist(rows, schema=card_schema()), path)
+
+    scrape = make_pipeline(tmp_path, {})
+    original = scrape.scrape_set
+
+    def flaky(set_url):
+        if 'jungle' in set_url:
+            raise RuntimeError("connection reset")
+        return original(set_url)
+
+    scrape.scrape_set = flaky
+    after = scrape.run([f'https://www.serebii.net/card/{set_id}/' for set_id in ('jungle', 'fossil')])
+    assert after['sets'] == before['sets']
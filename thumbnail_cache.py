@@ -0,0 +1,241 @@
+"""
+Thumbnail cache for card images.
+
+Thumbnails are keyed by (image path, mtime, target size). Scaled pixmaps are
+kept in an in-memory LRU bounded by a byte budget, backed by an on-disk cache
+of pre-scaled PNG files, so a card image is decoded and scaled from the
+full-resolution JPEG at most once per size.
+
+ThumbnailLoader decodes and scales thumbnails on a QThreadPool so grids can
+show placeholders immediately and swap pixmaps in as they finish. Pending
+requests are served in priority order, requesting a pending thumbnail again
+with a lower priority value moves it up the queue, and a thumbnail that is
+already being decoded is not queued again.
+"""
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+DEFAULT_CACHE_DIR = os.path.join('images', '.thumbnails')
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_memory_bytes=DEFAULT_MEMORY_BYTES, max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._pixmaps = OrderedDict()
+        self._memory_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.prune_disk()
+
+    def key(self, path, size):
+        """Cache key for an image at a target size, or None if the file is missing."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (os.path.abspath(path), mtime, tuple(size))
+
+    def disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def image(self, path, size, key=None):
+        """
+        Scaled QImage for path, from the disk cache when possible. Safe to
+        call from worker threads. Returns None if the image can't be read.
+        """
+        key = key or self.key(path, size)
+        if key is None:
+            return None
+        cached = self.disk_path(key)
+        img = QImage(cached)
+        if not img.isNull():
+            return img
+        img = QImage(path)
+        if img.isNull():
+            return None
+        img = img.scaled(*size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        tmp_path = f"{cached}.{threading.get_ident()}.tmp"
+        if img.save(tmp_path, "PNG"):
+            os.replace(tmp_path, cached)
+        return img
+
+    def cached_pixmap(self, key):
+        """Pixmap from the in-memory LRU only, or None. GUI thread only."""
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def store_pixmap(self, key, pixmap):
+        """Add a pixmap to the in-memory LRU, evicting to stay in budget. GUI thread only."""
+        if key in self._pixmaps:
+            self._memory_bytes -= self._pixmap_bytes(self._pixmaps.pop(key))
+        self._pixmaps[key] = pixmap
+        self._memory_bytes += self._pixmap_bytes(pixmap)
+        while self._memory_bytes > self.max_memory_bytes and len(self._pixmaps) > 1:
+            _, old = self._pixmaps.popitem(last=False)
+            self._memory_bytes -= self._pixmap_bytes(old)
+
+    def pixmap(self, path, size):
+        """Scaled QPixmap for path, or None if the image can't be read. GUI thread only."""
+        key = self.key(path, size)
+        if key is None:
+            return None
+        pixmap = self.cached_pixmap(key)
+        if pixmap is None:
+            img = self.image(path, size, key=key)
+            if img is None:
+                return None
+            pixmap = QPixmap.fromImage(img)
+            self.store_pixmap(key, pixmap)
+        return pixmap
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth()) // 8
+
+    def prune_disk(self):
+        # Drop the least recently used thumbnails once the disk budget is exceeded
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith('.png')]
+        except OSError:
+            return
+        stats = [(e.stat().st_atime, e.stat().st_size, e.path) for e in entries]
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+_cache = None
+
+
+def get_thumbnail_cache():
+    """The process-wide ThumbnailCache (created on first use, after QApplication)."""
+    global _cache
+    if _cache is None:
+        _cache = ThumbnailCache()
+    return _cache
+
+
+def thumbnail(path, size):
+    """Scaled QPixmap for a card image path, or None if there is no image."""
+    if not path or not isinstance(path, str):
+        return None
+    return get_thumbnail_cache().pixmap(path, size)
+
+
+class _DecodeTask(QRunnable):
+    # Each task decodes whichever pending request has the best priority when it runs
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        job = self.loader._next_job()
+        if job is None:
+            return
+        path, size = job
+        try:
+            img = self.loader.cache.image(path, size)
+        except Exception as e:
+            print(f"[WARN] Could not decode {path}: {e}")
+            img = None
+        self.loader._decoded.emit(path, size, img)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Asynchronous thumbnails. request() returns a cached pixmap right away or
+    queues the image for decoding and returns None; ready(path, size, pixmap)
+    is emitted on the GUI thread when it is done (pixmap is None if the image
+    could not be read). Lower priority values are decoded first.
+    """
+    ready = pyqtSignal(str, object, object)
+    _decoded = pyqtSignal(str, object, object)
+
+    def __init__(self, cache=None, max_threads=4):
+        super().__init__()
+        self.cache = cache or get_thumbnail_cache()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(1, min(max_threads, QThreadPool.globalInstance().maxThreadCount())))
+        self._heap = []
+        self._pending = {}
+        # Requests popped by a decode task whose result has not arrived yet
+        self._in_flight = set()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._decoded.connect(self._on_decoded)
+
+    def request(self, path, size, priority=0):
+        size = tuple(size)
+        key = self.cache.key(path, size) if isinstance(path, str) and path else None
+        if key is None:
+            return None
+        pixmap = self.cache.cached_pixmap(key)
+        if pixmap is not None:
+            return pixmap
+        with self._lock:
+            if (path, size) in self._in_flight:
+                return None
+            new_job = (path, size) not in self._pending
+            self._push(path, size, priority)
+        if new_job:
+            self.pool.start(_DecodeTask(self))
+        return None
+
+    def _push(self, path, size, priority):
+        # Lazy heap update: stale entries are skipped when popped
+        current = self._pending.get((path, size))
+        if current is not None and current <= priority:
+            return
+        self._pending[(path, size)] = priority
+        heapq.heappush(self._heap, (priority, next(self._seq), path, size))
+
+    def _next_job(self):
+        with self._lock:
+            while self._heap:
+                priority, _, path, size = heapq.heappop(self._heap)
+                if self._pending.get((path, size)) == priority:
+                    del self._pending[(path, size)]
+                    self._in_flight.add((path, size))
+                    return path, size
+        return None
+
+    def _on_decoded(self, path, size, img):
+        with self._lock:
+            self._in_flight.discard((path, size))
+        pixmap = None
+        if img is not None:
+            pixmap = QPixmap.fromImage(img)
+            key = self.cache.key(path, size)
+            if key is not None:
+                self.cache.store_pixmap(key, pixmap)
+        self.ready.emit(path, size, pixmap)
+
+
+_loader = None
+
+
+def get_thumbnail_loader():
+    """The process-wide ThumbnailLoader."""
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader